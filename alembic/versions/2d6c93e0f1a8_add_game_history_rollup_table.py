@@ -0,0 +1,40 @@
+"""add game history rollup table
+
+Revision ID: 2d6c93e0f1a8
+Revises: 9a4f27c81b3e
+Create Date: 2026-10-19 17:48:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6c93e0f1a8'
+down_revision: Union[str, None] = '9a4f27c81b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('uya_game_history_rollup',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('game_map', sa.String(), nullable=False),
+    sa.Column('game_mode', sa.String(), nullable=False),
+    sa.Column('game_submode', sa.String(), nullable=False),
+    sa.Column('time_limit', sa.Integer(), nullable=False),
+    sa.Column('games', sa.Integer(), nullable=False),
+    sa.Column('total_duration', sa.Float(), nullable=False),
+    sa.Column('total_players', sa.Integer(), nullable=False),
+    sa.Column('player_results', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'game_map', 'game_mode', 'game_submode', 'time_limit')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('uya_game_history_rollup')
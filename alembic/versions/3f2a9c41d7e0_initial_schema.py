@@ -0,0 +1,563 @@
+"""initial schema
+
+Revision ID: 3f2a9c41d7e0
+Revises: 
+Create Date: 2026-10-19 17:40:00.000000
+
+Creates the player, stat and game history tables. Databases created before migrations were tracked already have
+these tables and should be stamped at this revision instead of upgraded to it:
+
+    alembic stamp 3f2a9c41d7e0
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c41d7e0'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('deadlocked_player',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deadlocked_player_id'), 'deadlocked_player', ['id'], unique=True)
+    op.create_table('uya_game_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('game_map', sa.String(), nullable=False),
+    sa.Column('game_name', sa.String(), nullable=False),
+    sa.Column('game_mode', sa.String(), nullable=False),
+    sa.Column('game_submode', sa.String(), nullable=False),
+    sa.Column('time_limit', sa.Integer(), nullable=False),
+    sa.Column('n60_enabled', sa.Boolean(), nullable=False),
+    sa.Column('lava_gun_enabled', sa.Boolean(), nullable=False),
+    sa.Column('gravity_bomb_enabled', sa.Boolean(), nullable=False),
+    sa.Column('flux_rifle_enabled', sa.Boolean(), nullable=False),
+    sa.Column('mine_glove_enabled', sa.Boolean(), nullable=False),
+    sa.Column('morph_enabled', sa.Boolean(), nullable=False),
+    sa.Column('blitz_enabled', sa.Boolean(), nullable=False),
+    sa.Column('rocket_enabled', sa.Boolean(), nullable=False),
+    sa.Column('player_count', sa.Integer(), nullable=False),
+    sa.Column('game_create_time', sa.DateTime(), nullable=False),
+    sa.Column('game_start_time', sa.DateTime(), nullable=False),
+    sa.Column('game_end_time', sa.DateTime(), nullable=False),
+    sa.Column('game_duration', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_uya_game_history_id'), 'uya_game_history', ['id'], unique=True)
+    op.create_table('uya_player',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_index(op.f('ix_uya_player_id'), 'uya_player', ['id'], unique=True)
+    op.create_table('deadlocked_conquest_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('nodes_taken', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_conquest_stats_player_id'), 'deadlocked_conquest_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_ctf_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('flags_captured', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_ctf_stats_player_id'), 'deadlocked_ctf_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_deathmatch_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_deathmatch_stats_player_id'), 'deadlocked_deathmatch_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_gungame_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('demotions', sa.Integer(), nullable=False),
+    sa.Column('times_demoted', sa.Integer(), nullable=False),
+    sa.Column('promotions', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_gungame_stats_player_id'), 'deadlocked_gungame_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_horizon_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('total_bolts', sa.Integer(), nullable=False),
+    sa.Column('current_bolts', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_horizon_stats_player_id'), 'deadlocked_horizon_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_infected_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('infections', sa.Integer(), nullable=False),
+    sa.Column('times_infected', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.Column('wins_as_survivor', sa.Integer(), nullable=False),
+    sa.Column('wins_as_first_infected', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_infected_stats_player_id'), 'deadlocked_infected_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_infinite_climber_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('high_score', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_infinite_climber_stats_player_id'), 'deadlocked_infinite_climber_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_juggernaut_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('time', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_juggernaut_stats_player_id'), 'deadlocked_juggernaut_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_koth_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('time', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_koth_stats_player_id'), 'deadlocked_koth_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_overall_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('disconnects', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('squats', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_overall_stats_player_id'), 'deadlocked_overall_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_payload_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('kills_while_hot', sa.Integer(), nullable=False),
+    sa.Column('kills_on_hot', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_payload_stats_player_id'), 'deadlocked_payload_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_snd_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('plants', sa.Integer(), nullable=False),
+    sa.Column('defuses', sa.Integer(), nullable=False),
+    sa.Column('ninja_defuses', sa.Integer(), nullable=False),
+    sa.Column('wins_attacking', sa.Integer(), nullable=False),
+    sa.Column('wins_defending', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_snd_stats_player_id'), 'deadlocked_snd_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_spleef_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('rounds_played', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.Column('boxes_broken', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_spleef_stats_player_id'), 'deadlocked_spleef_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_survival_mountain_pass_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('solo_high_score', sa.Integer(), nullable=False),
+    sa.Column('coop_high_score', sa.Integer(), nullable=False),
+    sa.Column('xp', sa.Integer(), nullable=False),
+    sa.Column('prestige', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_survival_mountain_pass_stats_player_id'), 'deadlocked_survival_mountain_pass_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_survival_orxon_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('solo_high_score', sa.Integer(), nullable=False),
+    sa.Column('coop_high_score', sa.Integer(), nullable=False),
+    sa.Column('xp', sa.Integer(), nullable=False),
+    sa.Column('prestige', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_survival_orxon_stats_player_id'), 'deadlocked_survival_orxon_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_survival_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('revives', sa.Integer(), nullable=False),
+    sa.Column('times_revived', sa.Integer(), nullable=False),
+    sa.Column('mystery_box_rolls', sa.Integer(), nullable=False),
+    sa.Column('demon_bells_activated', sa.Integer(), nullable=False),
+    sa.Column('times_activated_power', sa.Integer(), nullable=False),
+    sa.Column('tokens_used_on_gates', sa.Integer(), nullable=False),
+    sa.Column('wrench_kills', sa.Integer(), nullable=False),
+    sa.Column('dual_viper_kills', sa.Integer(), nullable=False),
+    sa.Column('magma_cannon_kills', sa.Integer(), nullable=False),
+    sa.Column('arbiter_kills', sa.Integer(), nullable=False),
+    sa.Column('fusion_rifle_kills', sa.Integer(), nullable=False),
+    sa.Column('hunter_mine_launcher_kills', sa.Integer(), nullable=False),
+    sa.Column('b6_obliterator_kills', sa.Integer(), nullable=False),
+    sa.Column('scorpion_flail_kills', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_survival_stats_player_id'), 'deadlocked_survival_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_survival_veldin_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('solo_high_score', sa.Integer(), nullable=False),
+    sa.Column('coop_high_score', sa.Integer(), nullable=False),
+    sa.Column('xp', sa.Integer(), nullable=False),
+    sa.Column('prestige', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_survival_veldin_stats_player_id'), 'deadlocked_survival_veldin_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_training_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('time_played', sa.Integer(), nullable=False),
+    sa.Column('total_kills', sa.Integer(), nullable=False),
+    sa.Column('fusion_best_points', sa.Integer(), nullable=False),
+    sa.Column('fusion_best_time', sa.Integer(), nullable=False),
+    sa.Column('fusion_kills', sa.Integer(), nullable=False),
+    sa.Column('fusion_hits', sa.Integer(), nullable=False),
+    sa.Column('fusion_misses', sa.Integer(), nullable=False),
+    sa.Column('fusion_accuracy', sa.Integer(), nullable=False),
+    sa.Column('fusion_best_combo', sa.Integer(), nullable=False),
+    sa.Column('cycle_best_points', sa.Integer(), nullable=False),
+    sa.Column('cycle_best_combo', sa.Integer(), nullable=False),
+    sa.Column('cycle_kills', sa.Integer(), nullable=False),
+    sa.Column('cycle_deaths', sa.Integer(), nullable=False),
+    sa.Column('cycle_fusion_hits', sa.Integer(), nullable=False),
+    sa.Column('cycle_fusion_misses', sa.Integer(), nullable=False),
+    sa.Column('cycle_fusion_accuracy', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_training_stats_player_id'), 'deadlocked_training_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_vehicle_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('roadkills', sa.Integer(), nullable=False),
+    sa.Column('squats', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_vehicle_stats_player_id'), 'deadlocked_vehicle_stats', ['player_id'], unique=True)
+    op.create_table('deadlocked_weapon_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('wrench_kills', sa.Integer(), nullable=False),
+    sa.Column('wrench_deaths', sa.Integer(), nullable=False),
+    sa.Column('dual_viper_kills', sa.Integer(), nullable=False),
+    sa.Column('dual_viper_deaths', sa.Integer(), nullable=False),
+    sa.Column('magma_cannon_kills', sa.Integer(), nullable=False),
+    sa.Column('magma_cannon_deaths', sa.Integer(), nullable=False),
+    sa.Column('arbiter_kills', sa.Integer(), nullable=False),
+    sa.Column('arbiter_deaths', sa.Integer(), nullable=False),
+    sa.Column('fusion_rifle_kills', sa.Integer(), nullable=False),
+    sa.Column('fusion_rifle_deaths', sa.Integer(), nullable=False),
+    sa.Column('hunter_mine_launcher_kills', sa.Integer(), nullable=False),
+    sa.Column('hunter_mine_launcher_deaths', sa.Integer(), nullable=False),
+    sa.Column('b6_obliterator_kills', sa.Integer(), nullable=False),
+    sa.Column('b6_obliterator_deaths', sa.Integer(), nullable=False),
+    sa.Column('scorpion_flail_kills', sa.Integer(), nullable=False),
+    sa.Column('scorpion_flail_deaths', sa.Integer(), nullable=False),
+    sa.Column('holoshield_launcher_kills', sa.Integer(), nullable=False),
+    sa.Column('holoshield_launcher_deaths', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_deadlocked_weapon_stats_player_id'), 'deadlocked_weapon_stats', ['player_id'], unique=True)
+    op.create_table('uya_ctf_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('wl_ratio', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('kd_ratio', sa.Integer(), nullable=False),
+    sa.Column('base_dmg', sa.Integer(), nullable=False),
+    sa.Column('nodes', sa.Integer(), nullable=False),
+    sa.Column('flag_captures', sa.Integer(), nullable=False),
+    sa.Column('flag_saves', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('suicides', sa.Integer(), nullable=False),
+    sa.Column('avg_kills', sa.Integer(), nullable=False),
+    sa.Column('avg_deaths', sa.Integer(), nullable=False),
+    sa.Column('avg_nodes', sa.Integer(), nullable=False),
+    sa.Column('avg_base_dmg', sa.Integer(), nullable=False),
+    sa.Column('avg_flag_captures', sa.Integer(), nullable=False),
+    sa.Column('avg_flag_saves', sa.Integer(), nullable=False),
+    sa.Column('avg_suicides', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['uya_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_uya_ctf_stats_player_id'), 'uya_ctf_stats', ['player_id'], unique=True)
+    op.create_table('uya_deathmatch_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('wl_ratio', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('kd_ratio', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('suicides', sa.Integer(), nullable=False),
+    sa.Column('avg_kills', sa.Integer(), nullable=False),
+    sa.Column('avg_deaths', sa.Integer(), nullable=False),
+    sa.Column('avg_suicides', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['uya_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_uya_deathmatch_stats_player_id'), 'uya_deathmatch_stats', ['player_id'], unique=True)
+    op.create_table('uya_overall_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('wl_ratio', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('suicides', sa.Integer(), nullable=False),
+    sa.Column('kd_ratio', sa.Integer(), nullable=False),
+    sa.Column('base_dmg', sa.Integer(), nullable=False),
+    sa.Column('nodes', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('avg_kills', sa.Integer(), nullable=False),
+    sa.Column('avg_deaths', sa.Integer(), nullable=False),
+    sa.Column('avg_suicides', sa.Integer(), nullable=False),
+    sa.Column('avg_nodes', sa.Integer(), nullable=False),
+    sa.Column('avg_base_dmg', sa.Integer(), nullable=False),
+    sa.Column('squats', sa.Integer(), nullable=False),
+    sa.Column('avg_squats', sa.Integer(), nullable=False),
+    sa.Column('sq_ratio', sa.Integer(), nullable=False),
+    sa.Column('total_times_squatted', sa.Integer(), nullable=False),
+    sa.Column('avg_squatted_on', sa.Integer(), nullable=False),
+    sa.Column('sd_ratio', sa.Integer(), nullable=False),
+    sa.Column('total_team_squats', sa.Integer(), nullable=False),
+    sa.Column('avg_team_squats', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['uya_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_uya_overall_stats_player_id'), 'uya_overall_stats', ['player_id'], unique=True)
+    op.create_table('uya_player_game_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('game_id', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('win', sa.Boolean(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('base_dmg', sa.Integer(), nullable=False),
+    sa.Column('flag_captures', sa.Integer(), nullable=False),
+    sa.Column('flag_saves', sa.Integer(), nullable=False),
+    sa.Column('suicides', sa.Integer(), nullable=False),
+    sa.Column('nodes', sa.Integer(), nullable=False),
+    sa.Column('n60_deaths', sa.Integer(), nullable=False),
+    sa.Column('n60_kills', sa.Integer(), nullable=False),
+    sa.Column('lava_gun_deaths', sa.Integer(), nullable=False),
+    sa.Column('lava_gun_kills', sa.Integer(), nullable=False),
+    sa.Column('gravity_bomb_deaths', sa.Integer(), nullable=False),
+    sa.Column('gravity_bomb_kills', sa.Integer(), nullable=False),
+    sa.Column('flux_rifle_deaths', sa.Integer(), nullable=False),
+    sa.Column('flux_rifle_kills', sa.Integer(), nullable=False),
+    sa.Column('mine_glove_deaths', sa.Integer(), nullable=False),
+    sa.Column('mine_glove_kills', sa.Integer(), nullable=False),
+    sa.Column('morph_deaths', sa.Integer(), nullable=False),
+    sa.Column('morph_kills', sa.Integer(), nullable=False),
+    sa.Column('blitz_deaths', sa.Integer(), nullable=False),
+    sa.Column('blitz_kills', sa.Integer(), nullable=False),
+    sa.Column('rocket_deaths', sa.Integer(), nullable=False),
+    sa.Column('rocket_kills', sa.Integer(), nullable=False),
+    sa.Column('wrench_deaths', sa.Integer(), nullable=False),
+    sa.Column('wrench_kills', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['game_id'], ['uya_game_history.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('game_id', 'player_id', name='uix_game_id_player_id')
+    )
+    op.create_index(op.f('ix_uya_player_game_stats_id'), 'uya_player_game_stats', ['id'], unique=True)
+    op.create_table('uya_siege_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('wins', sa.Integer(), nullable=False),
+    sa.Column('losses', sa.Integer(), nullable=False),
+    sa.Column('wl_ratio', sa.Integer(), nullable=False),
+    sa.Column('kills', sa.Integer(), nullable=False),
+    sa.Column('deaths', sa.Integer(), nullable=False),
+    sa.Column('kd_ratio', sa.Integer(), nullable=False),
+    sa.Column('base_dmg', sa.Integer(), nullable=False),
+    sa.Column('nodes', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=False),
+    sa.Column('suicides', sa.Integer(), nullable=False),
+    sa.Column('avg_kills', sa.Integer(), nullable=False),
+    sa.Column('avg_deaths', sa.Integer(), nullable=False),
+    sa.Column('avg_nodes', sa.Integer(), nullable=False),
+    sa.Column('avg_base_dmg', sa.Integer(), nullable=False),
+    sa.Column('avg_suicides', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['uya_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_uya_siege_stats_player_id'), 'uya_siege_stats', ['player_id'], unique=True)
+    op.create_table('uya_weapon_stats',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('n60_deaths', sa.Integer(), nullable=False),
+    sa.Column('n60_kills', sa.Integer(), nullable=False),
+    sa.Column('lava_gun_deaths', sa.Integer(), nullable=False),
+    sa.Column('lava_gun_kills', sa.Integer(), nullable=False),
+    sa.Column('gravity_bomb_deaths', sa.Integer(), nullable=False),
+    sa.Column('gravity_bomb_kills', sa.Integer(), nullable=False),
+    sa.Column('flux_rifle_deaths', sa.Integer(), nullable=False),
+    sa.Column('flux_rifle_kills', sa.Integer(), nullable=False),
+    sa.Column('mine_glove_deaths', sa.Integer(), nullable=False),
+    sa.Column('mine_glove_kills', sa.Integer(), nullable=False),
+    sa.Column('morph_deaths', sa.Integer(), nullable=False),
+    sa.Column('morph_kills', sa.Integer(), nullable=False),
+    sa.Column('blitz_deaths', sa.Integer(), nullable=False),
+    sa.Column('blitz_kills', sa.Integer(), nullable=False),
+    sa.Column('rocket_deaths', sa.Integer(), nullable=False),
+    sa.Column('rocket_kills', sa.Integer(), nullable=False),
+    sa.Column('wrench_deaths', sa.Integer(), nullable=False),
+    sa.Column('wrench_kills', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['uya_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_index(op.f('ix_uya_weapon_stats_player_id'), 'uya_weapon_stats', ['player_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_uya_weapon_stats_player_id'), table_name='uya_weapon_stats')
+    op.drop_table('uya_weapon_stats')
+    op.drop_index(op.f('ix_uya_siege_stats_player_id'), table_name='uya_siege_stats')
+    op.drop_table('uya_siege_stats')
+    op.drop_index(op.f('ix_uya_player_game_stats_id'), table_name='uya_player_game_stats')
+    op.drop_table('uya_player_game_stats')
+    op.drop_index(op.f('ix_uya_overall_stats_player_id'), table_name='uya_overall_stats')
+    op.drop_table('uya_overall_stats')
+    op.drop_index(op.f('ix_uya_deathmatch_stats_player_id'), table_name='uya_deathmatch_stats')
+    op.drop_table('uya_deathmatch_stats')
+    op.drop_index(op.f('ix_uya_ctf_stats_player_id'), table_name='uya_ctf_stats')
+    op.drop_table('uya_ctf_stats')
+    op.drop_index(op.f('ix_deadlocked_weapon_stats_player_id'), table_name='deadlocked_weapon_stats')
+    op.drop_table('deadlocked_weapon_stats')
+    op.drop_index(op.f('ix_deadlocked_vehicle_stats_player_id'), table_name='deadlocked_vehicle_stats')
+    op.drop_table('deadlocked_vehicle_stats')
+    op.drop_index(op.f('ix_deadlocked_training_stats_player_id'), table_name='deadlocked_training_stats')
+    op.drop_table('deadlocked_training_stats')
+    op.drop_index(op.f('ix_deadlocked_survival_veldin_stats_player_id'), table_name='deadlocked_survival_veldin_stats')
+    op.drop_table('deadlocked_survival_veldin_stats')
+    op.drop_index(op.f('ix_deadlocked_survival_stats_player_id'), table_name='deadlocked_survival_stats')
+    op.drop_table('deadlocked_survival_stats')
+    op.drop_index(op.f('ix_deadlocked_survival_orxon_stats_player_id'), table_name='deadlocked_survival_orxon_stats')
+    op.drop_table('deadlocked_survival_orxon_stats')
+    op.drop_index(op.f('ix_deadlocked_survival_mountain_pass_stats_player_id'), table_name='deadlocked_survival_mountain_pass_stats')
+    op.drop_table('deadlocked_survival_mountain_pass_stats')
+    op.drop_index(op.f('ix_deadlocked_spleef_stats_player_id'), table_name='deadlocked_spleef_stats')
+    op.drop_table('deadlocked_spleef_stats')
+    op.drop_index(op.f('ix_deadlocked_snd_stats_player_id'), table_name='deadlocked_snd_stats')
+    op.drop_table('deadlocked_snd_stats')
+    op.drop_index(op.f('ix_deadlocked_payload_stats_player_id'), table_name='deadlocked_payload_stats')
+    op.drop_table('deadlocked_payload_stats')
+    op.drop_index(op.f('ix_deadlocked_overall_stats_player_id'), table_name='deadlocked_overall_stats')
+    op.drop_table('deadlocked_overall_stats')
+    op.drop_index(op.f('ix_deadlocked_koth_stats_player_id'), table_name='deadlocked_koth_stats')
+    op.drop_table('deadlocked_koth_stats')
+    op.drop_index(op.f('ix_deadlocked_juggernaut_stats_player_id'), table_name='deadlocked_juggernaut_stats')
+    op.drop_table('deadlocked_juggernaut_stats')
+    op.drop_index(op.f('ix_deadlocked_infinite_climber_stats_player_id'), table_name='deadlocked_infinite_climber_stats')
+    op.drop_table('deadlocked_infinite_climber_stats')
+    op.drop_index(op.f('ix_deadlocked_infected_stats_player_id'), table_name='deadlocked_infected_stats')
+    op.drop_table('deadlocked_infected_stats')
+    op.drop_index(op.f('ix_deadlocked_horizon_stats_player_id'), table_name='deadlocked_horizon_stats')
+    op.drop_table('deadlocked_horizon_stats')
+    op.drop_index(op.f('ix_deadlocked_gungame_stats_player_id'), table_name='deadlocked_gungame_stats')
+    op.drop_table('deadlocked_gungame_stats')
+    op.drop_index(op.f('ix_deadlocked_deathmatch_stats_player_id'), table_name='deadlocked_deathmatch_stats')
+    op.drop_table('deadlocked_deathmatch_stats')
+    op.drop_index(op.f('ix_deadlocked_ctf_stats_player_id'), table_name='deadlocked_ctf_stats')
+    op.drop_table('deadlocked_ctf_stats')
+    op.drop_index(op.f('ix_deadlocked_conquest_stats_player_id'), table_name='deadlocked_conquest_stats')
+    op.drop_table('deadlocked_conquest_stats')
+    op.drop_index(op.f('ix_uya_player_id'), table_name='uya_player')
+    op.drop_table('uya_player')
+    op.drop_index(op.f('ix_uya_game_history_id'), table_name='uya_game_history')
+    op.drop_table('uya_game_history')
+    op.drop_index(op.f('ix_deadlocked_player_id'), table_name='deadlocked_player')
+    op.drop_table('deadlocked_player')
@@ -0,0 +1,38 @@
+"""add game history indexes
+
+Revision ID: 7c1e4b2a9d30
+Revises: 3f2a9c41d7e0
+Create Date: 2026-10-19 17:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b2a9d30'
+down_revision: Union[str, None] = '3f2a9c41d7e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_uya_player_game_stats_player_id_game_id',
+        'uya_player_game_stats',
+        ['player_id', sa.text('game_id DESC')],
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_uya_game_history_game_end_time_id',
+        'uya_game_history',
+        ['game_end_time', 'id'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_uya_game_history_game_end_time_id', table_name='uya_game_history', if_exists=True)
+    op.drop_index('ix_uya_player_game_stats_player_id_game_id', table_name='uya_player_game_stats', if_exists=True)
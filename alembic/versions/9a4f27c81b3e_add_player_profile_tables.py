@@ -0,0 +1,41 @@
+"""add player profile tables
+
+Revision ID: 9a4f27c81b3e
+Revises: e51b8d3a6c04
+Create Date: 2026-10-19 17:47:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f27c81b3e'
+down_revision: Union[str, None] = 'e51b8d3a6c04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('deadlocked_player_profile',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('profile', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['deadlocked_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+    op.create_table('uya_player_profile',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('profile', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['player_id'], ['uya_player.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+
+
+
+def downgrade() -> None:
+    op.drop_table('uya_player_profile')
+    op.drop_table('deadlocked_player_profile')
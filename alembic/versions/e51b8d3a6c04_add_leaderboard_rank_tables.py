@@ -0,0 +1,64 @@
+"""add leaderboard rank tables
+
+Revision ID: e51b8d3a6c04
+Revises: 7c1e4b2a9d30
+Create Date: 2026-10-19 17:46:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e51b8d3a6c04'
+down_revision: Union[str, None] = '7c1e4b2a9d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('deadlocked_leaderboard_count',
+    sa.Column('domain', sa.String(), nullable=False),
+    sa.Column('stat', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('domain', 'stat')
+    )
+    op.create_table('deadlocked_leaderboard_rank',
+    sa.Column('domain', sa.String(), nullable=False),
+    sa.Column('stat', sa.String(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('dense_rank', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('domain', 'stat', 'position')
+    )
+    op.create_index('ix_deadlocked_leaderboard_rank_domain_stat_player_id', 'deadlocked_leaderboard_rank', ['domain', 'stat', 'player_id'], unique=True)
+    op.create_table('uya_leaderboard_count',
+    sa.Column('domain', sa.String(), nullable=False),
+    sa.Column('stat', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('domain', 'stat')
+    )
+    op.create_table('uya_leaderboard_rank',
+    sa.Column('domain', sa.String(), nullable=False),
+    sa.Column('stat', sa.String(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('dense_rank', sa.Integer(), nullable=False),
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('domain', 'stat', 'position')
+    )
+    op.create_index('ix_uya_leaderboard_rank_domain_stat_player_id', 'uya_leaderboard_rank', ['domain', 'stat', 'player_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_uya_leaderboard_rank_domain_stat_player_id', table_name='uya_leaderboard_rank')
+    op.drop_table('uya_leaderboard_rank')
+    op.drop_table('uya_leaderboard_count')
+    op.drop_index('ix_deadlocked_leaderboard_rank_domain_stat_player_id', table_name='deadlocked_leaderboard_rank')
+    op.drop_table('deadlocked_leaderboard_rank')
+    op.drop_table('deadlocked_leaderboard_count')
@@ -13,13 +13,17 @@ SQLALCHEMY_DATABASE_URL = f"postgresql://{CREDENTIALS['database_username']}:{CRE
 SQLALCHEMY_DATABASE_URL_ASYNC = f"postgresql+asyncpg://{CREDENTIALS['database_username']}:{CREDENTIALS['database_password']}" \
                           f"@{CREDENTIALS['database_host']}/{CREDENTIALS['database_name']}"
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-engine_async = create_async_engine(SQLALCHEMY_DATABASE_URL_ASYNC,
-    pool_size=20,                 # Max number of connections in the pool
-    max_overflow=10,               # Extra connections that can be created beyond pool_size
-    pool_timeout=30,               # Time to wait before timing out when requesting a connection
-    pool_recycle=1800              # Recycle connections after 30 minutes to avoid stale connections
-)
+# Both engines share the same pool configuration so they can be sized and monitored together. The request path runs
+# entirely on the async engine, the sync engine is only used by scripts and ad-hoc ingestion.
+DATABASE_POOL_SETTINGS: dict[str, int] = {
+    "pool_size": CREDENTIALS.get("database_pool_size", 20),         # Max number of connections in the pool
+    "max_overflow": CREDENTIALS.get("database_max_overflow", 10),   # Extra connections that can be created beyond pool_size
+    "pool_timeout": CREDENTIALS.get("database_pool_timeout", 30),   # Time to wait before timing out when requesting a connection
+    "pool_recycle": CREDENTIALS.get("database_pool_recycle", 1800)  # Recycle connections after 30 minutes to avoid stale connections
+}
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **DATABASE_POOL_SETTINGS)
+engine_async = create_async_engine(SQLALCHEMY_DATABASE_URL_ASYNC, **DATABASE_POOL_SETTINGS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 SessionLocalAsync = sessionmaker(
@@ -32,3 +36,23 @@ SessionLocalAsync = sessionmaker(
 
 Base = declarative_base()
 Base.metadata.create_all(bind=engine)
+
+
+def get_pool_status() -> dict[str, dict[str, int]]:
+    """
+    Reports the current utilization of both connection pools.
+
+    :return: A dictionary keyed by engine name containing the configured size, idle (checked in) connections,
+        in-use (checked out) connections and current overflow of each pool.
+    """
+    status: dict[str, dict[str, int]] = dict()
+
+    for name, pool in (("sync", engine.pool), ("async", engine_async.sync_engine.pool)):
+        status[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+
+    return status
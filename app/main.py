@@ -1,10 +1,13 @@
 import asyncio
 import traceback
+from typing import Literal
 
-from fastapi import FastAPI, WebSocket
+from fastapi import FastAPI, Query, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import SessionLocal
+from app.database import SessionLocal, get_pool_status
+from app.utils.player_registry import load_player_registries
+from app.utils.response_cache import leaderboard_page_cache
 
 from app.routers.dl.stats import router as deadlocked_stats_router
 from app.routers.uya.stats import router as uya_stats_router
@@ -14,10 +17,12 @@ from app.routers.uya.online import router as uya_online_router
 
 
 from app.routers.uya.game_history import router as uya_gamehistory_router
+from app.routers.uya.live import router as uya_live_router
 
 from horizon.middleware_manager import uya_online_tracker
 from horizon.middleware_manager import dl_online_tracker
 
+from horizon.live import FULL_MODE, BINARY_MODE, BINARY_SUBPROTOCOL
 from horizon.uya_live_tracker import uya_live_tracker
 
 
@@ -48,9 +53,12 @@ async def start_background_tasks():
     asyncio.create_task(uya_online_tracker.update_recent_stat_changes())
     asyncio.create_task(uya_online_tracker.poll_active_online())
     asyncio.create_task(uya_online_tracker.update_recent_game_history())
+    asyncio.create_task(uya_online_tracker.refresh_leaderboards())
     asyncio.create_task(dl_online_tracker.refresh_token())
     # asyncio.create_task(dl_online_tracker.update_recent_stat_changes())    # Will work once DL middleware is updated
     asyncio.create_task(dl_online_tracker.poll_active_online())
+    asyncio.create_task(dl_online_tracker.refresh_leaderboards())
+    asyncio.create_task(load_player_registries())
 
 # Add sub-APIs.
 app.include_router(deadlocked_stats_router)
@@ -58,6 +66,7 @@ app.include_router(uya_stats_router)
 app.include_router(deadlocked_online_router)
 app.include_router(uya_online_router)
 app.include_router(uya_gamehistory_router)
+app.include_router(uya_live_router)
 
 
 # Dependency
@@ -77,16 +86,55 @@ async def root():
     return {"message": "Hello World"}
 
 
+@app.get("/status/pools")
+async def database_pool_status() -> dict[str, dict[str, int]]:
+    """
+    Reports the utilization of the sync and async database connection pools.
+    """
+    return get_pool_status()
+
+
+@app.get("/status/leaderboard-cache")
+async def leaderboard_cache_status() -> dict[str, int]:
+    """
+    Reports the size, hit and miss counts of the leaderboard page cache.
+    """
+    return leaderboard_page_cache.stats()
+
+
+@app.get("/status/uya-live")
+async def uya_live_status() -> dict[str, int | float]:
+    """
+    Reports live tracker connections, broadcast and dropped frame counts and send latency.
+    """
+    return uya_live_tracker.metrics()
+
+
 @app.websocket("/ws/uya-live")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    uya_live_tracker.add_connection(websocket)
+async def websocket_endpoint(websocket: WebSocket, mode: Literal["full", "delta"] = FULL_MODE, delayed: bool = False):
+    # Clients that offer the binary subprotocol are sent binary snapshots instead of JSON.
+    binary: bool = BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if binary else None)
     try:
-        while True:
-            await uya_live_tracker.write(websocket)
+        await uya_live_tracker.serve(websocket, BINARY_MODE if binary else mode, delayed)
     except Exception as e:
         error_type = type(e).__name__  # Get the exception type
         print(f"uya-live-ws Error: {error_type}")
         traceback.print_exc()  # This will print the stack trace
-    finally:
-        uya_live_tracker.remove_connection(websocket)
+
+
+@app.websocket("/ws/uya-live/replay/{recording_id}")
+async def replay_websocket_endpoint(
+    websocket: WebSocket,
+    recording_id: str,
+    mode: Literal["full", "delta"] = FULL_MODE,
+    speed: float = Query(1, gt=0, le=64)
+):
+    binary: bool = BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if binary else None)
+    try:
+        await uya_live_tracker.serve_replay(websocket, recording_id, BINARY_MODE if binary else mode, speed)
+    except Exception as e:
+        error_type = type(e).__name__  # Get the exception type
+        print(f"uya-live-replay-ws Error: {error_type}")
+        traceback.print_exc()  # This will print the stack trace
@@ -22,3 +22,14 @@ from app.models.dl.deadlocked_player import (
     DeadlockedSurvivalVeldinStats,
     DeadlockedTrainingStats
 )
+
+from app.models.dl.deadlocked_leaderboard import (
+    DeadlockedLeaderboardRank,
+    DeadlockedLeaderboardCount,
+    Base,
+)
+
+from app.models.dl.deadlocked_player_profile import (
+    DeadlockedPlayerProfile,
+    Base,
+)
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+
+from app.database import Base
+
+
+###################
+# Leaderboard Ranks
+###################
+class DeadlockedLeaderboardRank(Base):
+    """
+    Precomputed leaderboard position of every player for every (domain, stat) pair. Pages are served as a range read
+    over `position` instead of sorting the stat table on each request.
+    """
+    __tablename__ = "deadlocked_leaderboard_rank"
+    __table_args__ = (
+        Index("ix_deadlocked_leaderboard_rank_domain_stat_player_id", "domain", "stat", "player_id", unique=True),
+    )
+
+    domain = Column(String, primary_key=True)
+    stat = Column(String, primary_key=True)
+    position = Column(Integer, primary_key=True)  # Leaderboard position, ties are broken by player ID.
+
+    dense_rank = Column(Integer, nullable=False)
+    player_id = Column(Integer, nullable=False)
+    score = Column(Integer, nullable=False)
+
+
+class DeadlockedLeaderboardCount(Base):
+    __tablename__ = "deadlocked_leaderboard_count"
+
+    domain = Column(String, primary_key=True)
+    stat = Column(String, primary_key=True)
+
+    count = Column(Integer, default=0, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False)
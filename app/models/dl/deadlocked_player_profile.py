@@ -0,0 +1,19 @@
+from sqlalchemy import Column, ForeignKey, Integer, DateTime, LargeBinary
+
+from app.database import Base
+
+
+#################
+# Player Profiles
+#################
+class DeadlockedPlayerProfile(Base):
+    """
+    Denormalized player profile, stored as the serialized `DeadlockedPlayerDetailsSchema` response. Rewritten by ingest
+    whenever the player's stats change so the player endpoint is a single primary key read.
+    """
+    __tablename__ = "deadlocked_player_profile"
+
+    player_id = Column(Integer, ForeignKey("deadlocked_player.id", ondelete="CASCADE"), primary_key=True)
+
+    profile = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
@@ -11,5 +11,17 @@ from app.models.uya.uya_player import (
 from app.models.uya.uya_game_history import (
     UyaGameHistory,
     UyaPlayerGameStats,
+    UyaGameHistoryRollup,
+    Base,
+)
+
+from app.models.uya.uya_leaderboard import (
+    UyaLeaderboardRank,
+    UyaLeaderboardCount,
+    Base,
+)
+
+from app.models.uya.uya_player_profile import (
+    UyaPlayerProfile,
     Base,
 )
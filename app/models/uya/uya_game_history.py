@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Float, UniqueConstraint
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Date, DateTime, Float, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -9,6 +9,11 @@ from app.database import Base
 ###############
 class UyaGameHistory(Base):
     __tablename__ = "uya_game_history"
+    __table_args__ = (
+        # Serves the newest-first history listing and its keyset cursors.
+        Index("ix_uya_game_history_game_end_time_id", "game_end_time", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, unique=True, nullable=False)
 
     status = Column(String, default="UNKNOWN STATUS", nullable=False)
@@ -74,3 +79,37 @@ class UyaPlayerGameStats(Base):
 
     # Relationship back to the game
     game = relationship("UyaGameHistory", back_populates="players")
+
+
+# Serves the per-player game history listing, newest game first.
+Index(
+    "ix_uya_player_game_stats_player_id_game_id",
+    UyaPlayerGameStats.player_id,
+    UyaPlayerGameStats.game_id.desc()
+)
+
+
+#################
+# History Rollups
+#################
+class UyaGameHistoryRollup(Base):
+    """
+    Game history totals per day and game configuration, incremented as each game is ingested. Analytics read these
+    rows instead of scanning the game history.
+    """
+    __tablename__ = "uya_game_history_rollup"
+
+    day = Column(Date, primary_key=True)  # Day the game ended
+    game_map = Column(String, primary_key=True)
+    game_mode = Column(String, primary_key=True)
+    game_submode = Column(String, primary_key=True)
+    time_limit = Column(Integer, primary_key=True)
+
+    games = Column(Integer, default=0, nullable=False)
+    total_duration = Column(Float, default=0, nullable=False)  # In minutes
+    total_players = Column(Integer, default=0, nullable=False)  # Sum of the games' player counts
+
+    player_results = Column(Integer, default=0, nullable=False)  # Number of per-player game stat rows
+    wins = Column(Integer, default=0, nullable=False)
+    kills = Column(Integer, default=0, nullable=False)
+    deaths = Column(Integer, default=0, nullable=False)
@@ -1,56 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy import column
+from typing import Optional
 
-from sqlalchemy.orm import Session, Query, DeclarativeBase
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from app.database import SessionLocal
-from app.models.dl import DeadlockedPlayer
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from fuzzywuzzy import fuzz
-from cachetools import cached, TTLCache
+from app.database import SessionLocalAsync
 
 from app.schemas.schemas import (
     Pagination,
+    CursorPagination,
     LeaderboardEntry,
     StatOffering,
     DeadlockedPlayerDetailsSchema,
-    DeadlockedOverallStatsSchema,
-    DeadlockedDeathmatchStatsSchema,
-    DeadlockedConquestStatsSchema,
-    DeadlockedCTFStatsSchema,
-    DeadlockedGameModeWithTimeSchema,
-    DeadlockedWeaponStatsSchema,
-    DeadlockedVehicleStatsSchema,
-    DeadlockedHorizonStatsSchema,
-    DeadlockedSNDStatsSchema,
-    DeadlockedPayloadStatsSchema,
-    DeadlockedSpleefStatsSchema,
-    DeadlockedInfectedStatsSchema,
-    DeadlockedGungameStatsSchema,
-    DeadlockedInfiniteClimberStatsSchema,
-    DeadlockedSurvivalStatsSchema,
-    DeadlockedTrainingStatsSchema,
-    DeadlockedSurvivalMapStatsSchema,
-    PlayerSchema
+    PlayerSchema,
+    PlayerRanksSchema
 )
+from app.utils.cursors import InvalidCursorError, decode_leaderboard_cursor
+from app.utils.leaderboards import get_leaderboard_async, get_player_ranks_async
+from app.utils.player_profiles import get_player_profile_async
+from app.utils.player_registry import dl_player_registry
+from app.utils.player_search import PlayerSearchIndex
 from app.utils.query_helpers import get_stat_domains, get_available_stats_for_domain, dl_compute_stat_offerings
+from app.utils.response_cache import leaderboard_page_cache
 
 
 router = APIRouter(prefix="/api/dl/stats", tags=["deadlocked-stats"])
 
 
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocalAsync() as db:
         yield db
-    finally:
-        db.close()
 
 
 @router.get("/offerings")
-def deadlocked_stat_offerings() -> Pagination[StatOffering]:
+async def deadlocked_stat_offerings() -> Pagination[StatOffering]:
     """
     Provides a list of all stat offerings tracked by Horizon. These offerings include the appropriate domain, stat and
     label for requesting leaderboard data.
@@ -59,12 +44,20 @@ def deadlocked_stat_offerings() -> Pagination[StatOffering]:
     return Pagination[StatOffering](count=len(offerings), results=offerings)
 
 
-@router.get("/leaderboard/{domain}/{stat}")
-def deadlocked_leaderboard(domain: str, stat: str, page: int = 1, session: Session = Depends(get_db)) -> Pagination[LeaderboardEntry]:
+@router.get("/leaderboard/{domain}/{stat}", response_model=CursorPagination[LeaderboardEntry])
+async def deadlocked_leaderboard(
+    domain: str,
+    stat: str,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_db)
+) -> Response:
     """
     Generate a paginated leaderboard (100 entries per page) for all Deadlocked stats. `domain` is a game mode or
     collection of stats (e.g., conquest, ctf, weapon, vehicle, etc.) and `stat` is a field that belongs to the parent
-    stat domain. All domains and all stats are formatted in snake case.
+    stat domain. All domains and all stats are formatted in snake case. Each page includes a `next_cursor`, which
+    can be passed as `cursor` to fetch the following page without an offset; `page` is ignored when it is given.
+    Pages are cached until the next batch of stats is ingested.
     """
     stat_domains: dict[str, type[DeclarativeBase]] = get_stat_domains("dl")
 
@@ -77,108 +70,63 @@ def deadlocked_leaderboard(domain: str, stat: str, page: int = 1, session: Sessi
     if stat not in available_stats:
         raise HTTPException(status_code=400, detail=f"Invalid stat field '{stat}'.")
 
-    if page < 1:
+    try:
+        leaderboard_cursor: tuple[int, int, int] | None = decode_leaderboard_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The page is ignored when a cursor is given, so it is normalized to keep it out of the cache key.
+    if page < 1 or leaderboard_cursor is not None:
         page = 0
     else:
         page -= 1
 
-    query: Query = session.query(DeadlockedPlayer) \
-        .join(stat_domain) \
-        .add_columns(column(stat)) \
-        .order_by(getattr(stat_domain, stat).desc(), DeadlockedPlayer.id.asc())
-
-    results: list[tuple[DeadlockedPlayer, int]] = list(query.offset(100 * page).limit(100))
+    async def compute_leaderboard_page() -> bytes:
+        leaderboard = await get_leaderboard_async("dl", session, domain, stat, page, leaderboard_cursor)
+        return leaderboard.model_dump_json().encode()
 
-    count = query.count()
-
-    return Pagination[LeaderboardEntry](
-        count=count,
-        results=[
-            LeaderboardEntry(
-                id=result.id,
-                username=result.username,
-                score=score,
-                rank=(100 * page) + index + 1
-            )
-            for index, (result, score)
-            in enumerate(results)
-        ]
+    body: bytes = await leaderboard_page_cache.get_or_compute(
+        "dl",
+        ("dl", domain, stat, page, leaderboard_cursor),
+        compute_leaderboard_page
     )
 
+    # Pages are cached pre-serialized, return them as-is instead of validating them again.
+    return Response(content=body, media_type="application/json")
 
-@router.get("/player/{id}")
-def deadlocked_player(id: int, session: Session = Depends(get_db)) -> DeadlockedPlayerDetailsSchema:
+
+@router.get("/player/{id}", response_model=DeadlockedPlayerDetailsSchema)
+async def deadlocked_player(id: int, session: AsyncSession = Depends(get_db)) -> Response:
     """
     Generate a paginated leaderboard (100 entries per page) for all Deadlocked stats. `domain` is a game mode or
     collection of stats (e.g., conquest, ctf, weapon, vehicle, etc.) and `stat` is a field that belongs to the parent
     stat domain. All domains and all stats are formatted in snake case.
     """
+    profile: bytes | None = await get_player_profile_async("dl", session, id)
 
-    query: Query = session.query(DeadlockedPlayer).filter_by(id=id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Player with ID '{id}' not found.")
 
-    stat_domains: dict[str, type[DeclarativeBase]] = get_stat_domains("dl")
-    for domain in stat_domains:
-        stat_domain: type[DeclarativeBase] = stat_domains[domain]
-        query = query.join(stat_domain)
+    # Profiles are stored pre-serialized, return them as-is instead of validating them again.
+    return Response(content=profile, media_type="application/json")
 
 
-    result: DeadlockedPlayer = query.first()
+@router.get("/player/{id}/ranks")
+async def dl_player_ranks(id: int, session: AsyncSession = Depends(get_db)) -> PlayerRanksSchema:
+    """
+    Provides the leaderboard rank and percentile of a player for every Deadlocked stat offering. The rank is the player's
+    position on the stat's leaderboard and the percentile is the percentage of players ranked below them.
+    """
+    result: PlayerRanksSchema | None = await get_player_ranks_async("dl", session, id)
 
     if result is None:
         raise HTTPException(status_code=404, detail=f"Player with ID '{id}' not found.")
 
-    stat_schema_dictionary: dict[str, type[BaseModel]] = {
-        "overall_stats": DeadlockedOverallStatsSchema,
-        "deathmatch_stats": DeadlockedDeathmatchStatsSchema,
-        "conquest_stats": DeadlockedConquestStatsSchema,
-        "ctf_stats": DeadlockedCTFStatsSchema,
-        "koth_stats": DeadlockedGameModeWithTimeSchema,
-        "juggernaut_stats": DeadlockedGameModeWithTimeSchema,
-        "weapon_stats": DeadlockedWeaponStatsSchema,
-        "vehicle_stats": DeadlockedVehicleStatsSchema,
-
-        "horizon_stats": DeadlockedHorizonStatsSchema,
-        "snd_stats": DeadlockedSNDStatsSchema,
-        "payload_stats": DeadlockedPayloadStatsSchema,
-        "spleef_stats": DeadlockedSpleefStatsSchema,
-        "infected_stats": DeadlockedInfectedStatsSchema,
-        "gungame_stats": DeadlockedGungameStatsSchema,
-        "infinite_climber_stats": DeadlockedInfiniteClimberStatsSchema,
-        "survival_stats": DeadlockedSurvivalStatsSchema,
-        "survival_orxon_stats": DeadlockedSurvivalMapStatsSchema,
-        "survival_mountain_pass_stats": DeadlockedSurvivalMapStatsSchema,
-        "survival_veldin_stats": DeadlockedSurvivalMapStatsSchema,
-        "training_stats": DeadlockedTrainingStatsSchema,
-    }
-
-    # TODO This is a very convoluted one-liner, add better documentation.
-    return DeadlockedPlayerDetailsSchema(
-        id=result.id,
-        username=result.username,
-        **{
-            stat_schema_key: stat_schema_dictionary[stat_schema_key](
-                **{
-                    field: getattr(getattr(result, stat_schema_key), field)
-                    for field
-                    in getattr(result, stat_schema_key).__dict__
-                }
-            )
-            for stat_schema_key
-            in stat_schema_dictionary
-        }
-    )
+    return result
 
 
-@cached(cache=TTLCache(maxsize=5, ttl=3600), key=lambda _: 0)
-def get_all_dl_players(session: Session) -> list[PlayerSchema]:
-    return [
-        PlayerSchema(id=result.id, username=result.username)
-        for result
-        in session.query(DeadlockedPlayer).with_entities(DeadlockedPlayer.id, DeadlockedPlayer.username)
-    ]
-
 @router.get("/search")
-def player_search(q: str, page: int, session: Session = Depends(get_db)) -> Pagination[PlayerSchema]:
+async def player_search(q: str, page: int, session: AsyncSession = Depends(get_db)) -> Pagination[PlayerSchema]:
     """
     Generate a paginated player lookup (100 entries per page) for all Deadlocked players. `q` is a query
     to look up a player by username. `page` is the page lookup page. Each page consists of 100 entries.
@@ -197,15 +145,34 @@ def player_search(q: str, page: int, session: Session = Depends(get_db)) -> Pagi
     else:
         page -= 1
 
-    all_players: list[PlayerSchema] = get_all_dl_players(session)
+    search_index: PlayerSearchIndex = (await dl_player_registry.ensure_loaded_async(session)).search_index
 
-    results: list[PlayerSchema] = list(sorted(all_players, key=lambda result: fuzz.ratio(result.username.lower(), q.lower()), reverse=True))
+    count, results = search_index.search(q, (page + 1) * 100)
 
     return Pagination[PlayerSchema](
-        count=len(results),
+        count=count,
         results=[
-            PlayerSchema(id=player.id, username=player.username)
-            for player
+            PlayerSchema(id=player_id, username=username)
+            for player_id, username
             in results[page * 100: (page + 1) * 100]
         ]
     )
+
+
+@router.get("/search/autocomplete")
+async def player_autocomplete(q: str, limit: int = 10, session: AsyncSession = Depends(get_db)) -> Pagination[PlayerSchema]:
+    """
+    Suggests players whose username starts with `q` (case insensitive), in alphabetical order. `limit` is the maximum
+    number of suggestions and is capped at 100.
+    """
+    if q.strip() == "":
+        return Pagination[PlayerSchema](count=0, results=[])
+
+    search_index: PlayerSearchIndex = (await dl_player_registry.ensure_loaded_async(session)).search_index
+
+    results: list[tuple[int, str]] = search_index.autocomplete(q[:16], min(max(limit, 0), 100))
+
+    return Pagination[PlayerSchema](
+        count=len(results),
+        results=[PlayerSchema(id=player_id, username=username) for player_id, username in results]
+    )
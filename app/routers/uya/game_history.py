@@ -1,10 +1,13 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy import column
+from sqlalchemy import select, func, tuple_, Select
 
-from sqlalchemy.orm import Session, Query, DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.database import SessionLocalAsync
 from app.models.uya import (
     UyaGameHistory,
     UyaPlayerGameStats,
@@ -13,41 +16,72 @@ from app.models.uya import (
 
 from app.schemas.schemas import (
     Pagination,
+    CursorPagination,
     UyaGameHistoryEntry,
     UyaGameHistoryPlayerStatSchema,
-    UyaGameHistoryDetailSchema
+    UyaGameHistoryDetailSchema,
+    UyaPlayerGameHistoryEntry,
+    UyaGameHistoryStatsEntry
+)
+from app.utils.cursors import (
+    InvalidCursorError,
+    decode_game_history_cursor,
+    encode_game_history_cursor,
+    decode_player_game_history_cursor,
+    encode_player_game_history_cursor
 )
+from app.utils.gamehistory_rollups import get_uya_gamehistory_stats_async, uya_rollup_today
+from app.utils.player_registry import PlayerRegistry, uya_player_registry
 from app.utils.query_helpers import get_stat_domains, get_available_stats_for_domain, uya_compute_stat_offerings
 
 router = APIRouter(prefix="/api/uya/gamehistory", tags=["uya-gamehistory"])
 
 
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocalAsync() as db:
         yield db
-    finally:
-        db.close()
 
 
 @router.get("/history")
-def uya_gamehistory(page: int = 1, session: Session = Depends(get_db)) -> Pagination[UyaGameHistoryEntry]:
+async def uya_gamehistory(
+    page: int = 1,
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_db)
+) -> CursorPagination[UyaGameHistoryEntry]:
+    """
+    Lists games newest first (100 entries per page). Each page includes a `next_cursor`, which can be passed as
+    `cursor` to fetch the following page without an offset; `page` is ignored when it is given.
+    """
+    try:
+        history_cursor: tuple[datetime, int] | None = decode_game_history_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if page < 1:
         page = 0
     else:
         page -= 1
 
-    query: Query = session.query(UyaGameHistory) \
-        .order_by(UyaGameHistory.game_end_time.desc())
+    query: Select = select(UyaGameHistory) \
+        .order_by(UyaGameHistory.game_end_time.desc(), UyaGameHistory.id.desc())
+
+    if history_cursor is not None:
+        query = query.filter(tuple_(UyaGameHistory.game_end_time, UyaGameHistory.id) < tuple_(*history_cursor))
+    else:
+        query = query.offset(100 * page)
 
-    results: list[tuple[UyaGameHistory, int]] = list(query.offset(100 * page).limit(100))
+    results: list[UyaGameHistory] = list((await session.execute(query.limit(100))).scalars())
 
-    count = query.count()
+    count: int = (await session.execute(select(func.count()).select_from(UyaGameHistory))).scalar_one()
 
-    return Pagination[UyaGameHistoryEntry](
+    next_cursor: str | None = None
+    if len(results) == 100:
+        next_cursor = encode_game_history_cursor(results[-1].game_end_time, results[-1].id)
+
+    return CursorPagination[UyaGameHistoryEntry](
         count=count,
+        next_cursor=next_cursor,
         results=[
             UyaGameHistoryEntry(
                 id=result.id,
@@ -78,22 +112,38 @@ def uya_gamehistory(page: int = 1, session: Session = Depends(get_db)) -> Pagina
 
 
 @router.get("/details/{id}")
-def uya_game(id: int, session: Session = Depends(get_db)) -> None:
+async def uya_game(id: int, session: AsyncSession = Depends(get_db)) -> UyaGameHistoryDetailSchema:
 
 
-    query: Query = session.query(UyaGameHistory).filter_by(id=id)
-    game_result: UyaGameHistory = query.first()
+    query: Select = select(UyaGameHistory).filter_by(id=id)
+    game_result: UyaGameHistory = (await session.execute(query)).scalars().first()
 
     if game_result is None:
         raise HTTPException(status_code=404, detail=f"Game with ID '{id}' not found.")
     
-    # Get all the individual player stats
-    player_query: Query = session.query(UyaPlayerGameStats, UyaPlayer.username).join(UyaPlayer, UyaPlayerGameStats.player_id == UyaPlayer.id).filter(UyaPlayerGameStats.game_id == id)
-    # Tuple: UyaPlayerGameStats, username
-    result: list[tuple[UyaPlayerGameStats, str]] = player_query.all()
-    
+    # Get all the individual player stats, usernames come from the player registry
+    player_query: Select = select(UyaPlayerGameStats).filter(UyaPlayerGameStats.game_id == id)
+    result: list[UyaPlayerGameStats] = list((await session.execute(player_query)).scalars())
+
+    player_registry: PlayerRegistry = await uya_player_registry.ensure_loaded_async(session)
+
+    # Players created outside of this process (e.g. by the dataloader) are registered on first sight.
+    unregistered_ids: list[int] = [
+        player_stats.player_id for player_stats in result if player_registry.username(player_stats.player_id) is None
+    ]
+    if unregistered_ids:
+        unregistered_query: Select = select(UyaPlayer.id, UyaPlayer.username).filter(UyaPlayer.id.in_(unregistered_ids))
+        for player_id, username in (await session.execute(unregistered_query)).all():
+            player_registry.upsert(player_id, username)
+
     players = []
-    for player_stats, username in result:
+    for player_stats in result:
+        username: str | None = player_registry.username(player_stats.player_id)
+
+        # Only players that exist in the player table are listed
+        if username is None:
+            continue
+
         players.append(UyaGameHistoryPlayerStatSchema(
             username=username,
             game_id = player_stats.game_id,
@@ -151,3 +201,120 @@ def uya_game(id: int, session: Session = Depends(get_db)) -> None:
         ),
         players=players
     )
+
+
+@router.get("/player/{id}")
+async def uya_player_gamehistory(
+    id: int,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_db)
+) -> CursorPagination[UyaPlayerGameHistoryEntry]:
+    """
+    Lists the games of a player newest first (100 entries per page), each with the player's own results. Each page
+    includes a `next_cursor`, which can be passed as `cursor` to fetch the following page without an offset; `page`
+    is ignored when it is given.
+    """
+    try:
+        last_game_id: int | None = decode_player_game_history_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page < 1:
+        page = 0
+    else:
+        page -= 1
+
+    query: Select = select(UyaPlayerGameStats, UyaGameHistory) \
+        .join(UyaGameHistory, UyaGameHistory.id == UyaPlayerGameStats.game_id) \
+        .filter(UyaPlayerGameStats.player_id == id) \
+        .order_by(UyaPlayerGameStats.game_id.desc())
+
+    if last_game_id is not None:
+        query = query.filter(UyaPlayerGameStats.game_id < last_game_id)
+    else:
+        query = query.offset(100 * page)
+
+    results: list[tuple[UyaPlayerGameStats, UyaGameHistory]] = (await session.execute(query.limit(100))).all()
+
+    count: int = (await session.execute(
+        select(func.count()).select_from(UyaPlayerGameStats).filter(UyaPlayerGameStats.player_id == id)
+    )).scalar_one()
+
+    next_cursor: str | None = None
+    if len(results) == 100:
+        next_cursor = encode_player_game_history_cursor(results[-1][0].game_id)
+
+    return CursorPagination[UyaPlayerGameHistoryEntry](
+        count=count,
+        next_cursor=next_cursor,
+        results=[
+            UyaPlayerGameHistoryEntry(
+                **{field: getattr(game, field) for field in UyaGameHistoryEntry.model_fields},
+                win=player_stats.win,
+                kills=player_stats.kills,
+                deaths=player_stats.deaths,
+                suicides=player_stats.suicides,
+                base_dmg=player_stats.base_dmg,
+                flag_captures=player_stats.flag_captures,
+                flag_saves=player_stats.flag_saves,
+                nodes=player_stats.nodes
+            )
+            for player_stats, game
+            in results
+        ]
+    )
+
+
+def _rollup_start_day(days: Optional[int]) -> date | None:
+    if days is None:
+        return None
+
+    if days < 1:
+        raise HTTPException(status_code=400, detail=f"Invalid number of days '{days}'.")
+
+    return uya_rollup_today() - timedelta(days=days - 1)
+
+
+@router.get("/stats/maps")
+async def uya_gamehistory_map_stats(
+    days: Optional[int] = None,
+    session: AsyncSession = Depends(get_db)
+) -> Pagination[UyaGameHistoryStatsEntry]:
+    """
+    Games played, average duration, average player count and win rate per map. `days` limits the stats to the last
+    number of days, otherwise all games are included.
+    """
+    results = await get_uya_gamehistory_stats_async(session, ("game_map",), _rollup_start_day(days))
+    return Pagination[UyaGameHistoryStatsEntry](count=len(results), results=results)
+
+
+@router.get("/stats/modes")
+async def uya_gamehistory_mode_stats(
+    days: Optional[int] = None,
+    session: AsyncSession = Depends(get_db)
+) -> Pagination[UyaGameHistoryStatsEntry]:
+    """
+    Games played, average duration, average player count and win rate per game mode, submode and time limit.
+    `days` limits the stats to the last number of days, otherwise all games are included.
+    """
+    results = await get_uya_gamehistory_stats_async(
+        session,
+        ("game_mode", "game_submode", "time_limit"),
+        _rollup_start_day(days)
+    )
+    return Pagination[UyaGameHistoryStatsEntry](count=len(results), results=results)
+
+
+@router.get("/stats/daily")
+async def uya_gamehistory_daily_stats(
+    days: Optional[int] = 30,
+    session: AsyncSession = Depends(get_db)
+) -> Pagination[UyaGameHistoryStatsEntry]:
+    """
+    Games played, average duration, average player count and win rate per day, for the last `days` days (30 by
+    default).
+    """
+    results = await get_uya_gamehistory_stats_async(session, ("day",), _rollup_start_day(days))
+    results.sort(key=lambda result: result.day, reverse=True)
+    return Pagination[UyaGameHistoryStatsEntry](count=len(results), results=results)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.schemas.schemas import Pagination, UyaLiveRecordingSchema
+from horizon.uya_live_tracker import uya_live_tracker
+
+router = APIRouter(prefix="/api/uya/live", tags=["uya-live"])
+
+
+@router.get("/recordings")
+def uya_live_recordings() -> Pagination[UyaLiveRecordingSchema]:
+    """
+    Provide a list of recorded live matches, most recent first. Matches still being played have no end time.
+    Recordings are replayed through the /ws/uya-live/replay/{recording_id} websocket.
+    """
+    recordings: list[UyaLiveRecordingSchema] = [
+        UyaLiveRecordingSchema(**recording) for recording in uya_live_tracker.recordings()
+    ]
+    return Pagination[UyaLiveRecordingSchema](count=len(recordings), results=recordings)
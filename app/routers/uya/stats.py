@@ -1,43 +1,42 @@
-from cachetools import cached, TTLCache
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy import column, func
+from typing import Optional
 
-from sqlalchemy.orm import Session, Query, DeclarativeBase
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from app.database import SessionLocal
-from app.models.uya import UyaPlayer
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocalAsync
 
 from app.schemas.schemas import (
     Pagination,
+    CursorPagination,
     LeaderboardEntry,
     StatOffering,
-    UyaSiegeStatsSchema,
-    UyaDeathmatchStatsSchema,
-    UyaOverallStatsSchema,
-    UyaCTFStatsSchema,
     UyaPlayerDetailsSchema,
-    PlayerSchema
+    PlayerSchema,
+    PlayerRanksSchema
 )
+from app.utils.cursors import InvalidCursorError, decode_leaderboard_cursor
+from app.utils.leaderboards import get_leaderboard_async, get_player_ranks_async
+from app.utils.player_profiles import get_player_profile_async
+from app.utils.player_registry import uya_player_registry
+from app.utils.player_search import PlayerSearchIndex
 from app.utils.query_helpers import get_stat_domains, get_available_stats_for_domain, uya_compute_stat_offerings
+from app.utils.response_cache import leaderboard_page_cache
 
-from fuzzywuzzy import fuzz
 
 
 router = APIRouter(prefix="/api/uya/stats", tags=["uya-stats"])
 
 
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocalAsync() as db:
         yield db
-    finally:
-        db.close()
 
 
 @router.get("/offerings")
-def uya_stat_offerings() -> Pagination[StatOffering]:
+async def uya_stat_offerings() -> Pagination[StatOffering]:
     """
     Provides a list of all stat offerings tracked by Horizon. These offerings include the appropriate domain, stat and
     label for requesting leaderboard data.
@@ -46,12 +45,20 @@ def uya_stat_offerings() -> Pagination[StatOffering]:
     return Pagination[StatOffering](count=len(offerings), results=offerings)
 
 
-@router.get("/leaderboard/{domain}/{stat}")
-def uya_leaderboard(domain: str, stat: str, page: int = 1, session: Session = Depends(get_db)) -> Pagination[LeaderboardEntry]:
+@router.get("/leaderboard/{domain}/{stat}", response_model=CursorPagination[LeaderboardEntry])
+async def uya_leaderboard(
+    domain: str,
+    stat: str,
+    page: int = 1,
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_db)
+) -> Response:
     """
     Generate a paginated leaderboard (100 entries per page) for all Deadlocked stats. `domain` is a game mode or
     collection of stats (e.g., conquest, ctf, weapon, vehicle, etc.) and `stat` is a field that belongs to the parent
-    stat domain. All domains and all stats are formatted in snake case.
+    stat domain. All domains and all stats are formatted in snake case. Each page includes a `next_cursor`, which
+    can be passed as `cursor` to fetch the following page without an offset; `page` is ignored when it is given.
+    Pages are cached until the next batch of stats is ingested.
     """
     stat_domains: dict[str, type[DeclarativeBase]] = get_stat_domains("uya")
 
@@ -64,90 +71,63 @@ def uya_leaderboard(domain: str, stat: str, page: int = 1, session: Session = De
     if stat not in available_stats:
         raise HTTPException(status_code=400, detail=f"Invalid stat field '{stat}'.")
 
-    if page < 1:
+    try:
+        leaderboard_cursor: tuple[int, int, int] | None = decode_leaderboard_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The page is ignored when a cursor is given, so it is normalized to keep it out of the cache key.
+    if page < 1 or leaderboard_cursor is not None:
         page = 0
     else:
         page -= 1
 
-    query: Query = session.query(UyaPlayer) \
-        .join(stat_domain) \
-        .add_columns(column(stat)) \
-        .order_by(getattr(stat_domain, stat).desc(), UyaPlayer.id.asc())
+    async def compute_leaderboard_page() -> bytes:
+        leaderboard = await get_leaderboard_async("uya", session, domain, stat, page, leaderboard_cursor)
+        return leaderboard.model_dump_json().encode()
 
-    results: list[tuple[UyaPlayer, int]] = list(query.offset(100 * page).limit(100))
+    body: bytes = await leaderboard_page_cache.get_or_compute(
+        "uya",
+        ("uya", domain, stat, page, leaderboard_cursor),
+        compute_leaderboard_page
+    )
 
-    count = query.count()
+    # Pages are cached pre-serialized, return them as-is instead of validating them again.
+    return Response(content=body, media_type="application/json")
 
-    return Pagination[LeaderboardEntry](
-        count=count,
-        results=[
-            LeaderboardEntry(
-                id=result.id,
-                username=result.username,
-                score=score,
-                rank=(100 * page) + index + 1
-            )
-            for index, (result, score)
-            in enumerate(results)
-        ]
-    )
 
-@router.get("/player/{id}")
-def uya_player(id: int, session: Session = Depends(get_db)) -> UyaPlayerDetailsSchema:
+@router.get("/player/{id}", response_model=UyaPlayerDetailsSchema)
+async def uya_player(id: int, session: AsyncSession = Depends(get_db)) -> Response:
     """
     Generate a paginated leaderboard (100 entries per page) for all Deadlocked stats. `domain` is a game mode or
     collection of stats (e.g., conquest, ctf, weapon, vehicle, etc.) and `stat` is a field that belongs to the parent
     stat domain. All domains and all stats are formatted in snake case.
     """
+    profile: bytes | None = await get_player_profile_async("uya", session, id)
 
-    query: Query = session.query(UyaPlayer).filter_by(id=id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Player with ID '{id}' not found.")
 
-    stat_domains: dict[str, type[DeclarativeBase]] = get_stat_domains("uya")
-    for domain in stat_domains:
-        stat_domain: type[DeclarativeBase] = stat_domains[domain]
-        query = query.join(stat_domain)
+    # Profiles are stored pre-serialized, return them as-is instead of validating them again.
+    return Response(content=profile, media_type="application/json")
 
 
-    result: UyaPlayer = query.first()
+@router.get("/player/{id}/ranks")
+async def uya_player_ranks(id: int, session: AsyncSession = Depends(get_db)) -> PlayerRanksSchema:
+    """
+    Provides the leaderboard rank and percentile of a player for every UYA stat offering. The rank is the player's
+    position on the stat's leaderboard and the percentile is the percentage of players ranked below them.
+    """
+    result: PlayerRanksSchema | None = await get_player_ranks_async("uya", session, id)
 
     if result is None:
         raise HTTPException(status_code=404, detail=f"Player with ID '{id}' not found.")
 
-    stat_schema_dictionary: dict[str, type[BaseModel]] = {
-        "overall_stats": UyaOverallStatsSchema,
-        "deathmatch_stats": UyaDeathmatchStatsSchema,
-        "siege_stats": UyaSiegeStatsSchema,
-        "ctf_stats": UyaCTFStatsSchema,
-    }
-
-    # TODO This is a very convoluted one-liner, add better documentation.
-    return UyaPlayerDetailsSchema(
-        id=result.id,
-        username=result.username,
-        **{
-            stat_schema_key: stat_schema_dictionary[stat_schema_key](
-                **{
-                    field: getattr(getattr(result, stat_schema_key), field)
-                    for field
-                    in getattr(result, stat_schema_key).__dict__
-                }
-            )
-            for stat_schema_key
-            in stat_schema_dictionary
-        }
-    )
+    return result
 
 
-@cached(cache=TTLCache(maxsize=5, ttl=3600), key=lambda _: 0)
-def get_all_uya_players(session: Session) -> list[PlayerSchema]:
-    return [
-        PlayerSchema(id=result.id, username=result.username)
-        for result
-        in session.query(UyaPlayer).with_entities(UyaPlayer.id, UyaPlayer.username)
-    ]
-
 @router.get("/search")
-def player_search(q: str, page: int, session: Session = Depends(get_db)) -> Pagination[PlayerSchema]:
+async def player_search(q: str, page: int, session: AsyncSession = Depends(get_db)) -> Pagination[PlayerSchema]:
     """
     Generate a paginated player lookup (100 entries per page) for all Deadlocked players. `q` is a query
     to look up a player by username. `page` is the page lookup page. Each page consists of 100 entries.
@@ -166,15 +146,34 @@ def player_search(q: str, page: int, session: Session = Depends(get_db)) -> Pagi
     else:
         page -= 1
 
-    all_players: list[PlayerSchema] = get_all_uya_players(session)
+    search_index: PlayerSearchIndex = (await uya_player_registry.ensure_loaded_async(session)).search_index
 
-    results: list[PlayerSchema] = list(sorted(all_players, key=lambda result: fuzz.ratio(result.username.lower(), q.lower()), reverse=True))
+    count, results = search_index.search(q, (page + 1) * 100)
 
     return Pagination[PlayerSchema](
-        count=len(results),
+        count=count,
         results=[
-            PlayerSchema(id=player.id, username=player.username)
-            for player
+            PlayerSchema(id=player_id, username=username)
+            for player_id, username
             in results[page * 100: (page + 1) * 100]
         ]
     )
+
+
+@router.get("/search/autocomplete")
+async def player_autocomplete(q: str, limit: int = 10, session: AsyncSession = Depends(get_db)) -> Pagination[PlayerSchema]:
+    """
+    Suggests players whose username starts with `q` (case insensitive), in alphabetical order. `limit` is the maximum
+    number of suggestions and is capped at 100.
+    """
+    if q.strip() == "":
+        return Pagination[PlayerSchema](count=0, results=[])
+
+    search_index: PlayerSearchIndex = (await uya_player_registry.ensure_loaded_async(session)).search_index
+
+    results: list[tuple[int, str]] = search_index.autocomplete(q[:16], min(max(limit, 0), 100))
+
+    return Pagination[PlayerSchema](
+        count=len(results),
+        results=[PlayerSchema(id=player_id, username=username) for player_id, username in results]
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 class Pagination[T](BaseModel):
@@ -7,6 +7,10 @@ class Pagination[T](BaseModel):
     results: list[T]
 
 
+class CursorPagination[T](Pagination[T]):
+    next_cursor: Optional[str] = None
+
+
 class LeaderboardEntry(BaseModel):
     id: int
     username: str
@@ -21,6 +25,12 @@ class StatOffering(BaseModel):
     custom: bool
 
 
+class StatRank(StatOffering):
+    rank: int
+    percentile: float
+    score: int
+
+
 class DeadlockedStatsBase(BaseModel):
     rank: int
     wins: int
@@ -190,6 +200,10 @@ class PlayerSchema(BaseModel):
     username: str
 
 
+class PlayerRanksSchema(PlayerSchema):
+    ranks: list[StatRank]
+
+
 class DeadlockedPlayerDetailsSchema(PlayerSchema):
 
     overall_stats: DeadlockedOverallStatsSchema
@@ -363,6 +377,17 @@ class UYALiveGameSession(BaseModel):
     game_mode: str
 
 
+class UyaLiveRecordingSchema(BaseModel):
+    id: str
+    world_id: int
+    name: Optional[str] = None
+    map: Optional[str] = None
+    game_mode: Optional[str] = None
+    started: float
+    ended: Optional[float] = None
+    frames: int
+
+
 class UyaGameHistoryPlayerStatSchema(BaseModel):
     game_id: int
     player_id: int
@@ -400,3 +425,29 @@ class UyaGameHistoryPlayerStatSchema(BaseModel):
 class UyaGameHistoryDetailSchema(BaseModel):
     game: UyaGameHistoryEntry
     players: list[UyaGameHistoryPlayerStatSchema]
+
+
+class UyaPlayerGameHistoryEntry(UyaGameHistoryEntry):
+    win: bool
+    kills: int
+    deaths: int
+    suicides: int
+    base_dmg: int
+    flag_captures: int
+    flag_saves: int
+    nodes: int
+
+
+class UyaGameHistoryStatsEntry(BaseModel):
+    day: Optional[date] = None
+    game_map: Optional[str] = None
+    game_mode: Optional[str] = None
+    game_submode: Optional[str] = None
+    time_limit: Optional[int] = None
+
+    games: int
+    average_duration: float  # In minutes
+    average_players: float
+    win_rate: float  # Share of player results that were wins
+    kills: int
+    deaths: int
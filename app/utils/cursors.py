@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+
+
+def encode_cursor(*values: int | str) -> str:
+    """
+    Packs the sort key of the last row of a page into an opaque, URL-safe cursor token.
+
+    :param values: JSON-serializable sort key values.
+    :return: The cursor token.
+    """
+    payload: bytes = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, length: int) -> list[int | str]:
+    """
+    :param cursor: A cursor token produced by `encode_cursor`.
+    :param length: Expected number of sort key values.
+    :return: The decoded sort key values.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'.")
+
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'.")
+
+    return values
+
+
+def encode_leaderboard_cursor(score: int, player_id: int, position: int) -> str:
+    return encode_cursor(score, player_id, position)
+
+
+def decode_leaderboard_cursor(cursor: str) -> tuple[int, int, int]:
+    """
+    :return: The (score, player ID, position) of the last leaderboard entry seen.
+    """
+    values: list = decode_cursor(cursor, 3)
+
+    if not all(isinstance(value, int) for value in values):
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'.")
+
+    score, player_id, position = values
+    return score, player_id, position
+
+
+def encode_game_history_cursor(game_end_time: datetime, game_id: int) -> str:
+    return encode_cursor(game_end_time.isoformat(), game_id)
+
+
+def decode_game_history_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    :return: The (game end time, game ID) of the last game seen.
+    """
+    game_end_time, game_id = decode_cursor(cursor, 2)
+
+    try:
+        return datetime.fromisoformat(game_end_time), int(game_id)
+    except (TypeError, ValueError):
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'.")
+
+
+def encode_player_game_history_cursor(game_id: int) -> str:
+    return encode_cursor(game_id)
+
+
+def decode_player_game_history_cursor(cursor: str) -> int:
+    """
+    :return: The ID of the last game seen.
+    """
+    game_id, = decode_cursor(cursor, 1)
+
+    if not isinstance(game_id, int):
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'.")
+
+    return game_id
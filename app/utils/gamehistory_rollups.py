@@ -0,0 +1,184 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import select, delete, insert, func, case, Date, Select
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.uya import UyaGameHistory, UyaPlayerGameStats, UyaGameHistoryRollup
+from app.schemas.schemas import UyaGameHistoryStatsEntry
+from horizon.parsing.uya_game_record import UyaGameRecord
+
+
+UYA_ROLLUP_KEYS: tuple[str, ...] = ("day", "game_map", "game_mode", "game_submode", "time_limit")
+UYA_ROLLUP_COUNTERS: tuple[str, ...] = (
+    "games",
+    "total_duration",
+    "total_players",
+    "player_results",
+    "wins",
+    "kills",
+    "deaths",
+)
+
+
+def uya_rollup_today() -> date:
+    """
+    :return: The current rollup day. Rollup days are the dates of game end times, which the middleware reports in UTC,
+        so the current day is also taken in UTC instead of the server's local timezone.
+    """
+    return datetime.now(timezone.utc).date()
+
+
+def _uya_rollup_key(game: UyaGameRecord) -> dict[str, any]:
+    return {
+        "day": game.game_end_time.date(),
+        "game_map": game.game_map,
+        "game_mode": game.game_mode,
+        "game_submode": game.game_submode,
+        "time_limit": game.time_limit,
+    }
+
+
+def uya_game_rollup_increment(game: UyaGameRecord) -> dict[str, any]:
+    """
+    :return: The rollup row values added by a newly ingested game.
+    """
+    return {
+        **_uya_rollup_key(game),
+        "games": 1,
+        "total_duration": game.game_duration,
+        "total_players": game.player_count,
+        "player_results": 0,
+        "wins": 0,
+        "kills": 0,
+        "deaths": 0,
+    }
+
+
+def uya_player_rollup_increment(game: UyaGameRecord, player_stats: dict[str, int | bool]) -> dict[str, any]:
+    """
+    :return: The rollup row values added by a newly ingested player result of a game.
+    """
+    return {
+        **_uya_rollup_key(game),
+        "games": 0,
+        "total_duration": 0,
+        "total_players": 0,
+        "player_results": 1,
+        "wins": int(player_stats["win"]),
+        "kills": player_stats["kills"],
+        "deaths": player_stats["deaths"],
+    }
+
+
+async def increment_uya_gamehistory_rollup_async(session: AsyncSession, increment: dict[str, any]) -> None:
+    """
+    Adds an increment to its rollup row, creating the row if needed. Runs in the session's current transaction so the
+    increment is committed together with the rows it describes.
+    """
+    statement = postgres_insert(UyaGameHistoryRollup).values(**increment)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(UYA_ROLLUP_KEYS),
+        set_={
+            counter: getattr(UyaGameHistoryRollup, counter) + getattr(statement.excluded, counter)
+            for counter in UYA_ROLLUP_COUNTERS
+        }
+    )
+
+    await session.execute(statement)
+
+
+def rebuild_uya_gamehistory_rollups(session: Session) -> None:
+    """
+    Recomputes every rollup row from the game history. Used after bulk loads, which may rewrite existing games.
+    """
+    day = func.date(UyaGameHistory.game_end_time, type_=Date)
+    keys: list = [day, UyaGameHistory.game_map, UyaGameHistory.game_mode, UyaGameHistory.game_submode, UyaGameHistory.time_limit]
+
+    game_totals: Select = select(
+        *keys,
+        func.count(),
+        func.sum(UyaGameHistory.game_duration),
+        func.sum(UyaGameHistory.player_count)
+    ).group_by(*keys)
+
+    player_totals: Select = select(
+        *keys,
+        func.count(),
+        func.sum(case((UyaPlayerGameStats.win, 1), else_=0)),
+        func.sum(UyaPlayerGameStats.kills),
+        func.sum(UyaPlayerGameStats.deaths)
+    ).join(UyaGameHistory, UyaGameHistory.id == UyaPlayerGameStats.game_id).group_by(*keys)
+
+    rollups: dict[tuple, dict[str, any]] = dict()
+
+    for *key, games, total_duration, total_players in session.execute(game_totals).all():
+        rollups[tuple(key)] = {
+            **dict(zip(UYA_ROLLUP_KEYS, key)),
+            "games": games,
+            "total_duration": total_duration,
+            "total_players": total_players,
+            "player_results": 0,
+            "wins": 0,
+            "kills": 0,
+            "deaths": 0,
+        }
+
+    for *key, player_results, wins, kills, deaths in session.execute(player_totals).all():
+        rollup: dict[str, any] = rollups[tuple(key)]
+        rollup.update(player_results=player_results, wins=wins, kills=kills, deaths=deaths)
+
+    session.execute(delete(UyaGameHistoryRollup))
+    if rollups:
+        session.execute(insert(UyaGameHistoryRollup), list(rollups.values()))
+    session.commit()
+
+
+async def get_uya_gamehistory_stats_async(
+    session: AsyncSession,
+    group_by: tuple[str, ...],
+    since: date | None = None
+) -> list[UyaGameHistoryStatsEntry]:
+    """
+    Aggregates rollup rows.
+
+    :param session: Async database session.
+    :param group_by: Rollup key columns to group by.
+    :param since: First day to include, or None for all time.
+    :return: One entry per group, most played first.
+    """
+    keys: list = [getattr(UyaGameHistoryRollup, key) for key in group_by]
+    games = func.sum(UyaGameHistoryRollup.games)
+
+    query: Select = select(
+        *keys,
+        games,
+        func.sum(UyaGameHistoryRollup.total_duration),
+        func.sum(UyaGameHistoryRollup.total_players),
+        func.sum(UyaGameHistoryRollup.player_results),
+        func.sum(UyaGameHistoryRollup.wins),
+        func.sum(UyaGameHistoryRollup.kills),
+        func.sum(UyaGameHistoryRollup.deaths)
+    ).group_by(*keys).order_by(games.desc(), *keys)
+
+    if since is not None:
+        query = query.filter(UyaGameHistoryRollup.day >= since)
+
+    results: list[UyaGameHistoryStatsEntry] = list()
+
+    for row in (await session.execute(query)).all():
+        group, (games_played, total_duration, total_players, player_results, wins, kills, deaths) = \
+            row[:len(keys)], row[len(keys):]
+
+        results.append(UyaGameHistoryStatsEntry(
+            **dict(zip(group_by, group)),
+            games=games_played,
+            average_duration=total_duration / games_played if games_played else 0,
+            average_players=total_players / games_played if games_played else 0,
+            win_rate=wins / player_results if player_results else 0,
+            kills=kills,
+            deaths=deaths
+        ))
+
+    return results
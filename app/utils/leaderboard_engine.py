@@ -0,0 +1,277 @@
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import CREDENTIALS
+from app.models.dl import DeadlockedPlayer
+from app.models.uya import UyaPlayer
+from app.utils.query_helpers import get_stat_domains, get_available_stats_for_domain
+from horizon.parsing.types import StatDetails
+from horizon.parsing.deadlocked_stats import vanilla_stats_map
+from horizon.parsing.uya_stats import uya_vanilla_stats_map
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+stream_handler = logging.StreamHandler()
+stream_handler.setLevel(logging.DEBUG)
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+stream_handler.setFormatter(formatter)
+logger.addHandler(stream_handler)
+
+# Seconds after its last rebuild that an engine is still served. The trackers rebuild the engines on every leaderboard
+# refresh, so an older engine means rebuilds are failing and reads fall back to the database.
+LEADERBOARD_ENGINE_MAX_AGE: int = CREDENTIALS.get("leaderboard_engine_max_age", 900)
+
+
+class StatLeaderboard:
+    """
+    In-memory leaderboard of a single (domain, stat) column. Players are kept sorted by score (descending) and then by
+    player ID (ascending), matching the ordering of the database leaderboards. Scores are stored negated so both sort
+    keys are ascending and can be searched with `np.searchsorted`.
+
+    Score changes are queued and merged into the sorted columns on the next read, so a burst of ingest costs a single
+    O(n) merge instead of one array rewrite per player.
+    """
+
+    __slots__ = ("_keys", "_player_ids", "_scores", "_pending")
+
+    def __init__(self, player_ids: np.ndarray, scores: np.ndarray):
+        order: np.ndarray = np.lexsort((player_ids, -scores))
+
+        self._keys: np.ndarray = -scores[order]
+        self._player_ids: np.ndarray = player_ids[order]
+        self._scores: dict[int, int] = dict(zip(player_ids.tolist(), scores.tolist()))
+        self._pending: dict[int, int] = dict()
+
+    @property
+    def count(self) -> int:
+        """
+        Number of players on the leaderboard.
+        """
+        self._merge_pending()
+        return len(self._player_ids)
+
+    def score(self, player_id: int) -> Optional[int]:
+        """
+        :return: The score of the player or None if the player is not on the leaderboard.
+        """
+        self._merge_pending()
+        return self._scores.get(player_id)
+
+    @staticmethod
+    def _index(keys: np.ndarray, player_ids: np.ndarray, player_id: int, score: int, side: str = "left") -> int:
+        # Binary search the block of equal scores, then the player ID within that block.
+        start: int = int(np.searchsorted(keys, -score, side="left"))
+        end: int = int(np.searchsorted(keys, -score, side="right"))
+        return start + int(np.searchsorted(player_ids[start:end], player_id, side=side))
+
+    def position(self, player_id: int) -> Optional[int]:
+        """
+        :return: The 1-indexed leaderboard position of the player or None if the player is not on the leaderboard.
+        """
+        self._merge_pending()
+        score: Optional[int] = self._scores.get(player_id)
+
+        if score is None:
+            return None
+
+        return self._index(self._keys, self._player_ids, player_id, score) + 1
+
+    def page(self, page: int, size: int = 100) -> list[tuple[int, int, int]]:
+        """
+        :param page: Zero-indexed page number.
+        :param size: Number of entries per page.
+        :return: A list of (player ID, score, position) tuples.
+        """
+        self._merge_pending()
+        return self._entries(page * size, size)
+
+    def after(self, score: int, player_id: int, size: int = 100) -> list[tuple[int, int, int]]:
+        """
+        Resumes the leaderboard after the entry with the given sort key, even if that entry has since moved.
+
+        :param score: Score of the last entry seen.
+        :param player_id: Player ID of the last entry seen.
+        :param size: Number of entries to return.
+        :return: A list of (player ID, score, position) tuples.
+        """
+        self._merge_pending()
+        return self._entries(self._index(self._keys, self._player_ids, player_id, score, side="right"), size)
+
+    def _entries(self, start: int, size: int) -> list[tuple[int, int, int]]:
+        player_ids: list[int] = self._player_ids[start:start + size].tolist()
+        scores: list[int] = (-self._keys[start:start + size]).tolist()
+
+        return [
+            (player_id, score, start + index + 1)
+            for index, (player_id, score)
+            in enumerate(zip(player_ids, scores))
+        ]
+
+    def update(self, player_id: int, score: int) -> None:
+        """
+        Queues the new score of a player, adding them to the leaderboard if necessary.
+        """
+        self._pending[player_id] = score
+
+    def _merge_pending(self) -> None:
+        if not self._pending:
+            return
+
+        changed: dict[int, int] = {
+            player_id: score
+            for player_id, score
+            in self._pending.items()
+            if self._scores.get(player_id) != score
+        }
+        self._pending.clear()
+
+        if not changed:
+            return
+
+        player_ids: np.ndarray = np.fromiter(changed.keys(), dtype=np.int64, count=len(changed))
+        scores: np.ndarray = np.fromiter(changed.values(), dtype=np.int64, count=len(changed))
+
+        # Drop the previous entries of the changed players, then insert their new entries in sort order.
+        kept: np.ndarray = ~np.isin(self._player_ids, player_ids)
+        keys: np.ndarray = self._keys[kept]
+        kept_player_ids: np.ndarray = self._player_ids[kept]
+
+        order: np.ndarray = np.lexsort((player_ids, -scores))
+        player_ids = player_ids[order]
+        scores = scores[order]
+
+        indexes: list[int] = [
+            self._index(keys, kept_player_ids, player_id, score)
+            for player_id, score
+            in zip(player_ids.tolist(), scores.tolist())
+        ]
+
+        self._keys = np.insert(keys, indexes, -scores)
+        self._player_ids = np.insert(kept_player_ids, indexes, player_ids)
+        self._scores.update(changed)
+
+
+class LeaderboardEngine:
+    """
+    Holds every leaderboard of a game in memory. The engine is rebuilt from the database on every leaderboard refresh,
+    which picks up stats written by other processes such as the dataloader or other API workers, and is updated by
+    this process's ingest in between, so leaderboard pages, counts and player positions never touch Postgres.
+    """
+
+    def __init__(self, game: str, max_age: float = LEADERBOARD_ENGINE_MAX_AGE):
+        """
+        :param game: "dl" or "uya".
+        :param max_age: Seconds after its last rebuild that the engine is still considered current.
+        """
+        self._game: str = game
+        self._max_age: float = max_age
+        self._leaderboards: dict[tuple[str, str], StatLeaderboard] = dict()
+        self._usernames: dict[int, str] = dict()
+        self._built_at: Optional[float] = None
+
+        # Updates received while a rebuild is loading, replayed once the rebuilt leaderboards are swapped in.
+        self._rebuilding: bool = False
+        self._pending_updates: list[tuple[int, str, dict[tuple[str, str], int]]] = list()
+
+    @property
+    def current(self) -> bool:
+        """
+        True while the engine has been rebuilt from the database within its maximum age.
+        """
+        return self._built_at is not None and time.monotonic() - self._built_at <= self._max_age
+
+    def get_leaderboard(self, domain: str, stat: str) -> Optional[StatLeaderboard]:
+        """
+        :return: The leaderboard of the stat or None if the engine is not current.
+        """
+        if not self.current:
+            return None
+
+        return self._leaderboards.get((domain, stat))
+
+    def has_player(self, player_id: int) -> bool:
+        return player_id in self._usernames
+
+    def username(self, player_id: int) -> str:
+        return self._usernames.get(player_id, "UNKNOWN")
+
+    async def rebuild_async(self, session: AsyncSession) -> None:
+        """
+        Loads every stat domain of the game from the database and sorts each of its stats.
+        """
+        self._rebuilding = True
+        started_at: float = time.monotonic()
+
+        try:
+            player_class: type[DeclarativeBase] = UyaPlayer if self._game == "uya" else DeadlockedPlayer
+
+            usernames: dict[int, str] = dict(
+                (await session.execute(select(player_class.id, player_class.username))).all()
+            )
+
+            leaderboards: dict[tuple[str, str], StatLeaderboard] = dict()
+            for domain, stat_domain in get_stat_domains(self._game).items():
+                stats: list[str] = get_available_stats_for_domain(stat_domain)
+
+                query = select(stat_domain.player_id, *[getattr(stat_domain, stat) for stat in stats]) \
+                    .join(player_class, player_class.id == stat_domain.player_id)
+                rows: np.ndarray = np.array((await session.execute(query)).all(), dtype=np.int64).reshape(-1, len(stats) + 1)
+
+                for column, stat in enumerate(stats, start=1):
+                    leaderboards[(domain, stat)] = StatLeaderboard(rows[:, 0], rows[:, column])
+
+            self._usernames = usernames
+            self._leaderboards = leaderboards
+            self._built_at = started_at
+
+            for player_id, username, stats in self._pending_updates:
+                self._apply_update(player_id, username, stats)
+        finally:
+            self._rebuilding = False
+            self._pending_updates.clear()
+
+        logger.debug(f"rebuild_async: Built {len(self._leaderboards)} {self._game} leaderboards for {len(self._usernames)} players.")
+
+    def _apply_update(self, player_id: int, username: str, stats: dict[tuple[str, str], int]) -> None:
+        self._usernames[player_id] = username
+
+        for key, score in stats.items():
+            if key in self._leaderboards:
+                self._leaderboards[key].update(player_id, score)
+
+    def update_player(self, player_id: int, username: str, wide_stats: list[int]) -> None:
+        """
+        Applies the vanilla wide stats of a player that were just written to the database.
+
+        :param player_id: Horizon account ID of the player.
+        :param username: Username of the player.
+        :param wide_stats: The player's 100 vanilla wide stats.
+        """
+        stats_map: dict[int, StatDetails] = uya_vanilla_stats_map if self._game == "uya" else vanilla_stats_map
+
+        stats: dict[tuple[str, str], int] = dict()
+        for index, stat in enumerate(wide_stats):
+            if stats_map[index]["table"] == "" or stats_map[index]["field"] == "":
+                continue
+
+            stats[(stats_map[index]["table"].replace("_stats", ""), stats_map[index]["field"])] = stat
+
+        if self._rebuilding:
+            self._pending_updates.append((int(player_id), username, stats))
+
+        self._apply_update(int(player_id), username, stats)
+
+
+uya_leaderboard_engine: LeaderboardEngine = LeaderboardEngine("uya")
+dl_leaderboard_engine: LeaderboardEngine = LeaderboardEngine("dl")
+
+
+def get_leaderboard_engine(game: str) -> LeaderboardEngine:
+    return uya_leaderboard_engine if game == "uya" else dl_leaderboard_engine
+
@@ -0,0 +1,303 @@
+import functools
+import logging
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import select, insert, delete, func, literal, and_, or_, Select
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.dl import DeadlockedPlayer, DeadlockedLeaderboardRank, DeadlockedLeaderboardCount
+from app.models.uya import UyaPlayer, UyaLeaderboardRank, UyaLeaderboardCount
+from app.schemas.schemas import CursorPagination, LeaderboardEntry, StatOffering, StatRank, PlayerRanksSchema
+from app.utils.cursors import encode_leaderboard_cursor
+from app.utils.query_helpers import (
+    get_stat_domains,
+    get_available_stats_for_domain,
+    dl_compute_stat_offerings,
+    uya_compute_stat_offerings
+)
+from app.utils.leaderboard_engine import LeaderboardEngine, StatLeaderboard, get_leaderboard_engine
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+stream_handler = logging.StreamHandler()
+stream_handler.setLevel(logging.DEBUG)
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+stream_handler.setFormatter(formatter)
+logger.addHandler(stream_handler)
+
+
+@functools.cache
+def get_leaderboard_tables(game: str) -> tuple[type[DeclarativeBase], type[DeclarativeBase], type[DeclarativeBase]]:
+    """
+    :param game: "dl" or "uya".
+    :return: The player, rank and count tables of the game.
+    """
+    leaderboard_tables: dict = {
+        "dl": (DeadlockedPlayer, DeadlockedLeaderboardRank, DeadlockedLeaderboardCount),
+        "uya": (UyaPlayer, UyaLeaderboardRank, UyaLeaderboardCount),
+    }
+
+    return leaderboard_tables[game]
+
+
+async def refresh_leaderboard_ranks_async(game: str, session: AsyncSession) -> None:
+    """
+    Recomputes the precomputed leaderboard of every (domain, stat) pair of a game. Each stat is rebuilt in its own
+    transaction, so readers keep seeing the previous ranks of a stat until its replacement is committed.
+
+    The rank tables are only read while the leaderboard engine is not current, so the trackers only refresh them then.
+
+    :param game: "dl" or "uya".
+    :param session: Async database session.
+    """
+    player_class, rank_table, count_table = get_leaderboard_tables(game)
+    stat_domains: dict[str, type[DeclarativeBase]] = get_stat_domains(game)
+
+    for domain, stat_domain in stat_domains.items():
+        for stat in get_available_stats_for_domain(stat_domain):
+            stat_column = getattr(stat_domain, stat)
+
+            ranked: Select = select(
+                literal(domain),
+                literal(stat),
+                func.row_number().over(order_by=(stat_column.desc(), stat_domain.player_id.asc())),
+                func.dense_rank().over(order_by=stat_column.desc()),
+                stat_domain.player_id,
+                stat_column
+            ).join(player_class, player_class.id == stat_domain.player_id)
+
+            await session.execute(delete(rank_table).filter_by(domain=domain, stat=stat))
+            await session.execute(
+                insert(rank_table).from_select(
+                    ["domain", "stat", "position", "dense_rank", "player_id", "score"],
+                    ranked
+                )
+            )
+
+            count: int = (await session.execute(
+                select(func.count()).select_from(rank_table).filter_by(domain=domain, stat=stat)
+            )).scalar_one()
+
+            await session.execute(delete(count_table).filter_by(domain=domain, stat=stat))
+            session.add(count_table(domain=domain, stat=stat, count=count, refreshed_at=datetime.now()))
+
+            await session.commit()
+
+    logger.debug(f"refresh_leaderboard_ranks_async: Refreshed {game} leaderboards.")
+
+
+def _leaderboard_page(count: int, entries: list[LeaderboardEntry]) -> CursorPagination[LeaderboardEntry]:
+    next_cursor: str | None = None
+
+    if len(entries) == 100 and entries[-1].rank < count:
+        next_cursor = encode_leaderboard_cursor(entries[-1].score, entries[-1].id, entries[-1].rank)
+
+    return CursorPagination[LeaderboardEntry](count=count, results=entries, next_cursor=next_cursor)
+
+
+async def get_leaderboard_async(
+    game: str,
+    session: AsyncSession,
+    domain: str,
+    stat: str,
+    page: int,
+    cursor: tuple[int, int, int] | None = None
+) -> CursorPagination[LeaderboardEntry]:
+    """
+    Reads a page (100 entries) of a leaderboard. Pages are served from the in-memory leaderboard engine while it is
+    current, then from the precomputed rank tables when the requested stat has been refreshed, otherwise the stat
+    table is sorted directly.
+
+    Pages can be requested by number or resumed from the cursor of the previous page. Cursors hold the (score,
+    player ID, position) of the last entry seen, so the next page is found with a seek instead of an offset.
+
+    :param game: "dl" or "uya".
+    :param session: Async database session.
+    :param domain: A validated stat domain of the game.
+    :param stat: A validated stat of the domain.
+    :param page: Zero-indexed page number, ignored when a cursor is given.
+    :param cursor: A decoded leaderboard cursor.
+    :return: The requested leaderboard page.
+    """
+    engine: LeaderboardEngine = get_leaderboard_engine(game)
+    leaderboard: StatLeaderboard | None = engine.get_leaderboard(domain, stat)
+
+    if leaderboard is not None:
+        if cursor is not None:
+            entries: list[tuple[int, int, int]] = leaderboard.after(cursor[0], cursor[1])
+        else:
+            entries: list[tuple[int, int, int]] = leaderboard.page(page)
+
+        return _leaderboard_page(
+            leaderboard.count,
+            [
+                LeaderboardEntry(id=player_id, username=engine.username(player_id), score=score, rank=position)
+                for player_id, score, position
+                in entries
+            ]
+        )
+
+    player_class, rank_table, count_table = get_leaderboard_tables(game)
+
+    # Position of the last entry before the requested page.
+    start: int = cursor[2] if cursor is not None else 100 * page
+
+    count_result = await session.get(count_table, (domain, stat))
+
+    if count_result is not None:
+        query: Select = select(player_class.id, player_class.username, rank_table.score, rank_table.position) \
+            .join(player_class, player_class.id == rank_table.player_id) \
+            .filter(rank_table.domain == domain, rank_table.stat == stat) \
+            .filter(rank_table.position > start, rank_table.position <= start + 100) \
+            .order_by(rank_table.position.asc())
+
+        results = (await session.execute(query)).all()
+
+        return _leaderboard_page(
+            count_result.count,
+            [
+                LeaderboardEntry(id=player_id, username=username, score=score, rank=position)
+                for player_id, username, score, position
+                in results
+            ]
+        )
+
+    stat_domain: type[DeclarativeBase] = get_stat_domains(game)[domain]
+    stat_column = getattr(stat_domain, stat)
+
+    query: Select = select(player_class.id, player_class.username, stat_column) \
+        .join(stat_domain) \
+        .order_by(stat_column.desc(), player_class.id.asc())
+
+    if cursor is not None:
+        score, player_id, _ = cursor
+        query = query.filter(or_(stat_column < score, and_(stat_column == score, player_class.id > player_id)))
+    else:
+        query = query.offset(start)
+
+    results = (await session.execute(query.limit(100))).all()
+
+    count: int = (await session.execute(select(func.count()).select_from(player_class).join(stat_domain))).scalar_one()
+
+    return _leaderboard_page(
+        count,
+        [
+            LeaderboardEntry(
+                id=player_id,
+                username=username,
+                score=score,
+                rank=start + index + 1
+            )
+            for index, (player_id, username, score)
+            in enumerate(results)
+        ]
+    )
+
+
+def _stat_rank(offering: StatOffering, score: int, rank: int, count: int) -> StatRank:
+    return StatRank(
+        **offering.model_dump(),
+        rank=rank,
+        percentile=round(100 * (count - rank) / count, 2),
+        score=score
+    )
+
+
+async def get_player_ranks_async(game: str, session: AsyncSession, player_id: int) -> PlayerRanksSchema | None:
+    """
+    Looks up the leaderboard rank of a player for every stat offering of a game. Ranks are positions on the
+    leaderboards (ties ordered by player ID) and the percentile is the share of players ranked below the player.
+
+    Ranks are read from the in-memory leaderboard engine while it is current. Otherwise, each stat domain is scanned
+    once, counting the players ahead of the player for all of its stats in a single aggregate.
+
+    :param game: "dl" or "uya".
+    :param session: Async database session.
+    :param player_id: Horizon account ID of the player.
+    :return: The ranks of the player, or None if the player does not exist.
+    """
+    offerings: list[StatOffering] = uya_compute_stat_offerings() if game == "uya" else dl_compute_stat_offerings()
+    engine: LeaderboardEngine = get_leaderboard_engine(game)
+
+    if engine.current:
+        if not engine.has_player(player_id):
+            return None
+
+        ranks: list[StatRank] = list()
+        for offering in offerings:
+            leaderboard: StatLeaderboard | None = engine.get_leaderboard(offering.domain, offering.stat)
+            position: int | None = leaderboard.position(player_id) if leaderboard is not None else None
+
+            if position is None:
+                continue
+
+            ranks.append(_stat_rank(offering, leaderboard.score(player_id), position, leaderboard.count))
+
+        return PlayerRanksSchema(id=player_id, username=engine.username(player_id), ranks=ranks)
+
+    player_class, _, _ = get_leaderboard_tables(game)
+
+    username: str | None = (await session.execute(
+        select(player_class.username).filter_by(id=player_id)
+    )).scalar_one_or_none()
+
+    if username is None:
+        return None
+
+    stat_domains: dict[str, type[DeclarativeBase]] = get_stat_domains(game)
+
+    offerings_by_domain: dict[str, list[StatOffering]] = defaultdict(list)
+    for offering in offerings:
+        if offering.domain in stat_domains:
+            offerings_by_domain[offering.domain].append(offering)
+
+    ranks_by_stat: dict[tuple[str, str], StatRank] = dict()
+    for domain, domain_offerings in offerings_by_domain.items():
+        stat_domain: type[DeclarativeBase] = stat_domains[domain]
+
+        player_stats = (await session.execute(
+            select(stat_domain).filter_by(player_id=player_id)
+        )).scalars().first()
+
+        if player_stats is None:
+            continue
+
+        players_ahead = [
+            func.count().filter(
+                or_(
+                    getattr(stat_domain, offering.stat) > getattr(player_stats, offering.stat),
+                    and_(
+                        getattr(stat_domain, offering.stat) == getattr(player_stats, offering.stat),
+                        stat_domain.player_id < player_id
+                    )
+                )
+            )
+            for offering in domain_offerings
+        ]
+
+        query: Select = select(func.count(), *players_ahead) \
+            .select_from(stat_domain) \
+            .join(player_class, player_class.id == stat_domain.player_id)
+
+        count, *ahead = (await session.execute(query)).one()
+
+        for offering, players_ahead_count in zip(domain_offerings, ahead):
+            ranks_by_stat[(offering.domain, offering.stat)] = _stat_rank(
+                offering,
+                getattr(player_stats, offering.stat),
+                players_ahead_count + 1,
+                count
+            )
+
+    return PlayerRanksSchema(
+        id=player_id,
+        username=username,
+        ranks=[
+            ranks_by_stat[(offering.domain, offering.stat)]
+            for offering
+            in offerings
+            if (offering.domain, offering.stat) in ranks_by_stat
+        ]
+    )
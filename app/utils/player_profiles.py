@@ -0,0 +1,172 @@
+import functools
+from datetime import datetime
+
+from pydantic import BaseModel
+from sqlalchemy import select, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, DeclarativeBase, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.dl import DeadlockedPlayer, DeadlockedPlayerProfile
+from app.models.uya import UyaPlayer, UyaPlayerProfile
+from app.schemas.schemas import (
+    PlayerSchema,
+    DeadlockedPlayerDetailsSchema,
+    DeadlockedOverallStatsSchema,
+    DeadlockedDeathmatchStatsSchema,
+    DeadlockedConquestStatsSchema,
+    DeadlockedCTFStatsSchema,
+    DeadlockedGameModeWithTimeSchema,
+    DeadlockedWeaponStatsSchema,
+    DeadlockedVehicleStatsSchema,
+    DeadlockedHorizonStatsSchema,
+    DeadlockedSNDStatsSchema,
+    DeadlockedPayloadStatsSchema,
+    DeadlockedSpleefStatsSchema,
+    DeadlockedInfectedStatsSchema,
+    DeadlockedGungameStatsSchema,
+    DeadlockedInfiniteClimberStatsSchema,
+    DeadlockedSurvivalStatsSchema,
+    DeadlockedTrainingStatsSchema,
+    DeadlockedSurvivalMapStatsSchema,
+    UyaPlayerDetailsSchema,
+    UyaOverallStatsSchema,
+    UyaDeathmatchStatsSchema,
+    UyaSiegeStatsSchema,
+    UyaCTFStatsSchema,
+)
+
+
+# Maps each stat relationship of a player to the schema it is serialized with.
+DL_STAT_SCHEMAS: dict[str, type[BaseModel]] = {
+    "overall_stats": DeadlockedOverallStatsSchema,
+    "deathmatch_stats": DeadlockedDeathmatchStatsSchema,
+    "conquest_stats": DeadlockedConquestStatsSchema,
+    "ctf_stats": DeadlockedCTFStatsSchema,
+    "koth_stats": DeadlockedGameModeWithTimeSchema,
+    "juggernaut_stats": DeadlockedGameModeWithTimeSchema,
+    "weapon_stats": DeadlockedWeaponStatsSchema,
+    "vehicle_stats": DeadlockedVehicleStatsSchema,
+
+    "horizon_stats": DeadlockedHorizonStatsSchema,
+    "snd_stats": DeadlockedSNDStatsSchema,
+    "payload_stats": DeadlockedPayloadStatsSchema,
+    "spleef_stats": DeadlockedSpleefStatsSchema,
+    "infected_stats": DeadlockedInfectedStatsSchema,
+    "gungame_stats": DeadlockedGungameStatsSchema,
+    "infinite_climber_stats": DeadlockedInfiniteClimberStatsSchema,
+    "survival_stats": DeadlockedSurvivalStatsSchema,
+    "survival_orxon_stats": DeadlockedSurvivalMapStatsSchema,
+    "survival_mountain_pass_stats": DeadlockedSurvivalMapStatsSchema,
+    "survival_veldin_stats": DeadlockedSurvivalMapStatsSchema,
+    "training_stats": DeadlockedTrainingStatsSchema,
+}
+
+UYA_STAT_SCHEMAS: dict[str, type[BaseModel]] = {
+    "overall_stats": UyaOverallStatsSchema,
+    "deathmatch_stats": UyaDeathmatchStatsSchema,
+    "siege_stats": UyaSiegeStatsSchema,
+    "ctf_stats": UyaCTFStatsSchema,
+}
+
+
+@functools.cache
+def get_profile_tables(game: str) -> tuple[type[DeclarativeBase], type[DeclarativeBase]]:
+    """
+    :param game: "dl" or "uya".
+    :return: The player and profile tables of the game.
+    """
+    profile_tables: dict = {
+        "dl": (DeadlockedPlayer, DeadlockedPlayerProfile),
+        "uya": (UyaPlayer, UyaPlayerProfile),
+    }
+
+    return profile_tables[game]
+
+
+def build_player_profile(game: str, player: DeclarativeBase) -> bytes:
+    """
+    Serializes a player and all of its stat relationships into the player endpoint response.
+
+    :param game: "dl" or "uya".
+    :param player: A player with its stat relationships loaded.
+    :return: The JSON encoded player details.
+    """
+    details_schema: type[PlayerSchema] = UyaPlayerDetailsSchema if game == "uya" else DeadlockedPlayerDetailsSchema
+    stat_schemas: dict[str, type[BaseModel]] = UYA_STAT_SCHEMAS if game == "uya" else DL_STAT_SCHEMAS
+
+    return details_schema(
+        id=player.id,
+        username=player.username,
+        **{
+            stat_schema_key: stat_schema.model_validate(getattr(player, stat_schema_key), from_attributes=True)
+            for stat_schema_key, stat_schema
+            in stat_schemas.items()
+        }
+    ).model_dump_json().encode()
+
+
+def update_player_profile(game: str, session: Session, player: DeclarativeBase) -> None:
+    """
+    Writes the profile of a player as part of the session's current transaction.
+    """
+    _, profile_table = get_profile_tables(game)
+
+    session.merge(profile_table(
+        player_id=player.id,
+        profile=build_player_profile(game, player),
+        updated_at=datetime.now()
+    ))
+
+
+async def update_player_profile_async(game: str, session: AsyncSession, player: DeclarativeBase) -> None:
+    """
+    Writes the profile of a player as part of the session's current transaction. The player's stat relationships
+    must already be loaded, lazy loading is not available on async sessions.
+    """
+    _, profile_table = get_profile_tables(game)
+
+    await session.merge(profile_table(
+        player_id=player.id,
+        profile=build_player_profile(game, player),
+        updated_at=datetime.now()
+    ))
+
+
+async def get_player_profile_async(game: str, session: AsyncSession, player_id: int) -> bytes | None:
+    """
+    Reads the serialized profile of a player. Players whose stats have not changed since the profile store was
+    introduced have no profile yet, so it is built from the stat tables and stored on first read.
+
+    :param game: "dl" or "uya".
+    :param session: Async database session.
+    :param player_id: Horizon account ID of the player.
+    :return: The JSON encoded player details, or None if the player or any of its stat tables does not exist.
+    """
+    player_class, profile_table = get_profile_tables(game)
+
+    profile = await session.get(profile_table, player_id)
+
+    if profile is not None:
+        return profile.profile
+
+    # Eagerly load every stat relationship, lazy loading is not available on async sessions.
+    options = [selectinload(getattr(player_class, rel.key)) for rel in inspect(player_class).relationships]
+
+    player = (await session.execute(select(player_class).options(*options).filter_by(id=player_id))).scalars().first()
+
+    # The player endpoint inner joins every stat table, so a player missing one is reported as not found.
+    stat_schemas: dict[str, type[BaseModel]] = UYA_STAT_SCHEMAS if game == "uya" else DL_STAT_SCHEMAS
+    if player is None or any(getattr(player, stat_schema_key) is None for stat_schema_key in stat_schemas):
+        return None
+
+    profile_bytes: bytes = build_player_profile(game, player)
+
+    try:
+        session.add(profile_table(player_id=player_id, profile=profile_bytes, updated_at=datetime.now()))
+        await session.commit()
+    except IntegrityError:
+        # A concurrent request or ingest stored the profile first.
+        await session.rollback()
+
+    return profile_bytes
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocalAsync
+from app.models.dl import DeadlockedPlayer
+from app.models.uya import UyaPlayer
+from app.utils.player_search import PlayerSearchIndex
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+stream_handler = logging.StreamHandler()
+stream_handler.setLevel(logging.DEBUG)
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+stream_handler.setFormatter(formatter)
+logger.addHandler(stream_handler)
+
+
+class PlayerRegistry:
+    """
+    Every player ID and username of a game, loaded once from the database and then kept current by ingest whenever a
+    player is created or renamed. Serves ID to username and username to ID lookups and owns the player search index.
+    """
+
+    def __init__(self, game: str):
+        """
+        :param game: "dl" or "uya".
+        """
+        self._game: str = game
+        self._usernames: dict[int, str] = dict()
+        self._player_ids: dict[str, set[int]] = dict()
+        self._search_index: PlayerSearchIndex = PlayerSearchIndex()
+
+        self._loaded: bool = False
+        self._load_lock: asyncio.Lock = asyncio.Lock()
+
+        # Players upserted while the registry is loading, applied on top of the loaded players.
+        self._loading: bool = False
+        self._pending_upserts: dict[int, str] = dict()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def search_index(self) -> PlayerSearchIndex:
+        return self._search_index
+
+    def __len__(self) -> int:
+        return len(self._usernames)
+
+    def username(self, player_id: int) -> str | None:
+        """
+        :return: The username of the player or None if the player is unknown.
+        """
+        return self._usernames.get(player_id)
+
+    def player_ids(self, username: str) -> set[int]:
+        """
+        :return: The IDs of every player with the username, case insensitive.
+        """
+        return set(self._player_ids.get(username.lower(), ()))
+
+    async def load_async(self, session: AsyncSession) -> None:
+        """
+        Loads every player of the game from the database, replacing the registry's contents.
+        """
+        player_class: type[DeclarativeBase] = UyaPlayer if self._game == "uya" else DeadlockedPlayer
+
+        self._loading = True
+
+        try:
+            usernames: dict[int, str] = dict((await session.execute(select(player_class.id, player_class.username))).all())
+            usernames.update(self._pending_upserts)
+
+            player_ids: dict[str, set[int]] = dict()
+            for player_id, username in usernames.items():
+                player_ids.setdefault(username.lower(), set()).add(player_id)
+
+            self._search_index = PlayerSearchIndex(usernames.items())
+            self._usernames = usernames
+            self._player_ids = player_ids
+            self._loaded = True
+        finally:
+            self._loading = False
+            self._pending_upserts.clear()
+
+        logger.debug(f"load_async: Loaded {len(self._usernames)} {self._game} players.")
+
+    async def ensure_loaded_async(self, session: AsyncSession) -> "PlayerRegistry":
+        """
+        Loads the registry if the startup load has not completed yet.
+
+        :return: The registry, for chaining.
+        """
+        if not self._loaded:
+            async with self._load_lock:
+                if not self._loaded:
+                    await self.load_async(session)
+
+        return self
+
+    def upsert(self, player_id: int, username: str) -> None:
+        """
+        Registers a new player or the new username of an existing player.
+        """
+        player_id = int(player_id)
+
+        if self._loading:
+            self._pending_upserts[player_id] = username
+
+        previous_username: str | None = self._usernames.get(player_id)
+
+        if previous_username == username:
+            return
+
+        if previous_username is not None:
+            player_ids: set[int] = self._player_ids[previous_username.lower()]
+            player_ids.discard(player_id)
+
+            if not player_ids:
+                del self._player_ids[previous_username.lower()]
+
+        self._usernames[player_id] = username
+        self._player_ids.setdefault(username.lower(), set()).add(player_id)
+        self._search_index.add(player_id, username)
+
+
+uya_player_registry: PlayerRegistry = PlayerRegistry("uya")
+dl_player_registry: PlayerRegistry = PlayerRegistry("dl")
+
+
+def get_player_registry(game: str) -> PlayerRegistry:
+    return uya_player_registry if game == "uya" else dl_player_registry
+
+
+async def load_player_registries() -> None:
+    """
+    Loads the UYA and DL player registries from the database.
+    """
+    for game in ("uya", "dl"):
+        try:
+            async with SessionLocalAsync() as session:
+                await get_player_registry(game).ensure_loaded_async(session)
+        except Exception as e:
+            logger.error(f"load_player_registries: Failed to load the {game} player registry!", exc_info=True)
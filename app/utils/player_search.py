@@ -0,0 +1,141 @@
+import bisect
+import heapq
+from collections import Counter
+from typing import Iterable
+
+from fuzzywuzzy import fuzz
+
+
+# Minimum number of best trigram matches that are scored with fuzz.ratio for a search.
+SEARCH_CANDIDATE_LIMIT: int = 1000
+
+
+def username_trigrams(username: str) -> set[str]:
+    """
+    Splits a lowercase username into trigrams. Like pg_trgm, the username is padded with two leading spaces and one
+    trailing space so that short queries and prefixes still produce trigrams.
+    """
+    padded: str = f"  {username} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class PlayerSearchIndex:
+    """
+    In-memory username search. A trigram inverted index narrows a fuzzy search down to the players sharing the most
+    trigrams with the query before they are scored, and a sorted list of usernames serves prefix autocomplete with
+    binary search.
+    """
+
+    def __init__(self, players: Iterable[tuple[int, str]] = ()):
+        """
+        :param players: (player ID, username) pairs to index.
+        """
+        self._usernames: dict[int, str] = dict(players)
+        self._trigrams: dict[str, set[int]] = dict()
+
+        for player_id, username in self._usernames.items():
+            for trigram in username_trigrams(username.lower()):
+                self._trigrams.setdefault(trigram, set()).add(player_id)
+
+        self._sorted_usernames: list[tuple[str, int]] = sorted(
+            (username.lower(), player_id) for player_id, username in self._usernames.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._usernames)
+
+    def add(self, player_id: int, username: str) -> None:
+        """
+        Adds a player to the index, replacing their previous username if they were already indexed.
+        """
+        if player_id in self._usernames:
+            self.remove(player_id)
+
+        lowercase_username: str = username.lower()
+        self._usernames[player_id] = username
+
+        for trigram in username_trigrams(lowercase_username):
+            self._trigrams.setdefault(trigram, set()).add(player_id)
+
+        bisect.insort(self._sorted_usernames, (lowercase_username, player_id))
+
+    def remove(self, player_id: int) -> None:
+        username: str | None = self._usernames.pop(player_id, None)
+
+        if username is None:
+            return
+
+        lowercase_username: str = username.lower()
+
+        for trigram in username_trigrams(lowercase_username):
+            players: set[int] = self._trigrams[trigram]
+            players.discard(player_id)
+
+            if not players:
+                del self._trigrams[trigram]
+
+        index: int = bisect.bisect_left(self._sorted_usernames, (lowercase_username, player_id))
+        del self._sorted_usernames[index]
+
+    def search(self, query: str, limit: int) -> tuple[int, list[tuple[int, str]]]:
+        """
+        Fuzzy searches usernames, best matches first. Every player is a result, like scoring the whole player table.
+        Only the players sharing the most trigrams with the query are scored. When fewer players share a trigram than
+        are needed, as with typos or very distinctive names, the candidates are padded with the usernames nearest to
+        the query in alphabetical order, so a search never scores more than a bounded number of usernames.
+
+        :param query: The username to look for.
+        :param limit: Maximum number of results.
+        :return: The number of players and up to `limit` (player ID, username) results.
+        """
+        query = query.lower()
+
+        shared_trigrams: Counter = Counter()
+        for trigram in username_trigrams(query):
+            shared_trigrams.update(self._trigrams.get(trigram, ()))
+
+        candidate_limit: int = max(limit, SEARCH_CANDIDATE_LIMIT)
+        candidates: set[int] = {player_id for player_id, _ in shared_trigrams.most_common(candidate_limit)}
+
+        if len(candidates) < candidate_limit:
+            candidates.update(self._nearest(query, candidate_limit))
+
+        results: list[int] = heapq.nlargest(
+            limit,
+            candidates,
+            key=lambda player_id: fuzz.ratio(self._usernames[player_id].lower(), query)
+        )
+
+        return len(self._usernames), [(player_id, self._usernames[player_id]) for player_id in results]
+
+    def _nearest(self, query: str, count: int) -> list[int]:
+        """
+        :return: The IDs of up to `count` players whose usernames sort around the query.
+        """
+        index: int = bisect.bisect_left(self._sorted_usernames, (query, -1))
+        end: int = min(len(self._sorted_usernames), max(index - count // 2, 0) + count)
+        start: int = max(end - count, 0)
+
+        return [player_id for _, player_id in self._sorted_usernames[start:end]]
+
+    def autocomplete(self, prefix: str, limit: int) -> list[tuple[int, str]]:
+        """
+        :param prefix: The start of a username, case insensitive.
+        :param limit: Maximum number of results.
+        :return: Up to `limit` (player ID, username) results in alphabetical order.
+        """
+        prefix = prefix.lower()
+
+        results: list[tuple[int, str]] = list()
+
+        index: int = bisect.bisect_left(self._sorted_usernames, (prefix, -1))
+        while index < len(self._sorted_usernames) and len(results) < limit:
+            lowercase_username, player_id = self._sorted_usernames[index]
+
+            if not lowercase_username.startswith(prefix):
+                break
+
+            results.append((player_id, self._usernames[player_id]))
+            index += 1
+
+        return results
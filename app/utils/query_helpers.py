@@ -10,6 +10,13 @@ from sqlalchemy import literal_column, func, inspect
 from sqlalchemy.orm import Session, Query, DeclarativeBase, selectinload
 
 from app.utils.database import retry_async
+from app.utils.player_profiles import update_player_profile, update_player_profile_async
+from app.utils.player_registry import get_player_registry
+from app.utils.gamehistory_rollups import (
+    increment_uya_gamehistory_rollup_async,
+    uya_game_rollup_increment,
+    uya_player_rollup_increment
+)
 
 from app.models.dl import (
     DeadlockedPlayer,
@@ -42,13 +49,7 @@ from app.schemas.schemas import StatOffering
 from horizon.parsing.deadlocked_stats import vanilla_stats_map, custom_stats_map
 from horizon.parsing.uya_stats import uya_vanilla_stats_map
 
-from horizon.parsing.uya_game import (
-    uya_map_parser, 
-    uya_time_parser, 
-    uya_gamemode_parser,
-    uya_game_name_parser,
-    uya_weapon_parser
-)
+from horizon.parsing.uya_game_record import UyaGameRecord
 
 from horizon.middleware_api import get_account_basic_stats_async
 
@@ -98,6 +99,7 @@ def update_player_vanilla_stats(
             setattr(stats_table_obj, stats_map[index]["field"], stat)
 
         session.add(player)
+        update_player_profile(game, session, player)
         session.commit()
 
 @retry_async(retries=3, delay=2)
@@ -110,7 +112,10 @@ async def update_player_vanilla_stats_async(
     host: str,
     app_id: str,
     token: str,
-) -> None:
+) -> str | None:
+    """
+    :return: The username of the updated player, or None if the player could not be found in the prod db.
+    """
     if game == 'dl':
         player_class = DeadlockedPlayer
         stats_map = vanilla_stats_map
@@ -144,7 +149,7 @@ async def update_player_vanilla_stats_async(
 
         if player_info == {}:
             logger.warning(f"update_player_vanilla_stats_async: No information found in prod db querying: {protocol}://{host} {player_id}, {app_id}")
-            return
+            return None
         logger.debug(f"update_player_vanilla_stats_async: Creating user: {player_id} {player_info['AccountName']}")
 
         player = player_class(username=player_info["AccountName"], id=player_id)
@@ -153,7 +158,7 @@ async def update_player_vanilla_stats_async(
         await session.commit()
 
         # TODO This has a lot of code smell, but it's a simple way to ensure the existence of 1-1 tables.
-        await update_player_vanilla_stats_async(game, session, player_id, wide_stats, protocol, host, app_id, token)
+        return await update_player_vanilla_stats_async(game, session, player_id, wide_stats, protocol, host, app_id, token)
     else: # Player exists in DB. Update stats
         #logger.debug(f"update_player_vanilla_stats_async: User exists: {player_id}")
         for index, stat in enumerate(wide_stats):
@@ -165,8 +170,13 @@ async def update_player_vanilla_stats_async(
             setattr(stats_table_obj, stats_map[index]["field"], stat)
 
         session.add(player)
+        await update_player_profile_async(game, session, player)
         await session.commit()
 
+        get_player_registry(game).upsert(player.id, player.username)
+
+        return player.username
+
 
 @retry_async(retries=3, delay=2)
 async def get_uya_player_name_async(
@@ -199,187 +209,43 @@ async def get_uya_player_name_async(
 
 
 def update_uya_gamehistory(
-    game: dict,
+    game: UyaGameRecord,
     session: Session
 ) -> None:
 
-    if "Metadata" not in game.keys() or game["Metadata"] == None:
-        game["Metadata"] = {}
-    else:
-        game["Metadata"] = json.loads(game["Metadata"])
-
-    # Get player count
-    if "PreWideStats" in game["Metadata"].keys() and "Players" in game["Metadata"]["PreWideStats"].keys():
-        player_count:int = len(game["Metadata"]["PreWideStats"]["Players"])
-    else:
-        player_count = 0
-
     # Check if a record already exists
-    existing_game = session.query(UyaGameHistory).filter_by(id=int(game["Id"])).first()
+    existing_game = session.query(UyaGameHistory).filter_by(id=game.id).first()
 
     if existing_game:
         # Update the existing record
-        existing_game.status = game["WorldStatus"]
-        existing_game.game_map = uya_map_parser(game["GenericField3"], game["Metadata"])
-        existing_game.game_name = uya_game_name_parser(game["GameName"])
-        existing_game.game_mode = uya_gamemode_parser(game["GenericField3"])[0]
-        existing_game.game_submode = uya_gamemode_parser(game["GenericField3"])[1]
-        existing_game.time_limit = uya_time_parser(game["GenericField3"])
-        existing_game.n60_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["N60"]
-        existing_game.lava_gun_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["Lava Gun"]
-        existing_game.gravity_bomb_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["Gravity Bomb"]
-        existing_game.flux_rifle_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["Flux Rifle"]
-        existing_game.mine_glove_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["Mine Glove"]
-        existing_game.morph_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["Morph O' Ray"]
-        existing_game.blitz_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["Blitz Cannon"]
-        existing_game.rocket_enabled = uya_weapon_parser(game["PlayerSkillLevel"])["Rocket"]
-        existing_game.player_count = player_count
-        existing_game.game_create_time = datetime.fromisoformat(game["GameCreateDt"][:26])
-        existing_game.game_start_time = datetime.fromisoformat(game["GameStartDt"][:26])
-        existing_game.game_end_time = datetime.fromisoformat(game["GameEndDt"][:26])
-        existing_game.game_duration = (datetime.fromisoformat(game["GameEndDt"][:26]) - datetime.fromisoformat(game["GameStartDt"][:26])).total_seconds() / 60
+        for field, value in game.game_history_fields().items():
+            setattr(existing_game, field, value)
     else:
         # Create a new record
-        new_game_model = UyaGameHistory(
-            id=int(game["Id"]),
-            status=game["WorldStatus"],
-            game_map=uya_map_parser(game["GenericField3"], game["Metadata"]),
-            game_name=uya_game_name_parser(game["GameName"]),
-            game_mode=uya_gamemode_parser(game["GenericField3"])[0],
-            game_submode=uya_gamemode_parser(game["GenericField3"])[1],
-            time_limit=uya_time_parser(game["GenericField3"]),
-            n60_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["N60"],
-            lava_gun_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Lava Gun"],
-            gravity_bomb_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Gravity Bomb"],
-            flux_rifle_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Flux Rifle"],
-            mine_glove_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Mine Glove"],
-            morph_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Morph O' Ray"],
-            blitz_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Blitz Cannon"],
-            rocket_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Rocket"],
-            player_count=player_count,
-            game_create_time=datetime.fromisoformat(game["GameCreateDt"][:26]),
-            game_start_time=datetime.fromisoformat(game["GameStartDt"][:26]),
-            game_end_time=datetime.fromisoformat(game["GameEndDt"][:26]),
-            game_duration=(datetime.fromisoformat(game["GameEndDt"][:26]) - datetime.fromisoformat(game["GameStartDt"][:26])).total_seconds() / 60
-        )
+        new_game_model = UyaGameHistory(**game.game_history_fields())
         session.add(new_game_model)
 
     session.flush()
     session.commit()
 
-    # Clean PostWideStats - PreWideStats for each player
-    if "PreWideStats" in game["Metadata"].keys() and "Players" in game["Metadata"]["PreWideStats"].keys():
-        players_pre: list[str] = [horizon_account_id for horizon_account_id in game["Metadata"]["PreWideStats"]["Players"]]
-
-        # Subtract players post from players pre
-        for horizon_player_id in players_pre:
-            stat_difference:list = [post_stat - pre_stat for post_stat, pre_stat in zip(game["Metadata"]["PostWideStats"]["Players"][horizon_player_id], game["Metadata"]["PreWideStats"]["Players"][horizon_player_id])]
-
-            if stat_difference == []:
-                continue
-            # Convert stat difference to string key
-            player_cleaned_stats:dict[str, int] = {uya_vanilla_stats_map[key]['label']: value for key, value in zip(uya_vanilla_stats_map.keys(), stat_difference) if uya_vanilla_stats_map[key]["label"]}
-
-            existing_player_game_stats = session.query(UyaPlayerGameStats).filter_by(game_id=int(game["Id"])).filter_by(player_id=int(horizon_player_id)).first()
-            if existing_player_game_stats:
-                    existing_player_game_stats.win = player_cleaned_stats["Wins"] == 1 # If there was +1 to win stat
-                    existing_player_game_stats.kills = player_cleaned_stats["Kills"]
-                    existing_player_game_stats.deaths = player_cleaned_stats["Deaths"]
-                    existing_player_game_stats.base_dmg = player_cleaned_stats["Total Base Damage"]
-                    existing_player_game_stats.flag_captures = player_cleaned_stats["CTF Flags Captured"]
-                    existing_player_game_stats.flag_saves = player_cleaned_stats["CTF Flags Saved"]
-                    existing_player_game_stats.suicides = player_cleaned_stats["Suicides"]
-                    existing_player_game_stats.nodes = player_cleaned_stats["Total Nodes"]
-                    existing_player_game_stats.n60_deaths = player_cleaned_stats["N60 Deaths"]
-                    existing_player_game_stats.n60_kills = player_cleaned_stats["N60 Kills"]
-                    existing_player_game_stats.lava_gun_deaths = player_cleaned_stats["Lava Gun Deaths"]
-                    existing_player_game_stats.lava_gun_kills = player_cleaned_stats["Lava Gun Kills"]
-                    existing_player_game_stats.gravity_bomb_deaths = player_cleaned_stats["Gravity Bomb Deaths"]
-                    existing_player_game_stats.gravity_bomb_kills = player_cleaned_stats["Gravity Bomb Kills"]
-                    existing_player_game_stats.flux_rifle_deaths = player_cleaned_stats["Flux Rifle Deaths"]
-                    existing_player_game_stats.flux_rifle_kills = player_cleaned_stats["Flux Rifle Kills"]
-                    existing_player_game_stats.mine_glove_deaths = player_cleaned_stats["Mine Glove Deaths"]
-                    existing_player_game_stats.mine_glove_kills = player_cleaned_stats["Mine Glove Kills"]
-                    existing_player_game_stats.morph_deaths = player_cleaned_stats["Morph-O-Ray Deaths"]
-                    existing_player_game_stats.morph_kills = player_cleaned_stats["Morph-O-Ray Kills"]
-                    existing_player_game_stats.blitz_deaths = player_cleaned_stats["Blitz Cannon Deaths"]
-                    existing_player_game_stats.blitz_kills = player_cleaned_stats["Blitz Cannon Kills"]
-                    existing_player_game_stats.rocket_deaths = player_cleaned_stats["Rocket Deaths"]
-                    existing_player_game_stats.rocket_kills = player_cleaned_stats["Rocket Kills"]
-                    existing_player_game_stats.wrench_deaths = player_cleaned_stats["Wrench Deaths"]
-                    existing_player_game_stats.wrench_kills = player_cleaned_stats["Wrench Kills"]
-            else:
-                players_game_stats = UyaPlayerGameStats(
-                    game_id = int(game["Id"]),
-                    player_id = int(horizon_player_id),
-
-                    win = player_cleaned_stats["Wins"] == 1, # If there was +1 to win stat
-                    kills = player_cleaned_stats["Kills"],
-                    deaths = player_cleaned_stats["Deaths"],
-                    base_dmg = player_cleaned_stats["Total Base Damage"],
-                    flag_captures = player_cleaned_stats["CTF Flags Captured"],
-                    flag_saves = player_cleaned_stats["CTF Flags Saved"],
-                    suicides = player_cleaned_stats["Suicides"],
-                    nodes = player_cleaned_stats["Total Nodes"],
-                    n60_deaths = player_cleaned_stats["N60 Deaths"],
-                    n60_kills = player_cleaned_stats["N60 Kills"],
-                    lava_gun_deaths = player_cleaned_stats["Lava Gun Deaths"],
-                    lava_gun_kills = player_cleaned_stats["Lava Gun Kills"],
-                    gravity_bomb_deaths = player_cleaned_stats["Gravity Bomb Deaths"],
-                    gravity_bomb_kills = player_cleaned_stats["Gravity Bomb Kills"],
-                    flux_rifle_deaths = player_cleaned_stats["Flux Rifle Deaths"],
-                    flux_rifle_kills = player_cleaned_stats["Flux Rifle Kills"],
-                    mine_glove_deaths = player_cleaned_stats["Mine Glove Deaths"],
-                    mine_glove_kills = player_cleaned_stats["Mine Glove Kills"],
-                    morph_deaths = player_cleaned_stats["Morph-O-Ray Deaths"],
-                    morph_kills = player_cleaned_stats["Morph-O-Ray Kills"],
-                    blitz_deaths = player_cleaned_stats["Blitz Cannon Deaths"],
-                    blitz_kills = player_cleaned_stats["Blitz Cannon Kills"],
-                    rocket_deaths = player_cleaned_stats["Rocket Deaths"],
-                    rocket_kills = player_cleaned_stats["Rocket Kills"],
-                    wrench_deaths = player_cleaned_stats["Wrench Deaths"],
-                    wrench_kills = player_cleaned_stats["Wrench Kills"],
-                )
-                session.add(players_game_stats)
+    # Store PostWideStats - PreWideStats for each player
+    for horizon_player_id, player_stats in game.player_stats.items():
+        existing_player_game_stats = session.query(UyaPlayerGameStats).filter_by(game_id=game.id).filter_by(player_id=horizon_player_id).first()
+        if existing_player_game_stats:
+            for field, value in player_stats.items():
+                setattr(existing_player_game_stats, field, value)
+        else:
+            players_game_stats = UyaPlayerGameStats(
+                game_id=game.id,
+                player_id=horizon_player_id,
+                **player_stats
+            )
+            session.add(players_game_stats)
 
     # Commit the changes
     session.commit()
 
 
-@retry_async(retries=3, delay=2)
-async def get_uya_gamehistory_and_player_stats_async(
-    game: dict,
-    session: Session
-) -> None:
-    # Need to add these to options to prevent lazy loading which fails with async
-    mapper = inspect(UyaGameHistory)
-    options = []
-
-    # Dynamically add selectinload for each relationship
-    for rel in mapper.relationships:
-        relationship_attribute = getattr(UyaGameHistory, rel.key)
-        options.append(selectinload(relationship_attribute))
-
-    #logger.debug(f"update_player_vanilla_stats_async: {player_id} Got options: {options}")
-    # Create a select statement with the filter condition
-    stmt = select(UyaGameHistory).options(*options).filter_by(id=int(game["Id"]))
-    # Execute the statement asynchronously
-    result = await session.execute(stmt)
-    # Fetch the first result
-    game_result = result.scalars().first()
-
-    mapper = inspect(UyaPlayerGameStats)
-    options = []
-
-    # Dynamically add selectinload for each relationship
-    for rel in mapper.relationships:
-        relationship_attribute = getattr(UyaPlayerGameStats, rel.key)
-        options.append(selectinload(relationship_attribute))
-    stmt = select(UyaPlayerGameStats).options(*options).filter_by(game_id=int(game["Id"]))
-    existing_player_game_stats = await session.execute(stmt)
-    existing_player_game_stats = existing_player_game_stats.scalars().all()
-    return game_result, existing_player_game_stats
-
 @retry_async(retries=3, delay=2)
 async def check_uya_gamehistory_exists_async(
     game: dict,
@@ -408,21 +274,10 @@ async def check_uya_gamehistory_exists_async(
 
 @retry_async(retries=3, delay=2)
 async def update_uya_gamehistory_async(
-    game: dict,
+    game: UyaGameRecord,
     session: Session
 ) -> None:
 
-    if "Metadata" not in game.keys() or game["Metadata"] == None or game["Metadata"] == {}:
-        game["Metadata"] = {}
-    elif type(game["Metadata"]) == str:
-        game["Metadata"] = json.loads(game["Metadata"])
-
-    # Get player count
-    if "PreWideStats" in game["Metadata"].keys() and "Players" in game["Metadata"]["PreWideStats"].keys():
-        player_count:int = len(game["Metadata"]["PreWideStats"]["Players"])
-    else:
-        player_count = 0
-
     # Need to add these to options to prevent lazy loading which fails with async
     mapper = inspect(UyaGameHistory)
     options = []
@@ -432,45 +287,24 @@ async def update_uya_gamehistory_async(
         relationship_attribute = getattr(UyaGameHistory, rel.key)
         options.append(selectinload(relationship_attribute))
 
-    #logger.debug(f"update_player_vanilla_stats_async: {player_id} Got options: {options}")
     # Create a select statement with the filter condition
-    stmt = select(UyaGameHistory).options(*options).filter_by(id=int(game["Id"]))
+    stmt = select(UyaGameHistory).options(*options).filter_by(id=game.id)
     # Execute the statement asynchronously
     result = await session.execute(stmt)
     # Fetch the first result
     game_result = result.scalars().first()
 
     if game_result is None: # Game doesn't exist in db. Add it
-        logger.debug(f"update_uya_gamehistory_async: Got new game: {int(game["Id"])}")
-
-        new_game_model = UyaGameHistory(
-            id=int(game["Id"]),
-            status=game["WorldStatus"],
-            game_map=uya_map_parser(game["GenericField3"], game["Metadata"]),
-            game_name=uya_game_name_parser(game["GameName"]),
-            game_mode=uya_gamemode_parser(game["GenericField3"])[0],
-            game_submode=uya_gamemode_parser(game["GenericField3"])[1],
-            time_limit=uya_time_parser(game["GenericField3"]),
-            n60_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["N60"],
-            lava_gun_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Lava Gun"],
-            gravity_bomb_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Gravity Bomb"],
-            flux_rifle_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Flux Rifle"],
-            mine_glove_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Mine Glove"],
-            morph_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Morph O' Ray"],
-            blitz_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Blitz Cannon"],
-            rocket_enabled=uya_weapon_parser(game["PlayerSkillLevel"])["Rocket"],
-            player_count=player_count,
-            game_create_time=datetime.fromisoformat(game["GameCreateDt"][:26]),
-            game_start_time=datetime.fromisoformat(game["GameStartDt"][:26]),
-            game_end_time=datetime.fromisoformat(game["GameEndDt"][:26]),
-            game_duration=(datetime.fromisoformat(game["GameEndDt"][:26]) - datetime.fromisoformat(game["GameStartDt"][:26])).total_seconds() / 60
-        )
+        logger.debug(f"update_uya_gamehistory_async: Got new game: {game.id}")
+
+        new_game_model = UyaGameHistory(**game.game_history_fields())
         session.add(new_game_model)
         await session.flush()
+        await increment_uya_gamehistory_rollup_async(session, uya_game_rollup_increment(game))
         await session.commit()
     else: # Update rows
         pass
-        #logger.debug(f"update_uya_gamehistory_async: Already have this game: {int(game["Id"])}")
+        #logger.debug(f"update_uya_gamehistory_async: Already have this game: {game.id}")
 
 
     # Need to add these to options to prevent lazy loading which fails with async
@@ -481,60 +315,25 @@ async def update_uya_gamehistory_async(
         relationship_attribute = getattr(UyaPlayerGameStats, rel.key)
         options.append(selectinload(relationship_attribute))
 
-    # Clean PostWideStats - PreWideStats for each player
-    if "PreWideStats" in game["Metadata"].keys() and "Players" in game["Metadata"]["PreWideStats"].keys():
-        players_pre: list[str] = [horizon_account_id for horizon_account_id in game["Metadata"]["PreWideStats"]["Players"]]
-
-        # Subtract players post from players pre
-        for horizon_player_id in players_pre:
-            stat_difference:list = [post_stat - pre_stat for post_stat, pre_stat in zip(game["Metadata"]["PostWideStats"]["Players"][horizon_player_id], game["Metadata"]["PreWideStats"]["Players"][horizon_player_id])]
-
-            # Convert stat difference to string key
-            player_cleaned_stats:dict[str, int] = {uya_vanilla_stats_map[key]['label']: value for key, value in zip(uya_vanilla_stats_map.keys(), stat_difference) if uya_vanilla_stats_map[key]["label"]}
-
-            #logger.debug(f"update_player_vanilla_stats_async: {player_id} Got options: {options}")
-            # Create a select statement with the filter condition
-            stmt = select(UyaPlayerGameStats).options(*options).filter_by(game_id=int(game["Id"])).filter_by(player_id=int(horizon_player_id))
-            # Execute the statement asynchronously
-            result = await session.execute(stmt)
-            # Fetch the first result
-            player_result = result.scalars().first()
-
-            if player_result is None:
-                players_game_stats = UyaPlayerGameStats(
-                    game_id = int(game["Id"]),
-                    player_id = int(horizon_player_id),
-
-                    win = player_cleaned_stats["Wins"] == 1, # If there was +1 to win stat
-                    kills = player_cleaned_stats["Kills"],
-                    deaths = player_cleaned_stats["Deaths"],
-                    base_dmg = player_cleaned_stats["Total Base Damage"],
-                    flag_captures = player_cleaned_stats["CTF Flags Captured"],
-                    flag_saves = player_cleaned_stats["CTF Flags Saved"],
-                    suicides = player_cleaned_stats["Suicides"],
-                    nodes = player_cleaned_stats["Total Nodes"],
-                    n60_deaths = player_cleaned_stats["N60 Deaths"],
-                    n60_kills = player_cleaned_stats["N60 Kills"],
-                    lava_gun_deaths = player_cleaned_stats["Lava Gun Deaths"],
-                    lava_gun_kills = player_cleaned_stats["Lava Gun Kills"],
-                    gravity_bomb_deaths = player_cleaned_stats["Gravity Bomb Deaths"],
-                    gravity_bomb_kills = player_cleaned_stats["Gravity Bomb Kills"],
-                    flux_rifle_deaths = player_cleaned_stats["Flux Rifle Deaths"],
-                    flux_rifle_kills = player_cleaned_stats["Flux Rifle Kills"],
-                    mine_glove_deaths = player_cleaned_stats["Mine Glove Deaths"],
-                    mine_glove_kills = player_cleaned_stats["Mine Glove Kills"],
-                    morph_deaths = player_cleaned_stats["Morph-O-Ray Deaths"],
-                    morph_kills = player_cleaned_stats["Morph-O-Ray Kills"],
-                    blitz_deaths = player_cleaned_stats["Blitz Cannon Deaths"],
-                    blitz_kills = player_cleaned_stats["Blitz Cannon Kills"],
-                    rocket_deaths = player_cleaned_stats["Rocket Deaths"],
-                    rocket_kills = player_cleaned_stats["Rocket Kills"],
-                    wrench_deaths = player_cleaned_stats["Wrench Deaths"],
-                    wrench_kills = player_cleaned_stats["Wrench Kills"],
-                )
-                session.add(players_game_stats)
-                await session.flush()
-                await session.commit()
+    # Store PostWideStats - PreWideStats for each player
+    for horizon_player_id, player_stats in game.player_stats.items():
+        # Create a select statement with the filter condition
+        stmt = select(UyaPlayerGameStats).options(*options).filter_by(game_id=game.id).filter_by(player_id=horizon_player_id)
+        # Execute the statement asynchronously
+        result = await session.execute(stmt)
+        # Fetch the first result
+        player_result = result.scalars().first()
+
+        if player_result is None:
+            players_game_stats = UyaPlayerGameStats(
+                game_id=game.id,
+                player_id=horizon_player_id,
+                **player_stats
+            )
+            session.add(players_game_stats)
+            await session.flush()
+            await increment_uya_gamehistory_rollup_async(session, uya_player_rollup_increment(game, player_stats))
+            await session.commit()
 
 
 
@@ -574,6 +373,7 @@ def update_deadlocked_player_custom_stats(
             setattr(stats_table_obj, custom_stats_map[index]["field"], stat)
 
         session.add(player)
+        update_player_profile("dl", session, player)
         session.commit()
 
 
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable
+
+
+class VersionedResponseCache:
+    """
+    LRU cache of pre-serialized response bodies. Every entry is tagged with the data version of its game at the time
+    it was computed, and bumping a game's version (after ingest writes a batch of stats) invalidates all of its entries
+    at once. Concurrent misses on the same key share a single computation instead of each querying the database.
+    """
+
+    def __init__(self, maxsize: int, max_age: float):
+        """
+        :param maxsize: Maximum number of cached bodies.
+        :param max_age: Seconds after which an entry is recomputed even if its version is current. This bounds
+            staleness for data written by other processes, such as the dataloader.
+        """
+        self._maxsize: int = maxsize
+        self._max_age: float = max_age
+
+        self._entries: OrderedDict[Hashable, tuple[int, float, bytes]] = OrderedDict()
+        self._versions: dict[str, int] = dict()
+        self._in_flight: dict[tuple[Hashable, int], asyncio.Future] = dict()
+
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def version(self, game: str) -> int:
+        return self._versions.get(game, 0)
+
+    def bump(self, game: str) -> None:
+        """
+        Invalidates every cached body of a game.
+        """
+        self._versions[game] = self.version(game) + 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "in_flight": len(self._in_flight),
+        }
+
+    async def get_or_compute(self, game: str, key: Hashable, compute: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        :param game: "dl" or "uya", whose version the body depends on.
+        :param key: Cache key of the body, unique across games.
+        :param compute: Produces the serialized body on a miss.
+        :return: The cached or freshly computed body.
+        """
+        while True:
+            version: int = self.version(game)
+            entry: tuple[int, float, bytes] | None = self._entries.get(key)
+
+            if entry is not None and entry[0] == version and time.monotonic() - entry[1] < self._max_age:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[2]
+
+            flight_key: tuple[Hashable, int] = (key, version)
+            in_flight: asyncio.Future | None = self._in_flight.get(flight_key)
+
+            if in_flight is None:
+                break
+
+            try:
+                body: bytes = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # The computation was cancelled along with the request that started it. Unless this request was
+                # cancelled too, try again, computing the body itself if no other request has started to.
+                if not in_flight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                continue
+
+            self._hits += 1
+            return body
+
+        self._misses += 1
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._in_flight[flight_key] = future
+
+        try:
+            body: bytes = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise the exception, retrieve it here so an unawaited future doesn't log a warning.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[flight_key]
+
+        self._entries[key] = (version, time.monotonic(), body)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+        future.set_result(body)
+        return body
+
+
+leaderboard_page_cache: VersionedResponseCache = VersionedResponseCache(maxsize=1024, max_age=300)
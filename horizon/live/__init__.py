@@ -0,0 +1,24 @@
+from horizon.live.binary import BINARY_SUBPROTOCOL, encode_binary_frame, decode_binary_frame
+from horizon.live.subscriptions import ALL_WORLDS, LiveSubscription, parse_subscription, project_worlds
+from horizon.live.frames import (
+    FULL_MODE,
+    DELTA_MODE,
+    BINARY_MODE,
+    LIVE_MODES,
+    LiveFrameSet,
+    diff_world,
+    diff_worlds,
+    apply_frame
+)
+from horizon.live.delay_buffer import DelayedFrameBuffer
+from horizon.live.recordings import (
+    LiveRecorder,
+    MatchRecording,
+    list_recordings,
+    get_recording_metadata,
+    prune_recordings,
+    read_recording,
+    read_recording_async
+)
+from horizon.live.shared_frames import SharedFrameRing, SharedFrame, OwnerLock, publish_frame_set, read_frame_set
+from horizon.live.simulation import SimulatedLiveTrackerServer
@@ -0,0 +1,234 @@
+"""
+Compact binary encoding of the UYA live tracker world state, sent to clients that negotiate the BINARY_SUBPROTOCOL
+websocket subprotocol. Every frame is a full snapshot of every world. All integers are little-endian:
+
+    header   magic "UYAL", format version (u8), seq (u32), unix timestamp (f64), string count (u16)
+    strings  per string: byte length (u16) and UTF-8 bytes
+    worlds   world count (u16), then per world a WORLD struct followed by its players' PLAYER structs
+
+Every string (usernames, teams, weapons, upgrades, maps, ...) is interned in the frame's string table and referenced
+by its index, with NO_STRING standing for None. Coordinates are quantized to 1 / COORD_SCALE units. World events are
+carried as a JSON string, or NO_STRING if they do not fit in a string.
+
+The world and player fields are those of the tracker's dump, described by UYALiveGameSession in app.schemas.schemas.
+Numbers that do not fit their field, or are not numbers, are clamped to the field's range (0 for non-numbers) so a
+single unexpected value never fails the frame, and strings longer than MAX_STRING_LENGTH bytes are truncated.
+"""
+import json
+import struct
+from typing import Iterable
+
+
+BINARY_SUBPROTOCOL: str = "uya-live.binary.v1"
+
+MAGIC: bytes = b"UYAL"
+FORMAT_VERSION: int = 1
+COORD_SCALE: int = 100
+NO_STRING: int = 0xFFFF
+MAX_STRING_LENGTH: int = 0xFFFF
+MAX_PLAYERS: int = 0xFF
+MAX_WORLDS: int = 0xFFFF
+UPGRADES: tuple[str, ...] = ("flux", "blitz", "grav")
+
+HEADER: struct.Struct = struct.Struct("<4sBIdH")
+STRING_LENGTH: struct.Struct = struct.Struct("<H")
+WORLD_COUNT: struct.Struct = struct.Struct("<H")
+# world_id, world_latest_update, map, name, game_mode, events, player count
+WORLD: struct.Struct = struct.Struct("<IHHHHHB")
+# player_id, account_id, team, username, coord x/y/z, cam_x, weapon, flux/blitz/grav upgrade and kills, flag, health,
+# total_kills, total_deaths, total_suicides, total_flags
+PLAYER: struct.Struct = struct.Struct("<IIHHiiiiHHHHHHHHhHHHH")
+
+# (min, max) of each integer struct format character.
+_FORMAT_RANGES: dict[str, tuple[int, int]] = {
+    "B": (0, 0xFF),
+    "H": (0, 0xFFFF),
+    "h": (-0x8000, 0x7FFF),
+    "I": (0, 0xFFFFFFFF),
+    "i": (-0x80000000, 0x7FFFFFFF),
+}
+
+
+def _field_ranges(layout: struct.Struct) -> tuple[tuple[int, int], ...]:
+    return tuple(_FORMAT_RANGES[field] for field in layout.format.lstrip("<"))
+
+
+WORLD_RANGES: tuple[tuple[int, int], ...] = _field_ranges(WORLD)
+PLAYER_RANGES: tuple[tuple[int, int], ...] = _field_ranges(PLAYER)
+
+
+def _pack(layout: struct.Struct, ranges: tuple[tuple[int, int], ...], *values: any) -> bytes:
+    """
+    Packs integer fields, clamping each value to its field's range.
+    """
+    clamped: list[int] = list()
+
+    for value, (low, high) in zip(values, ranges):
+        try:
+            value = round(value)
+        except (TypeError, ValueError, OverflowError):
+            value = 0
+
+        clamped.append(min(max(value, low), high))
+
+    return layout.pack(*clamped)
+
+
+class _StringTable:
+    def __init__(self):
+        self.indexes: dict[str, int] = dict()
+
+    def __call__(self, value: str | None) -> int:
+        if value is None:
+            return NO_STRING
+
+        value = str(value)
+
+        index: int | None = self.indexes.get(value)
+        if index is None:
+            # NO_STRING is not a valid index, so a full table leaves further strings out.
+            if len(self.indexes) == NO_STRING:
+                return NO_STRING
+
+            index = self.indexes[value] = len(self.indexes)
+        return index
+
+
+def encode_binary_frame(seq: int, timestamp: float, worlds: Iterable[dict]) -> bytes:
+    """
+    :param seq: Sequence number of the frame.
+    :param timestamp: Unix time of the frame.
+    :param worlds: Worlds in the shape of the tracker's JSON dump.
+    :return: The encoded frame.
+    """
+    strings: _StringTable = _StringTable()
+    body: list[bytes] = list()
+    world_count: int = 0
+
+    for world in worlds:
+        if world_count == MAX_WORLDS:
+            break
+
+        players: list[dict] = world["players"][:MAX_PLAYERS]
+        world_count += 1
+
+        events: str = json.dumps(world.get("events", []), separators=(",", ":"))
+
+        body.append(_pack(
+            WORLD,
+            WORLD_RANGES,
+            world["world_id"],
+            strings(world["world_latest_update"]),
+            strings(world["map"]),
+            strings(world["name"]),
+            strings(world["game_mode"]),
+            strings(events if len(events.encode()) <= MAX_STRING_LENGTH else None),
+            len(players)
+        ))
+
+        for player in players:
+            x, y, z = player["coord"]
+            upgrades: dict[str, dict] = player["upgrades"]
+
+            body.append(_pack(
+                PLAYER,
+                PLAYER_RANGES,
+                player["player_id"],
+                player["account_id"],
+                strings(player["team"]),
+                strings(player["username"]),
+                x * COORD_SCALE,
+                y * COORD_SCALE,
+                z * COORD_SCALE,
+                player["cam_x"],
+                strings(player.get("weapon")),
+                *(value for upgrade in UPGRADES for value in (
+                    strings(upgrades[upgrade]["upgrade"]),
+                    upgrades[upgrade]["kills"]
+                )),
+                strings(player.get("flag")),
+                player["health"],
+                player["total_kills"],
+                player["total_deaths"],
+                player["total_suicides"],
+                player["total_flags"]
+            ))
+
+    header: list[bytes] = [HEADER.pack(MAGIC, FORMAT_VERSION, seq & 0xFFFFFFFF, timestamp, len(strings.indexes))]
+    for string in strings.indexes:
+        encoded: bytes = string.encode()
+        if len(encoded) > MAX_STRING_LENGTH:
+            # Cut at a character boundary so the string still decodes.
+            encoded = encoded[:MAX_STRING_LENGTH].decode(errors="ignore").encode()
+        header.append(STRING_LENGTH.pack(len(encoded)))
+        header.append(encoded)
+    header.append(WORLD_COUNT.pack(world_count))
+
+    return b"".join(header + body)
+
+
+def decode_binary_frame(data: bytes) -> dict:
+    """
+    Reference decoder of `encode_binary_frame`.
+
+    :return: The frame as {"seq": ..., "ts": ..., "worlds": [...]}, with worlds in the shape of the tracker's JSON dump.
+    """
+    magic, version, seq, timestamp, string_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported live frame format: {magic!r} version {version}.")
+
+    offset: int = HEADER.size
+    strings: list[str] = list()
+    for _ in range(string_count):
+        length, = STRING_LENGTH.unpack_from(data, offset)
+        offset += STRING_LENGTH.size
+        strings.append(data[offset:offset + length].decode())
+        offset += length
+
+    def string(index: int) -> str | None:
+        return None if index == NO_STRING else strings[index]
+
+    world_count, = WORLD_COUNT.unpack_from(data, offset)
+    offset += WORLD_COUNT.size
+
+    worlds: list[dict] = list()
+    for _ in range(world_count):
+        world_id, latest_update, game_map, name, game_mode, events, player_count = WORLD.unpack_from(data, offset)
+        offset += WORLD.size
+
+        players: list[dict] = list()
+        for _ in range(player_count):
+            values: tuple = PLAYER.unpack_from(data, offset)
+            offset += PLAYER.size
+
+            players.append({
+                "player_id": values[0],
+                "account_id": values[1],
+                "team": string(values[2]),
+                "username": string(values[3]),
+                "coord": [value / COORD_SCALE for value in values[4:7]],
+                "cam_x": values[7],
+                "weapon": string(values[8]),
+                "upgrades": {
+                    upgrade: {"upgrade": string(values[9 + 2 * i]), "kills": values[10 + 2 * i]}
+                    for i, upgrade in enumerate(UPGRADES)
+                },
+                "flag": string(values[15]),
+                "health": values[16],
+                "total_kills": values[17],
+                "total_deaths": values[18],
+                "total_suicides": values[19],
+                "total_flags": values[20],
+            })
+
+        worlds.append({
+            "world_id": world_id,
+            "world_latest_update": string(latest_update),
+            "players": players,
+            "events": json.loads(string(events)) if events != NO_STRING else [],
+            "map": string(game_map),
+            "name": string(name),
+            "game_mode": string(game_mode),
+        })
+
+    return {"seq": seq, "ts": timestamp, "worlds": worlds}
@@ -0,0 +1,96 @@
+import math
+from collections import deque
+
+from horizon.live.frames import LiveFrameSet
+
+
+class DelayedFrameBuffer:
+    """
+    Recent broadcasts indexed by time, for serving spectators the world state from a fixed delay ago so they cannot
+    relay live positions to players (ghosting).
+
+    Time is divided into slots of one write tick. A ring of slots covering the delay holds, for every slot, the
+    broadcast that was current during it, so a lookup is a single index. Slots share the broadcasts they point to, and
+    every delayed client is served the same broadcast objects, with their cached encodings. Memory is bounded by the
+    ring's length and by a budget on the size of the buffered dumps, past which the oldest broadcasts are evicted and
+    lookups that old return None.
+    """
+
+    def __init__(self, delay: float, slot_duration: float, max_bytes: int):
+        """
+        :param delay: Seconds of history to keep.
+        :param slot_duration: Time resolution of lookups in seconds.
+        :param max_bytes: Maximum total size of the buffered dumps.
+        """
+        self._slot_duration: float = slot_duration
+        self._capacity: int = math.ceil(delay / slot_duration) + 1
+        self._max_bytes: int = max_bytes
+
+        self._slots: list[LiveFrameSet | None] = [None] * self._capacity
+        self._latest: LiveFrameSet | None = None
+        self._last_slot: int = 0
+        self._floor_slot: int = 0
+
+        # Every buffered broadcast with the first slot it covers and its size, oldest first.
+        self._entries: deque[tuple[int, LiveFrameSet, int]] = deque()
+        self._bytes: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, frame_set: LiveFrameSet, timestamp: float) -> None:
+        """
+        Records a broadcast made at a monotonic timestamp. Timestamps must not decrease.
+        """
+        slot: int = int(timestamp // self._slot_duration)
+
+        if self._latest is None:
+            self._floor_slot = slot
+        else:
+            # Carry the previous broadcast forward through the slots in which nothing changed.
+            for previous_slot in range(max(self._last_slot + 1, slot - self._capacity + 1), slot):
+                self._slots[previous_slot % self._capacity] = self._latest
+
+        self._slots[slot % self._capacity] = frame_set
+        self._latest = frame_set
+        self._last_slot = slot
+
+        size: int = len(frame_set.dump)
+        self._entries.append((slot, frame_set, size))
+        self._bytes += size
+
+        self._evict(slot)
+
+    def _evict(self, slot: int) -> None:
+        window_start: int = slot - self._capacity + 1
+
+        # The oldest broadcast is unreachable once the next one covers the start of the ring, and goes first when the
+        # buffer is over its memory budget. The latest broadcast is always kept.
+        while len(self._entries) > 1 and (self._entries[1][0] <= window_start or self._bytes > self._max_bytes):
+            _, _, size = self._entries.popleft()
+            self._bytes -= size
+
+        floor_slot: int = max(self._entries[0][0], window_start)
+
+        # Release slots that now fall before the floor, so evicted broadcasts can be freed.
+        for evicted_slot in range(max(self._floor_slot, window_start), floor_slot):
+            self._slots[evicted_slot % self._capacity] = None
+
+        self._floor_slot = max(self._floor_slot, floor_slot)
+
+    def at(self, timestamp: float) -> LiveFrameSet | None:
+        """
+        :param timestamp: Monotonic time to look up.
+        :return: The broadcast current at that time, or None if it is older than the buffered history.
+        """
+        slot: int = int(timestamp // self._slot_duration)
+
+        if self._latest is None or slot < self._floor_slot:
+            return None
+        if slot >= self._last_slot:
+            return self._latest
+        return self._slots[slot % self._capacity]
@@ -0,0 +1,292 @@
+"""
+Encodings of the UYA live tracker world state sent to spectators.
+
+In the default "full" mode every frame is the tracker's JSON dump of every world. In "delta" mode frames are wrapped in
+an envelope with a sequence number and timestamp:
+
+    {"type": "keyframe", "seq": 12, "ts": 1700000000.0, "worlds": [<world>, ...]}
+    {"type": "delta", "seq": 13, "base": 12, "ts": 1700000000.1, "worlds": {"<world_id>": <world delta>}, "removed_worlds": [<world_id>, ...]}
+
+A keyframe is sent on connect, on every new subscription and every few seconds. A world delta holds only the
+world fields that changed, "players" maps the player ID of every new or changed player to its changed fields and
+"removed_players" lists the IDs of players that left. A delta applies only to the frame whose seq is its base, which
+is always the last frame the client was sent.
+
+In "binary" mode, negotiated through the websocket subprotocol, every frame is a full snapshot in the format described
+in horizon.live.binary.
+"""
+import json
+
+from horizon.live.binary import encode_binary_frame
+from horizon.live.subscriptions import ALL_WORLDS, LiveSubscription, project_worlds
+
+
+FULL_MODE: str = "full"
+DELTA_MODE: str = "delta"
+BINARY_MODE: str = "binary"
+LIVE_MODES: tuple[str, ...] = (FULL_MODE, DELTA_MODE, BINARY_MODE)
+
+
+def diff_world(previous: dict, current: dict) -> dict:
+    """
+    :return: The delta from one state of a world to the next, empty if nothing changed.
+    """
+    changes: dict = {key: value for key, value in current.items() if key != "players" and previous.get(key) != value}
+
+    previous_players: dict[int, dict] = {player["player_id"]: player for player in previous.get("players", [])}
+    current_players: dict[int, dict] = {player["player_id"]: player for player in current.get("players", [])}
+
+    players: dict[str, dict] = dict()
+    for player_id, player in current_players.items():
+        previous_player: dict | None = previous_players.get(player_id)
+
+        if previous_player is None:
+            players[str(player_id)] = player
+            continue
+
+        player_changes: dict = {key: value for key, value in player.items() if previous_player.get(key) != value}
+        if player_changes:
+            players[str(player_id)] = player_changes
+
+    if players:
+        changes["players"] = players
+
+    removed_players: list[int] = [player_id for player_id in previous_players if player_id not in current_players]
+    if removed_players:
+        changes["removed_players"] = removed_players
+
+    return changes
+
+
+def diff_worlds(previous: dict[int, dict], current: dict[int, dict]) -> tuple[dict[str, dict], list[int]]:
+    """
+    :param previous: Worlds of the base frame by world ID.
+    :param current: Worlds of the new frame by world ID.
+    :return: The delta of every new or changed world by world ID and the IDs of removed worlds.
+    """
+    worlds: dict[str, dict] = dict()
+
+    for world_id, world in current.items():
+        previous_world: dict | None = previous.get(world_id)
+
+        # Unchanged worlds keep the same state object, so they are skipped without being compared.
+        if previous_world is world:
+            continue
+
+        changes: dict = world if previous_world is None else diff_world(previous_world, world)
+
+        if changes:
+            worlds[str(world_id)] = changes
+
+    return worlds, [world_id for world_id in previous if world_id not in current]
+
+
+def apply_frame(worlds: dict[int, dict], frame: dict) -> dict[int, dict]:
+    """
+    Reference client implementation of delta mode.
+
+    :param worlds: Worlds by world ID after the frame's base, updated in place. Ignored for keyframes.
+    :param frame: A decoded keyframe or delta envelope.
+    :return: The worlds after the frame.
+    """
+    if frame["type"] == "keyframe":
+        return {world["world_id"]: world for world in frame["worlds"]}
+
+    for world_id in frame["removed_worlds"]:
+        worlds.pop(world_id, None)
+
+    for world_id, changes in frame["worlds"].items():
+        world_id = int(world_id)
+
+        if world_id not in worlds:
+            worlds[world_id] = changes
+            continue
+
+        world: dict = worlds[world_id]
+        players: list[dict] = world.setdefault("players", [])
+
+        for key, value in changes.items():
+            if key not in ("players", "removed_players"):
+                world[key] = value
+
+        removed_players: set[int] = set(changes.get("removed_players", ()))
+        if removed_players:
+            players[:] = [player for player in players if player["player_id"] not in removed_players]
+
+        player_changes: dict[str, dict] = changes.get("players", {})
+        if player_changes:
+            players_by_id: dict[int, dict] = {player["player_id"]: player for player in players}
+
+            for player_id, player in player_changes.items():
+                if int(player_id) in players_by_id:
+                    players_by_id[int(player_id)].update(player)
+                else:
+                    players.append(player)
+
+    return worlds
+
+
+class LiveFrameSet:
+    """
+    One broadcast of the world state. Each view and encoding is built at most once, the first time a client needs it,
+    and then shared by every client with the same mode, subscription signature and delta base. The projection and JSON
+    encoding of a world that has not changed since the previous broadcast are reused from that broadcast.
+    """
+
+    def __init__(
+        self,
+        seq: int,
+        timestamp: float,
+        dump: str,
+        worlds: dict[int, dict] | None,
+        is_keyframe: bool,
+        world_versions: dict[int, int] | None = None,
+        previous: "LiveFrameSet | None" = None
+    ):
+        """
+        :param seq: Sequence number of the broadcast.
+        :param timestamp: Unix time of the broadcast.
+        :param dump: The tracker's JSON dump of every world.
+        :param worlds: The parsed dump by world ID, or None to parse the dump the first time it is needed.
+        :param is_keyframe: Whether delta mode clients are sent a keyframe instead of a delta.
+        :param world_versions: The version each world last changed in, by world ID.
+        :param previous: The previous broadcast, whose per-world projections and encodings are reused.
+        """
+        self.seq: int = seq
+        self.timestamp: float = timestamp
+        self.dump: str = dump
+        self._worlds: dict[int, dict] | None = worlds
+        self.is_keyframe: bool = is_keyframe
+        self.world_versions: dict[int, int] = world_versions if world_versions is not None else dict()
+
+        # Only the latest broadcast links to the one before it, so old broadcasts can be freed.
+        self.previous: LiveFrameSet | None = previous
+        if previous is not None:
+            previous.previous = None
+
+        self._views: dict[tuple, dict[int, dict]] = dict()
+        self._world_encodings: dict[tuple, str] = dict()
+        self._encodings: dict[tuple, str | bytes] = dict()
+
+    @property
+    def worlds(self) -> dict[int, dict]:
+        """
+        The worlds by world ID.
+        """
+        if self._worlds is None:
+            self._worlds = {world["world_id"]: world for world in json.loads(self.dump)}
+        return self._worlds
+
+    def add_encoding(self, mode: str, frame: str | bytes, base_seq: int | None = None) -> None:
+        """
+        Adds a frame of every world that was already encoded elsewhere, such as by the process that published it.
+
+        :param mode: FULL_MODE, DELTA_MODE or BINARY_MODE.
+        :param frame: The encoded frame.
+        :param base_seq: Seq of the broadcast a delta frame is against.
+        """
+        self._encodings[(mode, ALL_WORLDS.signature, base_seq)] = frame
+
+    def _unchanged(self, world_id: int) -> bool:
+        """
+        :return: True if the world has not changed since the previous broadcast.
+        """
+        version: int | None = self.world_versions.get(world_id)
+        return version is not None and self.previous is not None and \
+            self.previous.world_versions.get(world_id) == version
+
+    def view(self, subscription: LiveSubscription) -> dict[int, dict]:
+        """
+        :return: The worlds selected by the subscription.
+        """
+        signature: tuple = subscription.signature
+        if signature == ALL_WORLDS.signature:
+            return self.worlds
+
+        view: dict[int, dict] | None = self._views.get(signature)
+        if view is not None:
+            return view
+
+        previous_view: dict[int, dict] = self.previous._views.get(signature, {}) if self.previous is not None else {}
+
+        view = self._views[signature] = dict()
+        for world_id, world in self.worlds.items():
+            if subscription.world_ids is not None and world_id not in subscription.world_ids:
+                continue
+
+            if self._unchanged(world_id) and world_id in previous_view:
+                view[world_id] = previous_view[world_id]
+            else:
+                view[world_id] = project_worlds({world_id: world}, subscription)[world_id]
+
+        return view
+
+    def _encode_world(self, signature: tuple, world_id: int, world: dict) -> str:
+        key: tuple = (signature, world_id)
+        encoded: str | None = self._world_encodings.get(key)
+
+        if encoded is None:
+            if self._unchanged(world_id):
+                encoded = self.previous._world_encodings.get(key)
+
+            if encoded is None:
+                encoded = json.dumps(world, separators=(",", ":"))
+
+            self._world_encodings[key] = encoded
+        return encoded
+
+    def encode(
+        self,
+        mode: str,
+        subscription: LiveSubscription = ALL_WORLDS,
+        base: "LiveFrameSet | None" = None
+    ) -> str | bytes:
+        """
+        :param mode: FULL_MODE, DELTA_MODE or BINARY_MODE.
+        :param subscription: What the client subscribed to.
+        :param base: The last broadcast sent to a delta mode client, or None if it needs a keyframe.
+        :return: The frame to send, bytes in binary mode.
+        """
+        if mode == BINARY_MODE:
+            # Binary frames have a fixed layout, so only the world selection applies.
+            subscription = LiveSubscription(world_ids=subscription.world_ids)
+        if mode != DELTA_MODE or self.is_keyframe:
+            base = None
+
+        key: tuple = (mode, subscription.signature, None if base is None else base.seq)
+        frame: str | bytes | None = self._encodings.get(key)
+
+        if frame is None:
+            frame = self._encodings[key] = self._encode(mode, subscription, base)
+        return frame
+
+    def _encode(self, mode: str, subscription: LiveSubscription, base: "LiveFrameSet | None") -> str | bytes:
+        unfiltered: bool = subscription.signature == ALL_WORLDS.signature
+
+        if mode == BINARY_MODE:
+            return encode_binary_frame(self.seq, self.timestamp, self.view(subscription).values())
+
+        # Embed the dump as is rather than re-serializing the worlds when nothing is filtered out, otherwise join the
+        # encodings of each world.
+        worlds: str = self.dump if unfiltered else "[" + ",".join(
+            self._encode_world(subscription.signature, world_id, world)
+            for world_id, world
+            in self.view(subscription).items()
+        ) + "]"
+
+        if mode == FULL_MODE:
+            return worlds
+
+        if base is None:
+            return f'{{"type":"keyframe","seq":{self.seq},"ts":{self.timestamp},"worlds":{worlds}}}'
+
+        changed_worlds, removed_worlds = diff_worlds(base.view(subscription), self.view(subscription))
+
+        return json.dumps({
+            "type": "delta",
+            "seq": self.seq,
+            "base": base.seq,
+            "ts": self.timestamp,
+            "worlds": changed_worlds,
+            "removed_worlds": removed_worlds,
+        }, separators=(",", ":"))
@@ -0,0 +1,452 @@
+"""
+Recordings of live matches. Every world the live tracker sees is written to its own recording from the moment it
+appears until it disappears, as three files named after the recording ID "<world_id>_<start unix time>":
+
+    <id>.rec        Append-only blocks. Each block is a BLOCK_HEADER with the size of its zlib compressed payload,
+                    followed by the payload: newline separated JSON frames. The first frame of a block is a keyframe
+                    {"ts": ..., "world": <world>} and the rest are deltas {"ts": ..., "delta": <world delta>} against
+                    the previous frame, in the world delta format of horizon.live.frames.
+    <id>.idx        One INDEX_ENTRY per block: the time of its keyframe and its offset in the .rec file.
+    <id>.json       Metadata of the match, rewritten when the recording ends.
+
+A block is written whenever a new keyframe starts, so seeking reads the index, jumps to the last keyframe before the
+target time and decodes a single block at a time. Blocks are compressed and written on a background thread and read
+back on the event loop's default executor, and the oldest recordings are deleted once they are too old or take up too
+much space.
+"""
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator
+
+from horizon.live.frames import diff_world, apply_frame
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+stream_handler = logging.StreamHandler()
+stream_handler.setLevel(logging.DEBUG)
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+stream_handler.setFormatter(formatter)
+logger.addHandler(stream_handler)
+
+
+RECORDING_ID_PATTERN: re.Pattern = re.compile(r"^\d+_\d+$")
+
+BLOCK_HEADER: struct.Struct = struct.Struct("<I")
+INDEX_ENTRY: struct.Struct = struct.Struct("<dQ")
+
+RECORDING_EXTENSIONS: tuple[str, ...] = (".rec", ".idx", ".json")
+
+
+def _write_metadata(path: str, metadata: dict[str, any]) -> None:
+    # Replaced atomically, the metadata is read by the event loop while recordings are written.
+    with open(f"{path}.json.tmp", "w") as stream:
+        json.dump(metadata, stream)
+    os.replace(f"{path}.json.tmp", f"{path}.json")
+
+
+def _write_block(path: str, metadata: dict[str, any], block: str, timestamp: float) -> None:
+    _write_metadata(path, metadata)
+
+    payload: bytes = zlib.compress(block.encode())
+
+    with open(f"{path}.rec", "ab") as stream:
+        offset: int = stream.tell()
+        stream.write(BLOCK_HEADER.pack(len(payload)))
+        stream.write(payload)
+
+    with open(f"{path}.idx", "ab") as stream:
+        stream.write(INDEX_ENTRY.pack(timestamp, offset))
+
+
+class MatchRecording:
+    """
+    The recording of one world, buffering the frames of the current block until the next keyframe.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        world: dict,
+        timestamp: float,
+        keyframe_interval: float,
+        write: Callable[..., None]
+    ):
+        """
+        :param write: Runs a file write in the background, in the order it was submitted.
+        """
+        self.recording_id: str = f"{world['world_id']}_{int(timestamp)}"
+        self._path: str = os.path.join(directory, self.recording_id)
+        self._keyframe_interval: float = keyframe_interval
+        self._write: Callable[..., None] = write
+
+        self._metadata: dict[str, any] = {
+            "id": self.recording_id,
+            "world_id": world["world_id"],
+            "name": world.get("name"),
+            "map": world.get("map"),
+            "game_mode": world.get("game_mode"),
+            "started": timestamp,
+            "ended": None,
+            "frames": 0,
+        }
+        self._write_metadata()
+
+        self._world: dict = world
+        self._block: list[str] = list()
+        self._block_timestamp: float = timestamp
+        self._start_block(world, timestamp)
+
+    def _write_metadata(self) -> None:
+        self._write(_write_metadata, self._path, dict(self._metadata))
+
+    def _start_block(self, world: dict, timestamp: float) -> None:
+        self._flush()
+        self._block_timestamp = timestamp
+        self._block.append(json.dumps({"ts": timestamp, "world": world}, separators=(",", ":")))
+        self._metadata["frames"] += 1
+
+    def _flush(self) -> None:
+        if not self._block:
+            return
+
+        self._write(_write_block, self._path, dict(self._metadata), "\n".join(self._block), self._block_timestamp)
+        self._block.clear()
+
+    def record(self, world: dict, timestamp: float) -> None:
+        """
+        Records the world's state at a unix timestamp, if it changed.
+        """
+        if world is self._world:
+            return
+
+        if timestamp - self._block_timestamp >= self._keyframe_interval:
+            if world != self._world:
+                self._start_block(world, timestamp)
+        else:
+            delta: dict = diff_world(self._world, world)
+            if not delta:
+                return
+
+            self._block.append(json.dumps({"ts": timestamp, "delta": delta}, separators=(",", ":")))
+            self._metadata["frames"] += 1
+
+        self._world = world
+
+    def close(self, timestamp: float) -> None:
+        self._flush()
+        self._metadata["ended"] = timestamp
+        self._write_metadata()
+
+
+class LiveRecorder:
+    """
+    Records every world of the live tracker's broadcasts. Files are written by a single background thread so the event
+    loop never waits on compression or disk.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        loop: asyncio.AbstractEventLoop,
+        keyframe_interval: float = 10,
+        max_bytes: int | None = None,
+        max_age: float | None = None
+    ):
+        """
+        :param directory: Directory to write recordings to, created if needed.
+        :param loop: Event loop recording is driven from.
+        :param keyframe_interval: Seconds between keyframes, which bounds how much is decoded to seek.
+        :param max_bytes: Total size of the recordings above which the oldest are deleted, or None for no limit.
+        :param max_age: Seconds after which a recording is deleted, or None for no limit.
+        """
+        self._directory: str = directory
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._keyframe_interval: float = keyframe_interval
+        self._max_bytes: int | None = max_bytes
+        self._max_age: float | None = max_age
+        self._recordings: dict[int, MatchRecording] = dict()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-recorder")
+
+        os.makedirs(directory, exist_ok=True)
+        self._prune()
+
+    def _write(self, function: Callable[..., None], *args) -> None:
+        future: asyncio.Future = self._loop.run_in_executor(self._executor, function, *args)
+        future.add_done_callback(self._log_write_error)
+
+    @staticmethod
+    def _log_write_error(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Unable to write live recording.", exc_info=future.exception())
+
+    def _prune(self) -> None:
+        if self._max_bytes is not None or self._max_age is not None:
+            self._write(
+                prune_recordings,
+                self._directory,
+                self._max_bytes,
+                self._max_age,
+                {recording.recording_id for recording in self._recordings.values()}
+            )
+
+    def record(self, worlds: dict[int, dict], timestamp: float) -> None:
+        """
+        :param worlds: Every current world by world ID.
+        :param timestamp: Unix time of the worlds' state.
+        """
+        ended: list[int] = list(self._recordings.keys() - worlds.keys())
+        for world_id in ended:
+            self._recordings.pop(world_id).close(timestamp)
+
+        for world_id, world in worlds.items():
+            recording: MatchRecording | None = self._recordings.get(world_id)
+
+            if recording is None:
+                self._recordings[world_id] = MatchRecording(
+                    self._directory, world, timestamp, self._keyframe_interval, self._write
+                )
+            else:
+                recording.record(world, timestamp)
+
+        if ended:
+            self._prune()
+
+    def close(self, timestamp: float) -> None:
+        for recording in self._recordings.values():
+            recording.close(timestamp)
+        self._recordings.clear()
+
+
+def prune_recordings(
+    directory: str,
+    max_bytes: int | None = None,
+    max_age: float | None = None,
+    active: set[str] = frozenset()
+) -> list[str]:
+    """
+    Deletes the oldest recordings until none is older than max_age and all of them fit in max_bytes.
+
+    :param directory: Directory of the recordings.
+    :param max_bytes: Maximum total size of the recordings' files, or None for no limit.
+    :param max_age: Maximum seconds since a recording started, or None for no limit.
+    :param active: IDs of recordings still being written, which are never deleted.
+    :return: IDs of the deleted recordings.
+    """
+    recordings: list[tuple[float, str, int]] = list()
+    total_bytes: int = 0
+
+    for recording in list_recordings(directory):
+        size: int = 0
+        for extension in RECORDING_EXTENSIONS:
+            try:
+                size += os.path.getsize(os.path.join(directory, f"{recording['id']}{extension}"))
+            except OSError:
+                pass
+
+        total_bytes += size
+        if recording["id"] not in active:
+            recordings.append((recording["started"], recording["id"], size))
+
+    oldest_allowed: float = time.time() - max_age if max_age is not None else float("-inf")
+    deleted: list[str] = list()
+
+    for started, recording_id, size in sorted(recordings):
+        if started >= oldest_allowed and (max_bytes is None or total_bytes <= max_bytes):
+            break
+
+        for extension in RECORDING_EXTENSIONS:
+            try:
+                os.remove(os.path.join(directory, f"{recording_id}{extension}"))
+            except FileNotFoundError:
+                pass
+
+        total_bytes -= size
+        deleted.append(recording_id)
+
+    return deleted
+
+
+def _read_metadata(path: str) -> dict[str, any] | None:
+    """
+    :return: The metadata in a recording's .json file, or None if it cannot be read.
+    """
+    try:
+        with open(path) as stream:
+            metadata: any = json.load(stream)
+    except (OSError, ValueError):
+        logger.warning(f"_read_metadata: Skipping unreadable recording metadata {path}.", exc_info=True)
+        return None
+
+    if not isinstance(metadata, dict) or not isinstance(metadata.get("id"), str) or \
+            not isinstance(metadata.get("started"), (int, float)):
+        logger.warning(f"_read_metadata: Skipping invalid recording metadata {path}.")
+        return None
+
+    return metadata
+
+
+def list_recordings(directory: str) -> list[dict[str, any]]:
+    """
+    :return: The metadata of every recording, most recent first. Recordings still in progress have no end time, and
+        recordings whose metadata cannot be read are left out.
+    """
+    if not os.path.isdir(directory):
+        return list()
+
+    recordings: list[dict[str, any]] = list()
+    for filename in os.listdir(directory):
+        if filename.endswith(".json"):
+            metadata: dict[str, any] | None = _read_metadata(os.path.join(directory, filename))
+
+            if metadata is not None:
+                recordings.append(metadata)
+
+    return sorted(recordings, key=lambda recording: recording["started"], reverse=True)
+
+
+def get_recording_metadata(directory: str, recording_id: str) -> dict[str, any] | None:
+    """
+    :return: The metadata of a recording or None if there is no such recording or its metadata cannot be read.
+    """
+    path: str = os.path.join(directory, f"{recording_id}.json")
+
+    if not RECORDING_ID_PATTERN.match(recording_id) or not os.path.isfile(path):
+        return None
+
+    return _read_metadata(path)
+
+
+def find_recording_block(directory: str, recording_id: str, start: float = 0) -> int | None:
+    """
+    :param directory: Directory of the recordings.
+    :param recording_id: ID of a recording that exists.
+    :param start: Unix time to start from.
+    :return: Offset in the .rec file of the block holding the last keyframe at or before the start, or None if the
+        recording has no blocks yet.
+    """
+    try:
+        with open(os.path.join(directory, f"{recording_id}.idx"), "rb") as stream:
+            index: list[tuple[float, int]] = [entry for entry in INDEX_ENTRY.iter_unpack(stream.read())]
+    except FileNotFoundError:
+        return None
+
+    if not index:
+        return None
+
+    return index[max(bisect.bisect_right([timestamp for timestamp, _ in index], start) - 1, 0)][1]
+
+
+def read_recording_block(
+    directory: str,
+    recording_id: str,
+    offset: int,
+    start: float = 0
+) -> tuple[list[dict], int | None]:
+    """
+    Reads and decodes one block of a recording. Frames before the start are folded into the first frame at or after
+    it, which is returned as a keyframe.
+
+    :param directory: Directory of the recordings.
+    :param recording_id: ID of a recording that exists.
+    :param offset: Offset of the block in the .rec file.
+    :param start: Unix time to start from.
+    :return: The block's keyframes {"ts": ..., "world": ...} and deltas {"ts": ..., "delta": ...} at or after the
+        start, and the offset of the next block, or None if this block is not complete yet.
+    """
+    with open(os.path.join(directory, f"{recording_id}.rec"), "rb") as stream:
+        stream.seek(offset)
+
+        # Blocks appended after the index was read are picked up too, a block is only indexed once it is complete.
+        header: bytes = stream.read(BLOCK_HEADER.size)
+        if len(header) < BLOCK_HEADER.size:
+            return list(), None
+
+        size, = BLOCK_HEADER.unpack(header)
+        payload: bytes = stream.read(size)
+        if len(payload) < size:
+            return list(), None
+
+    frames: list[dict] = list()
+    world: dict | None = None
+
+    for line in zlib.decompress(payload).splitlines():
+        frame: dict = json.loads(line)
+
+        if frames:
+            frames.append(frame)
+            continue
+
+        # Fast forward without returning anything until the start.
+        if "world" in frame:
+            world = frame["world"]
+        else:
+            apply_frame({world["world_id"]: world}, _world_delta(world["world_id"], frame["delta"]))
+
+        if frame["ts"] >= start:
+            frames.append({"ts": frame["ts"], "world": world})
+
+    return frames, offset + BLOCK_HEADER.size + size
+
+
+def _world_delta(world_id: int, delta: dict) -> dict:
+    return {"type": "delta", "worlds": {str(world_id): delta}, "removed_worlds": []}
+
+
+def _replay_frames(frames: list[dict], worlds: dict[int, dict]) -> Iterator[tuple[float, dict, dict | None]]:
+    for frame in frames:
+        if "world" in frame:
+            world: dict = frame["world"]
+            worlds.clear()
+            worlds[world["world_id"]] = world
+            yield frame["ts"], world, None
+        else:
+            world_id, world = next(iter(worlds.items()))
+            apply_frame(worlds, _world_delta(world_id, frame["delta"]))
+            yield frame["ts"], world, frame["delta"]
+
+
+def read_recording(directory: str, recording_id: str, start: float = 0) -> Iterator[tuple[float, dict, dict | None]]:
+    """
+    Decodes a recording one block at a time, starting from the state at a unix time.
+
+    :param directory: Directory of the recordings.
+    :param recording_id: ID of a recording that exists.
+    :param start: Unix time to start from.
+    :return: The (unix time, world state, world delta) of every frame from the start. The delta is None for keyframes,
+        and the first frame is always a keyframe. The world state is updated in place from frame to frame.
+    """
+    offset: int | None = find_recording_block(directory, recording_id, start)
+    worlds: dict[int, dict] = dict()
+
+    while offset is not None:
+        frames, offset = read_recording_block(directory, recording_id, offset, start)
+        yield from _replay_frames(frames, worlds)
+
+
+async def read_recording_async(
+    directory: str,
+    recording_id: str,
+    start: float = 0
+) -> AsyncIterator[tuple[float, dict, dict | None]]:
+    """
+    `read_recording`, reading and decoding each block on the event loop's default executor so replays never stall the
+    event loop on disk, decompression or JSON parsing.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    offset: int | None = await loop.run_in_executor(None, find_recording_block, directory, recording_id, start)
+    worlds: dict[int, dict] = dict()
+
+    while offset is not None:
+        frames, offset = await loop.run_in_executor(None, read_recording_block, directory, recording_id, offset, start)
+
+        for frame in _replay_frames(frames, worlds):
+            yield frame
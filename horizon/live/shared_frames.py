@@ -0,0 +1,289 @@
+"""
+Sharing live frames between the worker processes of one host. Only one process, the owner, can run the tracker server
+that the game servers connect to. It encodes every broadcast once and publishes the encoded frames into a shared memory
+ring, and every other worker hands the latest frames from the ring to its own websocket clients, without parsing the
+world state or encoding frames again unless a client needs a view the owner did not publish.
+
+The owner is whichever process holds an exclusive lock on a lock file. The lock is released by the operating system
+when the owner exits, so a reader that later acquires it takes over as the owner.
+
+Ring layout, little-endian:
+    header  magic "UYAR", latest seq (u64), slot count (u32), slot size (u32)
+    slots   slot count x (SLOT_HEADER: seqlock marker (u64), length (u32), unix timestamp (f64); slot size data bytes)
+
+Frame n is written to slot n % slot count. Its marker is 2n + 1 while it is written and 2n + 2 once it is complete, so
+a reader that sees the same complete marker before and after using a frame knows what it used is consistent.
+
+The data of a frame is a section count (u8), the length of each section (u32) and the sections. A broadcast is
+published as four sections: FRAME_INFO (broadcast seq (u64), seq of the previous broadcast (u64), keyframe flag (u8)),
+the full mode frame, the delta mode frame against the previous broadcast (empty for keyframes) and the binary frame,
+all of every world.
+"""
+import logging
+import os
+import struct
+import tempfile
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from horizon.live.frames import FULL_MODE, DELTA_MODE, BINARY_MODE, LiveFrameSet
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks, as on Windows. Every process runs as its own owner.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+stream_handler = logging.StreamHandler()
+stream_handler.setLevel(logging.DEBUG)
+formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+stream_handler.setFormatter(formatter)
+logger.addHandler(stream_handler)
+
+
+MAGIC: bytes = b"UYAR"
+HEADER: struct.Struct = struct.Struct("<4sQII")
+SLOT_HEADER: struct.Struct = struct.Struct("<QId")
+LATEST_SEQ: struct.Struct = struct.Struct("<Q")
+LATEST_SEQ_OFFSET: int = 4
+SECTION_COUNT: struct.Struct = struct.Struct("<B")
+SECTION_LENGTH: struct.Struct = struct.Struct("<I")
+FRAME_INFO: struct.Struct = struct.Struct("<QQB")
+
+
+class SharedFrame:
+    """
+    A frame read from the ring. Its sections are memoryviews straight into shared memory, so they are only consistent
+    while `valid` is True, and must be released before the ring is closed.
+    """
+
+    __slots__ = ("seq", "timestamp", "sections", "_ring", "_offset", "_marker")
+
+    def __init__(
+        self,
+        ring: "SharedFrameRing",
+        seq: int,
+        timestamp: float,
+        sections: tuple[memoryview, ...],
+        offset: int,
+        marker: int
+    ):
+        self.seq: int = seq
+        self.timestamp: float = timestamp
+        self.sections: tuple[memoryview, ...] = sections
+        self._ring: SharedFrameRing = ring
+        self._offset: int = offset
+        self._marker: int = marker
+
+    @property
+    def valid(self) -> bool:
+        """
+        True while the frame's slot has not started being overwritten.
+        """
+        return SLOT_HEADER.unpack_from(self._ring._buffer, self._offset)[0] == self._marker
+
+    def release(self) -> None:
+        for section in self.sections:
+            section.release()
+        self.sections = ()
+
+
+class SharedFrameRing:
+    """
+    A seqlock ring of frames in named shared memory. The segment outlives its processes and is reused on restart.
+    """
+
+    def __init__(self, name: str, slot_count: int = 4, slot_size: int = 2 * 1024 * 1024):
+        """
+        Creates the named segment, or attaches to it if it already exists, in which case its own geometry is used.
+
+        :param name: Name of the shared memory segment.
+        :param slot_count: Number of frames kept.
+        :param slot_size: Maximum size of a frame in bytes.
+        """
+        try:
+            self._memory: SharedMemory = SharedMemory(
+                name, create=True, size=HEADER.size + slot_count * (SLOT_HEADER.size + slot_size)
+            )
+            HEADER.pack_into(self._memory.buf, 0, MAGIC, 0, slot_count, slot_size)
+        except FileExistsError:
+            self._memory = SharedMemory(name)
+
+        # The resource tracker would unlink the segment when this process exits, pulling it out from under the others.
+        resource_tracker.unregister(self._memory._name, "shared_memory")
+
+        self._buffer: memoryview = self._memory.buf
+
+    def _geometry(self) -> tuple[int, int] | None:
+        magic, _, slot_count, slot_size = HEADER.unpack_from(self._buffer)
+        return (slot_count, slot_size) if magic == MAGIC else None
+
+    def _slot_offset(self, seq: int, slot_count: int, slot_size: int) -> int:
+        return HEADER.size + (seq % slot_count) * (SLOT_HEADER.size + slot_size)
+
+    def latest_seq(self) -> int:
+        return LATEST_SEQ.unpack_from(self._buffer, LATEST_SEQ_OFFSET)[0]
+
+    def publish(self, timestamp: float, *sections: bytes) -> bool:
+        """
+        Writes a frame to the ring. Must only be called by the owner.
+
+        :param timestamp: Unix time of the frame.
+        :param sections: The frame's sections.
+        :return: False if the frame is larger than a slot and was not published.
+        """
+        slot_count, slot_size = self._geometry()
+        length: int = SECTION_COUNT.size + len(sections) * SECTION_LENGTH.size + sum(len(section) for section in sections)
+        if length > slot_size:
+            logger.warning(f"publish: Frame of {length} bytes exceeds the {slot_size} byte slot size, skipped.")
+            return False
+
+        seq: int = self.latest_seq() + 1
+        offset: int = self._slot_offset(seq, slot_count, slot_size)
+
+        SLOT_HEADER.pack_into(self._buffer, offset, 2 * seq + 1, length, timestamp)
+
+        position: int = offset + SLOT_HEADER.size
+        SECTION_COUNT.pack_into(self._buffer, position, len(sections))
+        position += SECTION_COUNT.size
+        for section in sections:
+            SECTION_LENGTH.pack_into(self._buffer, position, len(section))
+            position += SECTION_LENGTH.size
+        for section in sections:
+            self._buffer[position:position + len(section)] = section
+            position += len(section)
+
+        SLOT_HEADER.pack_into(self._buffer, offset, 2 * seq + 2, length, timestamp)
+        LATEST_SEQ.pack_into(self._buffer, LATEST_SEQ_OFFSET, seq)
+        return True
+
+    def read(self, seq: int) -> SharedFrame | None:
+        """
+        :return: The frame, with its sections viewed in place, or None if it is not complete or was already
+            overwritten.
+        """
+        geometry: tuple[int, int] | None = self._geometry()
+        if geometry is None or seq == 0:
+            return None
+
+        offset: int = self._slot_offset(seq, *geometry)
+        marker, length, timestamp = SLOT_HEADER.unpack_from(self._buffer, offset)
+        if marker != 2 * seq + 2 or length > geometry[1]:
+            return None
+
+        data: memoryview = self._buffer[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + length]
+
+        try:
+            section_count, = SECTION_COUNT.unpack_from(data)
+            lengths: tuple[int, ...] = struct.unpack_from(f"<{section_count}I", data, SECTION_COUNT.size)
+        except struct.error:
+            data.release()
+            return None
+
+        position: int = SECTION_COUNT.size + section_count * SECTION_LENGTH.size
+        sections: list[memoryview] = list()
+        for section_length in lengths:
+            sections.append(data[position:position + section_length])
+            position += section_length
+        data.release()
+
+        frame: SharedFrame = SharedFrame(self, seq, timestamp, tuple(sections), offset, marker)
+        if position > length or not frame.valid:
+            frame.release()
+            return None
+        return frame
+
+    def close(self) -> None:
+        self._buffer.release()
+        self._memory.close()
+
+
+class OwnerLock:
+    """
+    A non-blocking exclusive lock on a file, held for the lifetime of the owner process.
+    """
+
+    def __init__(self, name: str):
+        self._path: str = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._stream = None
+
+    def acquire(self) -> bool:
+        """
+        :return: True if this process holds the lock.
+        """
+        if self._stream is not None or fcntl is None:
+            return True
+
+        stream = open(self._path, "a")
+        try:
+            fcntl.flock(stream, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            stream.close()
+            return False
+
+        self._stream = stream
+        return True
+
+
+def publish_frame_set(ring: SharedFrameRing, frame_set: LiveFrameSet, previous: LiveFrameSet | None) -> bool:
+    """
+    Encodes a broadcast of every world in each mode and publishes it to the ring.
+
+    :param ring: The shared frame ring.
+    :param frame_set: The broadcast.
+    :param previous: The broadcast before it, which its delta frame is against.
+    :return: False if the frames did not fit in a slot.
+    """
+    delta: bytes = b""
+    if previous is not None and not frame_set.is_keyframe:
+        delta = frame_set.encode(DELTA_MODE, base=previous).encode()
+
+    return ring.publish(
+        frame_set.timestamp,
+        FRAME_INFO.pack(frame_set.seq, previous.seq if previous is not None else 0, frame_set.is_keyframe),
+        frame_set.dump.encode(),
+        delta,
+        frame_set.encode(BINARY_MODE)
+    )
+
+
+def read_frame_set(ring: SharedFrameRing, seq: int) -> LiveFrameSet | None:
+    """
+    Reads a broadcast published with `publish_frame_set`. Its full, binary and delta frames of every world are
+    the owner's, the world state is only parsed if a client needs another view.
+
+    :return: The broadcast or None if it is not complete, was overwritten while it was read or is not a broadcast.
+    """
+    frame: SharedFrame | None = ring.read(seq)
+    if frame is None:
+        return None
+
+    try:
+        if len(frame.sections) != 4 or len(frame.sections[0]) != FRAME_INFO.size:
+            return None
+
+        info, full, delta, binary = frame.sections
+        broadcast_seq, base_seq, is_keyframe = FRAME_INFO.unpack(info)
+
+        # Text frames have to be str to be sent, and binary frames are kept after the slot is reused, so each is
+        # copied once per worker, then checked against the seqlock.
+        dump: str = str(full, "utf-8")
+        delta_frame: str | None = str(delta, "utf-8") if len(delta) else None
+        binary_frame: bytes = bytes(binary)
+
+        if not frame.valid:
+            return None
+    except UnicodeDecodeError:
+        return None
+    finally:
+        frame.release()
+
+    frame_set: LiveFrameSet = LiveFrameSet(broadcast_seq, frame.timestamp, dump, None, bool(is_keyframe))
+    frame_set.add_encoding(FULL_MODE, dump)
+    frame_set.add_encoding(BINARY_MODE, binary_frame)
+    if delta_frame is not None:
+        frame_set.add_encoding(DELTA_MODE, delta_frame, base_seq)
+
+    return frame_set
@@ -0,0 +1,185 @@
+"""
+A stand-in for the live tracker server that generates matches instead of receiving them from game servers. It is
+used when uya.live_tracker_simulated is set, and by the live tracker load test.
+"""
+import asyncio
+import json
+import os
+import random
+from datetime import datetime
+
+
+with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), "parsing", "uya_live_map_boundaries.json")) as stream:
+    MAP_BOUNDARIES: dict[str, dict[str, int]] = json.load(stream)
+
+GAME_MODES: tuple[str, ...] = ("CTF", "Siege", "Deathmatch")
+TEAMS: tuple[str, ...] = ("blue", "red", "green", "orange", "yellow", "purple", "aqua", "pink")
+WEAPONS: tuple[str, ...] = ("N60", "Blitz", "Flux", "Rocket", "Grav", "Mine", "Lava", "Morph", "Wrench")
+UPGRADES: tuple[str, ...] = ("flux", "blitz", "grav")
+
+
+class SimulatedLiveTrackerServer:
+    """
+    Simulates a number of concurrent matches. Every tick players move, turn, switch weapons, take damage and kill each
+    other, and every match ends after its duration and is replaced by a new one in a new world.
+    """
+
+    def __init__(
+        self,
+        worlds: int = 4,
+        players_per_world: int = 8,
+        tick_rate: int = 10,
+        match_duration: float = 600,
+        seed: int | None = None
+    ):
+        """
+        :param worlds: Number of concurrent matches.
+        :param players_per_world: Players in each match.
+        :param tick_rate: Simulation ticks per second.
+        :param match_duration: Seconds each match lasts.
+        :param seed: Random seed, for reproducible runs.
+        """
+        self._world_count: int = worlds
+        self._players_per_world: int = players_per_world
+        self._tick_interval: float = 1 / tick_rate
+        self._match_duration: float = match_duration
+        self._random: random.Random = random.Random(seed)
+
+        self._next_world_id: int = 1
+        self._worlds: dict[int, dict] = dict()
+        self._match_ticks: dict[int, int] = dict()
+        self._dump: str | None = None
+
+        for _ in range(worlds):
+            self._start_match()
+
+        # Stagger the matches so they don't all end at once.
+        for world_id in self._match_ticks:
+            self._match_ticks[world_id] = self._random.randrange(max(int(match_duration / self._tick_interval), 1))
+
+    def _start_match(self) -> None:
+        world_id: int = self._next_world_id
+        self._next_world_id += 1
+
+        game_map: str = self._random.choice(list(MAP_BOUNDARIES))
+        game_mode: str = self._random.choice(GAME_MODES)
+        teams: int = 2 if game_mode != "Deathmatch" else self._players_per_world
+
+        self._worlds[world_id] = {
+            "world_id": world_id,
+            "world_latest_update": str(datetime.now()),
+            "players": [
+                self._new_player(player_id, game_map, TEAMS[player_id % teams])
+                for player_id in range(self._players_per_world)
+            ],
+            "events": [],
+            "map": game_map,
+            "name": f"Simulated {world_id}",
+            "game_mode": game_mode,
+        }
+        self._match_ticks[world_id] = 0
+
+    def _new_player(self, player_id: int, game_map: str, team: str) -> dict:
+        return {
+            "player_id": player_id,
+            "account_id": self._random.randint(1, 200_000),
+            "team": team,
+            "username": f"Sim{self._random.randint(1, 99_999)}",
+            "coord": self._random_coord(game_map),
+            "cam_x": self._random.randint(0, 255),
+            "weapon": self._random.choice(WEAPONS),
+            "upgrades": {upgrade: {"upgrade": "V1", "kills": 0} for upgrade in UPGRADES},
+            "flag": None,
+            "health": 15,
+            "total_kills": 0,
+            "total_deaths": 0,
+            "total_suicides": 0,
+            "total_flags": 0,
+        }
+
+    def _random_coord(self, game_map: str) -> tuple[float, float, float]:
+        bounds: dict[str, int] = MAP_BOUNDARIES[game_map]
+        return (
+            round(self._random.uniform(bounds["xmin"], bounds["xmax"]), 2),
+            round(self._random.uniform(bounds["ymin"], bounds["ymax"]), 2),
+            round(self._random.uniform(0, 2_000), 2),
+        )
+
+    def step(self) -> None:
+        """
+        Advances every match by one tick.
+        """
+        for world_id in list(self._worlds):
+            self._match_ticks[world_id] += 1
+
+            if self._match_ticks[world_id] * self._tick_interval >= self._match_duration:
+                del self._worlds[world_id]
+                del self._match_ticks[world_id]
+                self._start_match()
+                continue
+
+            self._step_world(self._worlds[world_id])
+
+        self._dump = None
+
+    def _step_world(self, world: dict) -> None:
+        bounds: dict[str, int] = MAP_BOUNDARIES[world["map"]]
+        players: list[dict] = world["players"]
+
+        for player in players:
+            # Most players move every tick, a few stand still.
+            if self._random.random() < 0.8:
+                x, y, z = player["coord"]
+                player["coord"] = (
+                    round(min(max(x + self._random.uniform(-150, 150), bounds["xmin"]), bounds["xmax"]), 2),
+                    round(min(max(y + self._random.uniform(-150, 150), bounds["ymin"]), bounds["ymax"]), 2),
+                    round(min(max(z + self._random.uniform(-20, 20), 0), 2_000), 2),
+                )
+                player["cam_x"] = (player["cam_x"] + self._random.randint(-8, 8)) % 256
+
+            if self._random.random() < 0.02:
+                player["weapon"] = self._random.choice(WEAPONS)
+
+        if self._random.random() < 0.2:
+            victim: dict = self._random.choice(players)
+            victim["health"] = max(victim["health"] - self._random.randint(1, 5), 0)
+
+            if victim["health"] == 0:
+                killer: dict = self._random.choice(players)
+                victim["health"] = 15
+                victim["total_deaths"] += 1
+                victim["coord"] = self._random_coord(world["map"])
+
+                if killer is victim:
+                    killer["total_suicides"] += 1
+                else:
+                    killer["total_kills"] += 1
+                    upgrade: dict = killer["upgrades"][self._random.choice(UPGRADES)]
+                    upgrade["kills"] += 1
+                    upgrade["upgrade"] = f"V{min(upgrade['kills'] // 3 + 1, 8)}"
+
+        if world["game_mode"] == "CTF" and self._random.random() < 0.01:
+            carrier: dict = self._random.choice(players)
+            if carrier["flag"] is None:
+                carrier["flag"] = "red" if carrier["team"] == "blue" else "blue"
+            else:
+                carrier["flag"] = None
+                carrier["total_flags"] += 1
+
+        world["world_latest_update"] = str(datetime.now())
+
+    async def start(self) -> None:
+        asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            self.step()
+            await asyncio.sleep(self._tick_interval)
+
+    def dump(self) -> str:
+        """
+        :return: Every world as JSON, in the shape of the tracker server's dump.
+        """
+        if self._dump is None:
+            self._dump = json.dumps(list(self._worlds.values()))
+        return self._dump
@@ -0,0 +1,88 @@
+"""
+Subscriptions let a live tracker client choose what it is sent by sending a JSON message over the websocket:
+
+    {"type": "subscribe", "world_ids": [12, 15], "rate": 2, "fields": ["coord", "health", "username"]}
+
+Each key is optional:
+    world_ids  Worlds to send. Worlds not listed are left out. Omitted or null means every world.
+    rate       Maximum frames per second, capped at the server's write tick rate. Omitted or null means the tick rate.
+    fields     World and player fields to send. world_id, player_id and players are always sent. Omitted or null
+               means every field. Binary frames have a fixed layout and ignore the projection.
+
+A new subscription replaces the previous one and is answered with a keyframe of the subscribed view.
+"""
+from typing import NamedTuple
+
+
+SUBSCRIBE_MESSAGE_TYPE: str = "subscribe"
+
+# Fields kept by every projection, needed to tell worlds and players apart.
+REQUIRED_FIELDS: frozenset[str] = frozenset(("world_id", "player_id", "players"))
+
+
+class LiveSubscription(NamedTuple):
+    world_ids: frozenset[int] | None = None
+    fields: frozenset[str] | None = None
+    rate: float | None = None
+
+    @property
+    def signature(self) -> tuple[frozenset[int] | None, frozenset[str] | None]:
+        """
+        What the subscription selects. Clients with the same signature are sent the same frames, whatever their rate.
+        """
+        return self.world_ids, self.fields
+
+
+ALL_WORLDS: LiveSubscription = LiveSubscription()
+
+
+def parse_subscription(message: any, max_rate: float) -> LiveSubscription:
+    """
+    :param message: A decoded subscribe message.
+    :param max_rate: Highest rate a client may ask for, in frames per second.
+    :return: The subscription.
+    :raises ValueError: If the message is not a valid subscribe message.
+    """
+    if not isinstance(message, dict) or message.get("type") != SUBSCRIBE_MESSAGE_TYPE:
+        raise ValueError(f"Expected a '{SUBSCRIBE_MESSAGE_TYPE}' message.")
+
+    world_ids: list | None = message.get("world_ids")
+    if world_ids is not None and (
+        not isinstance(world_ids, list) or not all(isinstance(world_id, int) for world_id in world_ids)
+    ):
+        raise ValueError("world_ids must be a list of integers.")
+
+    fields: list | None = message.get("fields")
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(field, str) for field in fields)):
+        raise ValueError("fields must be a list of strings.")
+
+    rate: float | None = message.get("rate")
+    if rate is not None and (isinstance(rate, bool) or not isinstance(rate, (int, float)) or rate <= 0):
+        raise ValueError("rate must be a positive number.")
+
+    return LiveSubscription(
+        world_ids=None if world_ids is None else frozenset(world_ids),
+        fields=None if fields is None else frozenset(fields) | REQUIRED_FIELDS,
+        rate=None if rate is None or rate >= max_rate else float(rate)
+    )
+
+
+def project_worlds(worlds: dict[int, dict], subscription: LiveSubscription) -> dict[int, dict]:
+    """
+    :return: The subscribed worlds with only the subscribed fields.
+    """
+    if subscription.world_ids is not None:
+        worlds = {world_id: world for world_id, world in worlds.items() if world_id in subscription.world_ids}
+
+    fields: frozenset[str] | None = subscription.fields
+    if fields is None:
+        return worlds
+
+    return {
+        world_id: {
+            key: [{field: value for field, value in player.items() if field in fields} for player in value]
+            if key == "players" else value
+            for key, value in world.items() if key in fields
+        }
+        for world_id, world in worlds.items()
+    }
@@ -14,9 +14,12 @@ from app.utils.query_helpers import (
     update_player_vanilla_stats_async,
     update_uya_gamehistory_async,
     check_uya_gamehistory_exists_async,
-    get_uya_gamehistory_and_player_stats_async,
     get_uya_player_name_async
 )
+from app.utils.leaderboards import refresh_leaderboard_ranks_async
+from app.utils.leaderboard_engine import uya_leaderboard_engine, dl_leaderboard_engine
+from app.utils.player_registry import uya_player_registry
+from app.utils.response_cache import leaderboard_page_cache
 from horizon.middleware_api import (
     get_players_online, 
     authenticate_async, 
@@ -30,6 +33,7 @@ from horizon.parsing.uya_game import (
     uya_time_parser, 
     uya_gamemode_parser
 )
+from horizon.parsing.uya_game_record import UyaGameRecord
 from app.schemas.schemas import (
     UyaPlayerOnlineSchema,
     UyaGameOnlineSchema,
@@ -46,20 +50,27 @@ stream_handler.setFormatter(formatter)
 logger.addHandler(stream_handler)
 
 class UyaOnlineTracker:
-    def __init__(self, players_online_poll_interval:int=60, token_poll_interval:int=3600, recent_stats_poll_interval:int=120, recent_games_poll_interval:int=120):
+    def __init__(self, players_online_poll_interval:int=60, token_poll_interval:int=3600, recent_stats_poll_interval:int=120, recent_games_poll_interval:int=120, leaderboard_refresh_interval:int=300):
         """
         Class to manager all middleware calls and polling.
 
         :param players_online_poll_interval: Interval time in seconds to poll the players online API
         :param token_poll_interval: Interval time in seconds to refresh the token
+        :param leaderboard_refresh_interval: Interval time in seconds to rebuild the leaderboard engine and refresh the precomputed leaderboards after stats change
         """
         self._players_online_poll_interval = players_online_poll_interval
         self._token_poll_interval = token_poll_interval
         self._recent_stats_poll_interval = recent_stats_poll_interval
         self._recent_games_poll_interval = recent_games_poll_interval
+        self._leaderboard_refresh_interval = leaderboard_refresh_interval
+        self._leaderboards_stale = True
         self._players_online = []
         self._games_online = []
 
+        # GameId -> (hash of the game's Metadata and GenericField3, decoded map, game mode, game type and time limit).
+        # Only games in the current online list are kept.
+        self._game_descriptors: dict[int, tuple[int, dict[str, str | int]]] = dict()
+
         self._protocol: str = CREDENTIALS["uya"]["horizon_middleware_protocol"]
         self._host: str = CREDENTIALS["uya"]["horizon_middleware_host"]
         self._horizon_app_id: int = CREDENTIALS["uya"]["horizon_app_id_ntsc"]
@@ -86,33 +97,59 @@ class UyaOnlineTracker:
 
         # Process each game
         for game in self._games_online:
-            game_metadata = json.loads(game["Metadata"]) if "Metadata" in game.keys() and game["Metadata"] else {}
             game_players = list(filter(lambda _player: _player["GameId"] is not None and _player["GameId"] == game["GameId"], self._players_online))
-
-            if "CustomMap" in game_metadata.keys() and game_metadata["CustomMap"] != None:
-                map = game_metadata["CustomMap"]
-            else:
-                map = uya_map_parser(game["GenericField3"], game_metadata)
-
-            game_mode, game_type = uya_gamemode_parser(game["GenericField3"])
-
-            timelimit = uya_time_parser(game["GenericField3"])
+            descriptor: dict[str, str | int] = self._get_game_descriptor(game)
 
             games.append(UyaGameOnlineSchema(
                 id=int(game["GameId"]),
                 name=game["GameName"][0:15].strip(),
                 game_status=game["WorldStatus"],
-                map=map,
+                map=descriptor["map"],
                 time_started=game["GameStartDt"][:26] if game["WorldStatus"] == "WorldActive" and game["GameStartDt"] is not None else "Not yet started",
-                time_limit=timelimit,
-                game_mode=game_mode,
-                game_type=game_type,
+                time_limit=descriptor["time_limit"],
+                game_mode=descriptor["game_mode"],
+                game_type=descriptor["game_type"],
                 last_updated=str(datetime.now()),
                 players=[UyaPlayerOnlineSchema(username=player["AccountName"]) for player in game_players]
             ))
 
         return deepcopy(games)
 
+    def _get_game_descriptor(self, game: dict) -> dict[str, str | int]:
+        """
+        Decodes a game's map, game mode, game type and time limit from its Metadata and GenericField3. A game's metadata
+        rarely changes between polls, so the decoded values are cached by GameId and only decoded again when the raw
+        fields change.
+        """
+        payload_hash: int = hash((game.get("Metadata"), game["GenericField3"]))
+        cached: tuple[int, dict[str, str | int]] | None = self._game_descriptors.get(game["GameId"])
+        if cached is not None and cached[0] == payload_hash:
+            return cached[1]
+
+        game_metadata = json.loads(game["Metadata"]) if "Metadata" in game.keys() and game["Metadata"] else {}
+
+        if "CustomMap" in game_metadata.keys() and game_metadata["CustomMap"] != None:
+            map = game_metadata["CustomMap"]
+        else:
+            map = uya_map_parser(game["GenericField3"], game_metadata)
+
+        game_mode, game_type = uya_gamemode_parser(game["GenericField3"])
+
+        descriptor: dict[str, str | int] = {
+            "map": map,
+            "game_mode": game_mode,
+            "game_type": game_type,
+            "time_limit": uya_time_parser(game["GenericField3"])
+        }
+        self._game_descriptors[game["GameId"]] = (payload_hash, descriptor)
+        return descriptor
+
+    def _evict_game_descriptors(self) -> None:
+        # Drop the decoded values of games that have left the online list
+        game_ids: set[int] = {game["GameId"] for game in self._games_online}
+        for game_id in [game_id for game_id in self._game_descriptors if game_id not in game_ids]:
+            del self._game_descriptors[game_id]
+
     async def refresh_token(self) -> None:
         # Periodically refresh token so we don't get 401
         while True:
@@ -136,6 +173,7 @@ class UyaOnlineTracker:
             try:
                 self._players_online: list[dict] = await get_players_online(self._protocol, self._host, self._token)
                 self._games_online: list[dict] = await get_active_games(self._protocol, self._host, self._token)
+                self._evict_game_descriptors()
             except Exception as e:
                 logger.error("[uya] poll_active_online failed to update!", exc_info=True)
 
@@ -162,12 +200,42 @@ class UyaOnlineTracker:
 
                             # Doesn't block the entire backend while updating DB with this players new stats
                             logger.debug(f"[uya] update_live_stats: updating {horizon_account_id}, {stats}")
-                            await update_player_vanilla_stats_async("uya", session, horizon_account_id, stats, self._protocol, self._host, self._horizon_app_id, self._token)
+                            username = await update_player_vanilla_stats_async("uya", session, horizon_account_id, stats, self._protocol, self._host, self._horizon_app_id, self._token)
+
+                            if username is not None:
+                                uya_leaderboard_engine.update_player(horizon_account_id, username, stats)
+
+                        self._leaderboards_stale = True
+                        leaderboard_page_cache.bump("uya")
             except Exception as e:
                 logger.error("[uya] update_recent_stat_changes failed to update!", exc_info=True)
 
             await asyncio.sleep(self._recent_stats_poll_interval)
 
+    async def refresh_leaderboards(self) -> None:
+        while True:
+            # Rebuild the leaderboard engine on every refresh so stats written by other processes are picked up
+            try:
+                async with SessionLocalAsync() as session:
+                    await uya_leaderboard_engine.rebuild_async(session)
+                leaderboard_page_cache.bump("uya")
+            except Exception as e:
+                logger.error("[uya] refresh_leaderboards failed to rebuild the leaderboard engine!", exc_info=True)
+
+            # Rebuild the precomputed leaderboards whenever stats were ingested since the last refresh. They are only
+            # read while the engine is not current, so they are left stale until then.
+            try:
+                if self._leaderboards_stale and not uya_leaderboard_engine.current:
+                    self._leaderboards_stale = False
+                    async with SessionLocalAsync() as session:
+                        await refresh_leaderboard_ranks_async("uya", session)
+                    leaderboard_page_cache.bump("uya")
+            except Exception as e:
+                self._leaderboards_stale = True
+                logger.error("[uya] refresh_leaderboards failed to update!", exc_info=True)
+
+            await asyncio.sleep(self._leaderboard_refresh_interval)
+
 
     async def update_recent_game_history(self) -> None:
         while True:
@@ -185,29 +253,31 @@ class UyaOnlineTracker:
                             # if it doesn't, we want to wait for the below command to finish, and then post webhook
                             #await self.post_webhook(recent_game, session)
 
-                            if await check_uya_gamehistory_exists_async(deepcopy(recent_game), session):
+                            if await check_uya_gamehistory_exists_async(recent_game, session):
                                 continue
                             else:
-                                await update_uya_gamehistory_async(deepcopy(recent_game), session)
+                                # Decode the game once and share it between ingest and the webhook
+                                game_record: UyaGameRecord = UyaGameRecord(recent_game)
+                                await update_uya_gamehistory_async(game_record, session)
                                 # Post webhook
-                                await self.post_webhook(recent_game, session)
+                                await self.post_webhook(game_record, session)
             except Exception as e:
                 logger.error("[uya] update_recent_game_history failed to update!", exc_info=True)
 
             await asyncio.sleep(self._recent_games_poll_interval)
     
-    async def post_webhook(self, recent_game, session):
-        gamehistory, playerstats = await get_uya_gamehistory_and_player_stats_async(deepcopy(recent_game), session)
+    async def post_webhook(self, gamehistory: UyaGameRecord, session):
+        playerstats: dict[int, dict[str, int | bool]] = gamehistory.player_stats
 
         # Don't post webhook 
         if len(playerstats) <= 1:
             return
 
         playerfull = []
-        for player in playerstats:
+        for player_id, player in playerstats.items():
             # Get their username
             this_player = {"username": "UNKNOWN", "stats": player}
-            this_player["username"] = await get_uya_player_name_async(player.player_id, session)
+            this_player["username"] = uya_player_registry.username(player_id) or await get_uya_player_name_async(player_id, session)
             this_player["username"] = this_player["username"][:7]
             if this_player["username"].startswith("CPU-"):
                 return
@@ -237,7 +307,7 @@ class UyaOnlineTracker:
         ### Add win/loss
         data = []
         for player in playerfull:
-            data.append([player["username"], 'Win' if player["stats"].win else 'Loss'])
+            data.append([player["username"], 'Win' if player["stats"]["win"] else 'Loss'])
         data = list(sorted(data, key=lambda x: '0' + x[0] if x[1] == 'Win' else '1' + x[0]))
         data.insert(0, ["Player", "Win?"])
 
@@ -248,7 +318,7 @@ class UyaOnlineTracker:
         ### Add K/D
         data = []
         for player in playerfull:
-            data.append([player["username"], 'Win' if player["stats"].win else 'Loss', player["stats"].kills, player["stats"].deaths])
+            data.append([player["username"], 'Win' if player["stats"]["win"] else 'Loss', player["stats"]["kills"], player["stats"]["deaths"]])
         data = list(sorted(data, key=lambda x: '0' + x[0] if x[1] == 'Win' else '1' + x[0]))
         for d in data:
             d.pop(1)
@@ -260,7 +330,7 @@ class UyaOnlineTracker:
         data = []
         if gamehistory.game_mode == 'CTF':
             for player in playerfull:
-                data.append([player["username"], 'Win' if player["stats"].win else 'Loss', player["stats"].base_dmg, player["stats"].flag_captures])
+                data.append([player["username"], 'Win' if player["stats"]["win"] else 'Loss', player["stats"]["base_dmg"], player["stats"]["flag_captures"]])
             data = list(sorted(data, key=lambda x: '0' + x[0] if x[1] == 'Win' else '1' + x[0]))
 
             for d in data:
@@ -270,7 +340,7 @@ class UyaOnlineTracker:
 
         elif gamehistory.game_mode == 'Siege':
             for player in playerfull:
-                data.append([player["username"], 'Win' if player["stats"].win else 'Loss', player["stats"].base_dmg, player["stats"].nodes])
+                data.append([player["username"], 'Win' if player["stats"]["win"] else 'Loss', player["stats"]["base_dmg"], player["stats"]["nodes"]])
             data = list(sorted(data, key=lambda x: '0' + x[0] if x[1] == 'Win' else '1' + x[0]))
 
             for d in data:
@@ -306,16 +376,19 @@ class UyaOnlineTracker:
 
 
 class DeadlockedOnlineTracker:
-    def __init__(self, players_online_poll_interval:int=60, token_poll_interval:int=3600, recent_stats_poll_interval:int=120):
+    def __init__(self, players_online_poll_interval:int=60, token_poll_interval:int=3600, recent_stats_poll_interval:int=120, leaderboard_refresh_interval:int=300):
         """
         Class to manager all middleware calls and polling.
 
         :param players_online_poll_interval: Interval time in seconds to poll the players online API
         :param token_poll_interval: Interval time in seconds to refresh the token
+        :param leaderboard_refresh_interval: Interval time in seconds to rebuild the leaderboard engine and refresh the precomputed leaderboards after stats change
         """
         self._players_online_poll_interval = players_online_poll_interval
         self._token_poll_interval = token_poll_interval
         self._recent_stats_poll_interval = recent_stats_poll_interval
+        self._leaderboard_refresh_interval = leaderboard_refresh_interval
+        self._leaderboards_stale = True
         self._players_online = []
         self._games_online = []
 
@@ -406,12 +479,42 @@ class DeadlockedOnlineTracker:
 
                             # Doesn't block the entire backend while updating DB with this players new stats
                             logger.debug(f"[dl] update_live_stats: updating {horizon_account_id}, {stats}")
-                            await update_player_vanilla_stats_async("dl", session, horizon_account_id, stats, self._protocol, self._host, self._horizon_app_id, self._token)
+                            username = await update_player_vanilla_stats_async("dl", session, horizon_account_id, stats, self._protocol, self._host, self._horizon_app_id, self._token)
+
+                            if username is not None:
+                                dl_leaderboard_engine.update_player(horizon_account_id, username, stats)
+
+                        self._leaderboards_stale = True
+                        leaderboard_page_cache.bump("dl")
             except Exception as e:
                 logger.error("[dl] update_recent_stat_changes failed to update!", exc_info=True)
 
             await asyncio.sleep(self._recent_stats_poll_interval)
 
+    async def refresh_leaderboards(self) -> None:
+        while True:
+            # Rebuild the leaderboard engine on every refresh so stats written by other processes are picked up
+            try:
+                async with SessionLocalAsync() as session:
+                    await dl_leaderboard_engine.rebuild_async(session)
+                leaderboard_page_cache.bump("dl")
+            except Exception as e:
+                logger.error("[dl] refresh_leaderboards failed to rebuild the leaderboard engine!", exc_info=True)
+
+            # Rebuild the precomputed leaderboards whenever stats were ingested since the last refresh. They are only
+            # read while the engine is not current, so they are left stale until then.
+            try:
+                if self._leaderboards_stale and not dl_leaderboard_engine.current:
+                    self._leaderboards_stale = False
+                    async with SessionLocalAsync() as session:
+                        await refresh_leaderboard_ranks_async("dl", session)
+                    leaderboard_page_cache.bump("dl")
+            except Exception as e:
+                self._leaderboards_stale = True
+                logger.error("[dl] refresh_leaderboards failed to update!", exc_info=True)
+
+            await asyncio.sleep(self._leaderboard_refresh_interval)
+
 
 uya_online_tracker = UyaOnlineTracker()
 dl_online_tracker = DeadlockedOnlineTracker()
\ No newline at end of file
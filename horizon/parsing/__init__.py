@@ -1,2 +1,2 @@
 from horizon.parsing.game import Game
-from horizon.parsing.game_rules import GameRules, WeaponRules, VehicleRules
+from horizon.parsing.game_rules import GameRules, WeaponRules, VehicleRules, parse_game_rules
@@ -1,7 +1,30 @@
-from horizon.parsing.game_rules import GameRules
+from functools import lru_cache
+
+from horizon.parsing.game_rules import GameRules, parse_game_rules
+
+
+@lru_cache(maxsize=1024)
+def _parse_player_list(player_list: str) -> tuple[int, ...]:
+    """
+    Parses a comma separated list of player IDs. Online games are listed again on every poll, so their player lists
+    repeat.
+    """
+    return tuple(int(player_id) for player_id in player_list.split(","))
 
 
 class Game:
+    __slots__ = (
+        "_id",
+        "_game_id",
+        "_app_id",
+        "_min_players",
+        "_max_players",
+        "_starting_players",
+        "_game_level",
+        "_game_name",
+        "_clan_war",
+        "_rules"
+    )
 
     def __init__(self, game_json: dict):
         self._id = int(game_json["Id"])
@@ -9,14 +32,14 @@ class Game:
         self._app_id = int(game_json["AppId"])
         self._min_players = int(game_json["MinPlayers"])
         self._max_players = int(game_json["MaxPlayers"])
-        self._starting_players = [int(player_id) for player_id in game_json["PlayerListStart"].split(",")]
+        self._starting_players = _parse_player_list(game_json["PlayerListStart"])
         self._game_level = int(game_json["GameLevel"])
 
         self._game_name = game_json["GameName"]
 
         self._clan_war = (game_json["GenericField7"] & 0x8000) != 0
 
-        self._rules = GameRules(game_json)
+        self._rules = parse_game_rules(game_json["GenericField6"])
 
     @property
     def id(self) -> int:
@@ -58,7 +81,7 @@ class Game:
         """
         List of player IDs for all starting players.
         """
-        return self._starting_players[:]
+        return list(self._starting_players)
 
     @property
     def game_level(self) -> int:
@@ -1,127 +1,144 @@
+from functools import lru_cache
 
 
-class WeaponRules:
+class _FieldRules:
+    """
+    Rules decoded from a game's GenericField6. Instances are shared between games through `parse_game_rules`, so they
+    are immutable, and compared and hashed by the field they were decoded from.
+    """
+    __slots__ = ("_field",)
+
+    def __init__(self, game: dict | int):
+        """
+        :param game: The game's JSON, or its GenericField6.
+        """
+        object.__setattr__(self, "_field", int(game["GenericField6"] if isinstance(game, dict) else game))
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self._field,)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self._field == other._field
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._field))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._field:#010x})"
 
-    def __init__(self, game_json: dict):
-        field: int = game_json["GenericField6"]
 
-        self._dual_vipers: bool = bool(field & 0x00000080)
-        self._magma_cannon: bool = bool(field & 0x00000100)
-        self._the_arbiter: bool = bool(field & 0x00000200)
-        self._fusion_rifle: bool = bool(field & 0x00000400)
-        self._hunter_mine_launcher: bool = bool(field & 0x00000800)
-        self._b6_obliterator: bool = bool(field & 0x00001000)
-        self._holoshield_launcher: bool = bool(field & 0x00002000)
-        self._scorpion_flail: bool = bool(field & 0x00040000)
+class WeaponRules(_FieldRules):
+    __slots__ = ()
 
     @property
     def dual_vipers(self) -> bool:
         """
         True if the Dual Vipers are available for the given game, otherwise False.
         """
-        return self._dual_vipers
+        return bool(self._field & 0x00000080)
 
     @property
     def magma_cannon(self) -> bool:
         """
         True if the Magma Cannon is available for the given game, otherwise False.
         """
-        return self._magma_cannon
+        return bool(self._field & 0x00000100)
 
     @property
     def the_arbiter(self) -> bool:
         """
         True if The Arbiter is available for the given game, otherwise False.
         """
-        return self._the_arbiter
+        return bool(self._field & 0x00000200)
 
     @property
     def fusion_rifle(self) -> bool:
         """
         True if the Fusion Rifle is available for the given game, otherwise False.
         """
-        return self._the_arbiter
+        return bool(self._field & 0x00000400)
 
     @property
     def hunter_mine_launcher(self) -> bool:
         """
         True if the Hunter Mine Launcher is available for the given game, otherwise False.
         """
-        return self._hunter_mine_launcher
+        return bool(self._field & 0x00000800)
 
     @property
     def b6_obliterator(self) -> bool:
         """
         True if the B6-Obliterator is available for the given game, otherwise False.
         """
-        return self._b6_obliterator
+        return bool(self._field & 0x00001000)
 
     @property
     def holoshield_launcher(self) -> bool:
         """
         True if the Holoshield Launcher is available for the given game, otherwise False.
         """
-        return self._holoshield_launcher
+        return bool(self._field & 0x00002000)
 
     @property
     def scorpion_flail(self) -> bool:
         """
         True if the Scorpion Flail is available for the given game, otherwise False.
         """
-        return self._scorpion_flail
+        return bool(self._field & 0x00040000)
 
 
-class VehicleRules:
-
-    def __init__(self, game_json: dict):
-        field: int = game_json["GenericField6"]
-
-        self._hoverbike: bool = bool(field & 0x00000001)
-        self._puma: bool = bool(field & 0x00000002)
-        self._hovership: bool = bool(field & 0x00000004)
-        self._landstalker: bool = bool(field & 0x00000008)
+class VehicleRules(_FieldRules):
+    __slots__ = ()
 
     @property
     def hoverbike(self) -> bool:
         """
         True if the Hoverbike is available for the given game, otherwise False.
         """
-        return self._hoverbike
+        return bool(self._field & 0x00000001)
 
     @property
     def puma(self) -> bool:
         """
         True if the Puma is available for the given game, otherwise False.
         """
-        return self._puma
+        return bool(self._field & 0x00000002)
 
     @property
     def hovership(self) -> bool:
         """
         True if the Hovership is available for the given game, otherwise False.
         """
-        return self._hovership
+        return bool(self._field & 0x00000004)
 
     @property
     def landstalker(self) -> bool:
         """
         True if the Landstalker is available for the given game, otherwise False.
         """
-        return self._landstalker
-
+        return bool(self._field & 0x00000008)
 
-class GameRules:
 
-    def __init__(self, game_json: dict):
+class GameRules(_FieldRules):
+    __slots__ = ("_weapons", "_vehicles")
 
-        self._chargeboots: bool = bool(game_json["GenericField6"] & 0x00200000)
-
-        self._weapons: WeaponRules = WeaponRules(game_json)
-        self._vehicles: VehicleRules = VehicleRules(game_json)
+    def __init__(self, game: dict | int):
+        """
+        :param game: The game's JSON, or its GenericField6.
+        """
+        super().__init__(game)
+        object.__setattr__(self, "_weapons", WeaponRules(self._field))
+        object.__setattr__(self, "_vehicles", VehicleRules(self._field))
 
     @property
     def chargeboots(self) -> bool:
-        return self._chargeboots
+        return bool(self._field & 0x00200000)
 
     @property
     def weapons(self) -> WeaponRules:
@@ -131,8 +148,17 @@ class GameRules:
         return self._weapons
 
     @property
-    def vehicles(self) -> WeaponRules:
+    def vehicles(self) -> VehicleRules:
         """
         List of vehicle rules.
         """
-        return self._weapons
+        return self._vehicles
+
+
+@lru_cache(maxsize=256)
+def parse_game_rules(generic_field_6: int) -> GameRules:
+    """
+    Decodes a game's rules from its GenericField6. Only a handful of rule combinations are played, so games share the
+    decoded rules of the same field.
+    """
+    return GameRules(generic_field_6)
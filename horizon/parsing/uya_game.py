@@ -1,4 +1,6 @@
-import struct
+from typing import Sequence
+
+import numpy as np
 
 
 MAP_BITMAP = {
@@ -50,14 +52,63 @@ WEAPONS = {
 }
 
 
-def try_parse_value(func, num):
-    # Function that ensures that if num is a negative integer, 
-    # the result falls within the corresponding positive range 
-    # of an unsigned 32-bit integer.
+UNKNOWN_MAP: str = "Unknown map!"
+UNKNOWN_TIME: str = "Unknown Time!"
+UNKNOWN_GAME_MODE: tuple[str, str] = ("Unkown Game Mode", "Unknown Game Type")
+
+# Generic Field 3 lookup tables. The map is the top 5 bits and the time limit the bottom 3 bits of the lowest byte.
+MAP_TABLE: tuple[str | None, ...] = tuple(MAP_BITMAP.get(format(index, "05b")) for index in range(32))
+TIME_TABLE: tuple[int, ...] = tuple(TIME_BITMAP[format(index, "03b")] for index in range(8))
+
+# The game mode is read from the upper 3 bytes taken in byte order (byte 1 as the most significant), giving a 24-bit
+# value whose bitmask string index i is bit 23 - i.
+MODE_SHIFT: int = 19
+TEAMS_BIT: int = 23 - SUBMODE_BITMAP["isTeams"]
+ATTRITION_BIT: int = 23 - SUBMODE_BITMAP["isAttrition"]
+
+
+def _game_mode(mode_bits: int, is_teams: bool, is_attrition: bool) -> tuple[str, str]:
+    game_mode: str = MODE_BITMAP.get(format(mode_bits, "02b"), "Unknown Game Mode")
+
+    if game_mode == MODE_BITMAP["00"]:
+        game_type = "Attrition" if is_attrition else "Normal"
+    elif game_mode == MODE_BITMAP["01"]:
+        game_type = "Chaos" if is_attrition else "Normal"
+    elif game_mode == MODE_BITMAP["10"]:
+        game_type = "Teams" if is_teams else "FFA"
+    else:
+        game_type = "Game Type Not Found"
+
+    return game_mode, game_type
+
+
+# Indexed by mode bits << 2 | teams bit << 1 | attrition bit.
+GAME_MODE_TABLE: tuple[tuple[str, str], ...] = tuple(
+    _game_mode(index >> 2, bool(index & 2), bool(index & 1)) for index in range(16)
+)
+
+# Weapon i is enabled when bit 7 - i of Player Skill Level is clear.
+WEAPON_BITS: tuple[tuple[str, int], ...] = tuple((WEAPONS[index], 1 << (7 - index)) for index in range(8))
+
+
+def _unsigned_32(value: int) -> int | None:
+    """
+    Reads a Generic Field 3 value as an unsigned 32-bit integer. Negative values are the signed reading of the same
+    bits and are wrapped around.
+
+    :return: The unsigned value or None if the value doesn't fit in 32 bits.
+    """
     try:
-        return func(num)
-    except:
-        return func(num+2**32)
+        number: int = value if type(value) is int else int(value)
+        if 0 <= number < 2**32:
+            return number
+
+        wrapped = value + 2**32
+        number = wrapped if type(wrapped) is int else int(wrapped)
+        return number if 0 <= number < 2**32 else None
+    except (TypeError, ValueError, OverflowError):
+        return None
+
 
 def uya_game_name_parser(game_name: str) -> str:
     return game_name[:15]
@@ -66,82 +117,40 @@ def uya_map_parser(generic_field_3: int, metadata: dict) -> str:
     if 'CustomMap' in metadata.keys() and metadata['CustomMap']:
         return metadata['CustomMap']
 
-    # Pass in Generic Field 3 (integer)
-    def internal_parser(raw_input) -> str:
-        """Accepts generic_field_3 INTEGER number (which is 4 a byte long hex string)"""
-        raw_int:int = int(raw_input) if type(raw_input) is not int else raw_input
-        raw_hex:str = struct.pack("<I", raw_int).hex()
-        first_byte_hex:str = raw_hex[0:2]
-        int_base_16:int = int(first_byte_hex,16)
-        bitmask:str = format(int_base_16, "#010b")[2:]
-        _game_map:str = bitmask[:5]
-        _game_map:str = MAP_BITMAP[_game_map]
-        return _game_map
+    value: int | None = _unsigned_32(generic_field_3)
+    if value is None:
+        return UNKNOWN_MAP
 
-    try:
-        game_map = try_parse_value(internal_parser, generic_field_3)
-    except:
-        game_map = "Unknown map!" 
-
-    return game_map
+    return MAP_TABLE[(value & 0xFF) >> 3] or UNKNOWN_MAP
 
 
 
 def uya_time_parser(generic_field_3: int) -> int:
-    # Pass in Generic Field 3 (integer)
-    def internal_parser(raw_input) -> str:
-        """Accepts generic_field_3 INTEGER number (which is 4 a byte long hex string)"""
-        raw_int:int = int(raw_input) if type(raw_input) is not int else raw_input
-        raw_hex:str = struct.pack("<I", raw_int).hex()
-        first_byte_hex:str = raw_hex[0:2]
-        int_base_16:int = int(first_byte_hex,16)
-        bitmask:str = format(int_base_16, "#010b")[2:]
-        game_time:str = bitmask[5:]
-        game_time:str = TIME_BITMAP[game_time]
-        return game_time
-
-    try:
-        game_timelimit = try_parse_value(internal_parser, generic_field_3)
-    except:
-        game_timelimit = "Unknown Time!" 
+    value: int | None = _unsigned_32(generic_field_3)
+    if value is None:
+        return UNKNOWN_TIME
 
-    return game_timelimit
+    return TIME_TABLE[value & 0x7]
 
 
 
 def uya_gamemode_parser(generic_field_3: int) -> tuple[str, str]:
-    # # Pass in Generic Field 3 (integer)
-    def internal_parser(raw_input:int):
-        '''Accepts generic_field_3 INTEGER number (which is 4 a byte long hex string)
-        returns game MODE andd game SUBMODE/ type'''
-        int_casted:int = int(raw_input) if type(raw_input) != 'int' else raw_input
-        num_hex:str = struct.pack('<I', int_casted).hex()
-        hex_last:str =num_hex[2:] #cut off the front 2 bytes
-        int_cleaned:int = int(hex_last,16)
-        num_bitmask:str = format(int_cleaned, "#026b")[2:]
-        _game_mode:str = MODE_BITMAP[num_bitmask[3:5]] if num_bitmask[3:5] in MODE_BITMAP else "Unknown Game Mode"
-        is_teams:bool = True if num_bitmask[SUBMODE_BITMAP['isTeams']] == '1' else False
-        is_attrition:bool = True if num_bitmask[SUBMODE_BITMAP['isAttrition']]== '1' else False
-
-        if _game_mode == MODE_BITMAP['00']:
-            _game_type = "Attrition" if is_attrition else "Normal"
-        elif _game_mode == MODE_BITMAP['01']:
-            _game_type = "Chaos" if is_attrition else "Normal"
-        elif _game_mode == MODE_BITMAP['10']:
-            _game_type = "Teams" if is_teams else "FFA"
-        else:
-            _game_type = "Game Type Not Found"
-        return _game_mode, _game_type
-    try:
-        game_mode, game_type = try_parse_value(internal_parser, generic_field_3)
-    except:
-        game_mode, game_type = 'Unkown Game Mode', 'Unknown Game Type'
+    value: int | None = _unsigned_32(generic_field_3)
+    if value is None:
+        return UNKNOWN_GAME_MODE
 
-    return game_mode, game_type
+    bits: int = ((value >> 8) & 0xFF) << 16 | ((value >> 16) & 0xFF) << 8 | (value >> 24) & 0xFF
+    return GAME_MODE_TABLE[
+        ((bits >> MODE_SHIFT) & 0x3) << 2 | ((bits >> TEAMS_BIT) & 1) << 1 | (bits >> ATTRITION_BIT) & 1
+    ]
 
 
 
 def uya_weapon_parser(player_skill_level:int) -> dict[str, bool]:
+    if type(player_skill_level) is int and player_skill_level >= 0:
+        return {weapon: not player_skill_level & bit for weapon, bit in WEAPON_BITS}
+
+    # Negative and non-integer values keep the behavior of the original bitmask string parsing.
     result = {
         "Lava Gun": False,
         "Morph O' Ray": False,
@@ -160,4 +169,63 @@ def uya_weapon_parser(player_skill_level:int) -> dict[str, bool]:
         return result
     except Exception as e:
         print(e)
-        return result
\ No newline at end of file
+        return result
+
+
+def uya_generic_field_3_batch_parser(
+    generic_field_3: Sequence[int] | np.ndarray,
+    custom_maps: Sequence[str | None] | None = None
+) -> dict[str, np.ndarray]:
+    """
+    Decodes many Generic Field 3 values at once, for backfills.
+
+    :param generic_field_3: Generic Field 3 values.
+    :param custom_maps: The 'CustomMap' metadata of each game, which overrides the decoded map when set.
+    :return: Columns "game_map", "game_mode" and "game_submode" of strings, matching the scalar parsers, and
+        "time_limit" of integers with -1 where the scalar parser returns "Unknown Time!".
+    """
+    values: np.ndarray = np.asarray(generic_field_3, dtype=np.int64)
+    values = np.where(values < 0, values + 2**32, values)
+    valid: np.ndarray = (values >= 0) & (values < 2**32)
+    values = np.where(valid, values, 0)
+
+    low_byte: np.ndarray = values & 0xFF
+    game_maps: np.ndarray = np.array([game_map or UNKNOWN_MAP for game_map in MAP_TABLE], dtype=object)[low_byte >> 3]
+    game_maps[~valid] = UNKNOWN_MAP
+
+    if custom_maps is not None:
+        for index, custom_map in enumerate(custom_maps):
+            if custom_map:
+                game_maps[index] = custom_map
+
+    time_limits: np.ndarray = np.where(valid, np.array(TIME_TABLE, dtype=np.int64)[low_byte & 0x7], -1)
+
+    bits: np.ndarray = ((values >> 8) & 0xFF) << 16 | ((values >> 16) & 0xFF) << 8 | (values >> 24) & 0xFF
+    mode_index: np.ndarray = ((bits >> MODE_SHIFT) & 0x3) << 2 | ((bits >> TEAMS_BIT) & 1) << 1 | (bits >> ATTRITION_BIT) & 1
+
+    game_modes: np.ndarray = np.array([game_mode for game_mode, _ in GAME_MODE_TABLE], dtype=object)[mode_index]
+    game_submodes: np.ndarray = np.array([game_type for _, game_type in GAME_MODE_TABLE], dtype=object)[mode_index]
+    game_modes[~valid], game_submodes[~valid] = UNKNOWN_GAME_MODE
+
+    return {
+        "game_map": game_maps,
+        "time_limit": time_limits,
+        "game_mode": game_modes,
+        "game_submode": game_submodes,
+    }
+
+
+def uya_weapon_batch_parser(player_skill_level: Sequence[int] | np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Decodes many Player Skill Level values at once, for backfills.
+
+    :return: A boolean column per weapon, matching `uya_weapon_parser`.
+    """
+    values: np.ndarray = np.asarray(player_skill_level, dtype=np.int64)
+    weapons: dict[str, np.ndarray] = {weapon: (values & bit) == 0 for weapon, bit in WEAPON_BITS}
+
+    for index in np.flatnonzero(values < 0):
+        for weapon, enabled in uya_weapon_parser(int(values[index])).items():
+            weapons[weapon][index] = enabled
+
+    return weapons
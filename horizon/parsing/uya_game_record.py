@@ -0,0 +1,298 @@
+import json
+from datetime import datetime
+from operator import itemgetter
+
+import numpy as np
+
+from horizon.parsing.uya_game import (
+    UNKNOWN_TIME,
+    uya_map_parser,
+    uya_time_parser,
+    uya_gamemode_parser,
+    uya_game_name_parser,
+    uya_weapon_parser,
+    uya_generic_field_3_batch_parser,
+    uya_weapon_batch_parser
+)
+from horizon.parsing.uya_stats import uya_vanilla_stats_map
+
+
+# Maps the weapon flags of a game (as named by uya_weapon_parser) to their game history fields.
+UYA_WEAPON_ENABLED_FIELDS: dict[str, str] = {
+    "n60_enabled": "N60",
+    "lava_gun_enabled": "Lava Gun",
+    "gravity_bomb_enabled": "Gravity Bomb",
+    "flux_rifle_enabled": "Flux Rifle",
+    "mine_glove_enabled": "Mine Glove",
+    "morph_enabled": "Morph O' Ray",
+    "blitz_enabled": "Blitz Cannon",
+    "rocket_enabled": "Rocket",
+}
+
+# Maps each per-game player stat field to the label of the wide stat it is computed from.
+UYA_PLAYER_GAME_STAT_LABELS: dict[str, str] = {
+    "kills": "Kills",
+    "deaths": "Deaths",
+    "base_dmg": "Total Base Damage",
+    "flag_captures": "CTF Flags Captured",
+    "flag_saves": "CTF Flags Saved",
+    "suicides": "Suicides",
+    "nodes": "Total Nodes",
+    "n60_deaths": "N60 Deaths",
+    "n60_kills": "N60 Kills",
+    "lava_gun_deaths": "Lava Gun Deaths",
+    "lava_gun_kills": "Lava Gun Kills",
+    "gravity_bomb_deaths": "Gravity Bomb Deaths",
+    "gravity_bomb_kills": "Gravity Bomb Kills",
+    "flux_rifle_deaths": "Flux Rifle Deaths",
+    "flux_rifle_kills": "Flux Rifle Kills",
+    "mine_glove_deaths": "Mine Glove Deaths",
+    "mine_glove_kills": "Mine Glove Kills",
+    "morph_deaths": "Morph-O-Ray Deaths",
+    "morph_kills": "Morph-O-Ray Kills",
+    "blitz_deaths": "Blitz Cannon Deaths",
+    "blitz_kills": "Blitz Cannon Kills",
+    "rocket_deaths": "Rocket Deaths",
+    "rocket_kills": "Rocket Kills",
+    "wrench_deaths": "Wrench Deaths",
+    "wrench_kills": "Wrench Kills",
+}
+
+_UYA_STAT_INDEX_BY_LABEL: dict[str, int] = {
+    stat["label"]: index for index, stat in uya_vanilla_stats_map.items() if stat["label"]
+}
+
+# Wide stat index of the win counter and of every per-game player stat field.
+UYA_WINS_STAT_INDEX: int = _UYA_STAT_INDEX_BY_LABEL["Wins"]
+UYA_PLAYER_GAME_STAT_INDICES: dict[str, int] = {
+    field: _UYA_STAT_INDEX_BY_LABEL[label] for field, label in UYA_PLAYER_GAME_STAT_LABELS.items()
+}
+
+
+# Picks the win counter followed by every per-game player stat out of a player's wide stats.
+_UYA_PLAYER_GAME_STAT_FIELDS: tuple[str, ...] = tuple(UYA_PLAYER_GAME_STAT_INDICES)
+_UYA_PLAYER_GAME_STAT_GETTER: itemgetter = itemgetter(UYA_WINS_STAT_INDEX, *UYA_PLAYER_GAME_STAT_INDICES.values())
+_UYA_PLAYER_GAME_STAT_COUNT: int = len(UYA_PLAYER_GAME_STAT_INDICES) + 1
+_UYA_STAT_WIDTH: int = max(UYA_WINS_STAT_INDEX, *UYA_PLAYER_GAME_STAT_INDICES.values()) + 1
+
+
+def _parse_middleware_datetime(value: str) -> datetime:
+    # The middleware reports 7 fractional digits, which datetime does not accept.
+    return datetime.fromisoformat(value[:26])
+
+
+def _parse_metadata(game: dict) -> dict:
+    metadata: dict = game.get("Metadata") or {}
+    if isinstance(metadata, str):
+        metadata = json.loads(metadata)
+    return metadata
+
+
+def _player_stat_difference(pre_stats: list[int], post_stats: list[int]) -> dict[str, int | bool] | None:
+    """
+    Computes one player's stats one at a time, for wide stat lists too short to be stacked.
+
+    :return: The player's stats keyed by UyaPlayerGameStats field, or None if either list is empty.
+    """
+    stat_difference: list[int] = [post_stat - pre_stat for post_stat, pre_stat in zip(post_stats, pre_stats)]
+
+    if stat_difference == []:
+        return None
+
+    player_stats: dict[str, int | bool] = {
+        "win": stat_difference[UYA_WINS_STAT_INDEX] == 1  # If there was +1 to win stat
+    }
+    for field, stat_index in UYA_PLAYER_GAME_STAT_INDICES.items():
+        player_stats[field] = stat_difference[stat_index]
+    return player_stats
+
+
+def uya_player_game_stats(metadatas: list[dict]) -> list[dict[int, dict[str, int | bool]]]:
+    """
+    Computes PostWideStats - PreWideStats for every player of every game. Only the wide stats behind UyaPlayerGameStats
+    columns are picked out, and all players are stacked into one array so the deltas of a whole batch of games are a
+    single subtraction.
+
+    :param metadatas: Decoded game metadata.
+    :return: For each game, the stats of each player keyed by UyaPlayerGameStats field.
+    """
+    games: list[dict[int, dict[str, int | bool] | None]] = [dict() for _ in metadatas]
+    owners: list[tuple[int, int]] = list()
+    pre_values: list[int] = list()
+    post_values: list[int] = list()
+
+    for game_index, metadata in enumerate(metadatas):
+        players_pre: dict[str, list[int]] = metadata.get("PreWideStats", {}).get("Players", {})
+        players_post: dict[str, list[int]] = metadata.get("PostWideStats", {}).get("Players", {})
+
+        for horizon_player_id, pre_stats in players_pre.items():
+            post_stats: list[int] = players_post[horizon_player_id]
+            player_id: int = int(horizon_player_id)
+
+            if len(pre_stats) >= _UYA_STAT_WIDTH and len(post_stats) >= _UYA_STAT_WIDTH:
+                # Reserve the player's place so the players keep the middleware's order.
+                games[game_index][player_id] = None
+                owners.append((game_index, player_id))
+                pre_values.extend(_UYA_PLAYER_GAME_STAT_GETTER(pre_stats))
+                post_values.extend(_UYA_PLAYER_GAME_STAT_GETTER(post_stats))
+                continue
+
+            player_stats: dict[str, int | bool] | None = _player_stat_difference(pre_stats, post_stats)
+            if player_stats is not None:
+                games[game_index][player_id] = player_stats
+
+    if owners:
+        differences: np.ndarray = (
+            np.array(post_values, dtype=np.int64) - np.array(pre_values, dtype=np.int64)
+        ).reshape(-1, _UYA_PLAYER_GAME_STAT_COUNT)
+        wins: list[bool] = (differences[:, 0] == 1).tolist()
+        columns: list[list[int]] = differences[:, 1:].tolist()
+
+        for (game_index, player_id), win, values in zip(owners, wins, columns):
+            player_stats = {"win": win}
+            player_stats.update(zip(_UYA_PLAYER_GAME_STAT_FIELDS, values))
+            games[game_index][player_id] = player_stats
+
+    return games
+
+
+class UyaGameRecord:
+    """
+    A UYA game history entry from the Horizon Middleware, decoded exactly once. Every derived field (map, mode,
+    time limit, weapon rules, timestamps and per-player stat deltas) is computed in the constructor so that ingest,
+    webhooks and any other consumer can share the same parsed values.
+    """
+
+    __slots__ = (
+        "id",
+        "status",
+        "game_map",
+        "game_name",
+        "game_mode",
+        "game_submode",
+        "time_limit",
+        "n60_enabled",
+        "lava_gun_enabled",
+        "gravity_bomb_enabled",
+        "flux_rifle_enabled",
+        "mine_glove_enabled",
+        "morph_enabled",
+        "blitz_enabled",
+        "rocket_enabled",
+        "player_count",
+        "game_create_time",
+        "game_start_time",
+        "game_end_time",
+        "game_duration",
+        "player_stats",
+    )
+
+    def __init__(self, game: dict):
+        """
+        :param game: Raw game dictionary as returned by the Horizon Middleware game history APIs. The dictionary is
+            not modified.
+        """
+        metadata: dict = _parse_metadata(game)
+        game_mode, game_submode = uya_gamemode_parser(game["GenericField3"])
+
+        self._decode(
+            game,
+            game_map=uya_map_parser(game["GenericField3"], metadata),
+            game_mode=game_mode,
+            game_submode=game_submode,
+            time_limit=uya_time_parser(game["GenericField3"]),
+            weapons=uya_weapon_parser(game["PlayerSkillLevel"]),
+            player_count=len(metadata.get("PreWideStats", {}).get("Players", {})),
+            player_stats=uya_player_game_stats([metadata])[0]
+        )
+
+    @classmethod
+    def decode_batch(cls, games: list[dict], chunk_size: int = 256) -> list["UyaGameRecord"]:
+        """
+        Decodes many games at once, for backfills. Game fields are decoded column by column and the player stat deltas
+        of every game in a chunk are computed together, giving the same records as decoding each game on its own.
+
+        :param games: Raw game dictionaries as returned by the Horizon Middleware game history APIs.
+        :param chunk_size: Games decoded together. Each chunk's metadata is released before the next is decoded, which
+            keeps the garbage collector from rescanning the wide stats of the whole backfill.
+        """
+        records: list[UyaGameRecord] = list()
+        for start in range(0, len(games), chunk_size):
+            records.extend(cls._decode_chunk(games[start:start + chunk_size]))
+        return records
+
+    @classmethod
+    def _decode_chunk(cls, games: list[dict]) -> list["UyaGameRecord"]:
+        metadatas: list[dict] = [_parse_metadata(game) for game in games]
+
+        try:
+            fields: dict[str, np.ndarray] = uya_generic_field_3_batch_parser(
+                [game["GenericField3"] for game in games],
+                custom_maps=[metadata.get("CustomMap") for metadata in metadatas]
+            )
+            weapons: dict[str, np.ndarray] = uya_weapon_batch_parser([game["PlayerSkillLevel"] for game in games])
+        except (TypeError, ValueError, OverflowError):
+            # Fields that aren't plain integers are left to the scalar parsers.
+            return [cls(game) for game in games]
+
+        game_maps: list[str] = fields["game_map"].tolist()
+        game_modes: list[str] = fields["game_mode"].tolist()
+        game_submodes: list[str] = fields["game_submode"].tolist()
+        time_limits: list[int | str] = [
+            UNKNOWN_TIME if time_limit == -1 else time_limit for time_limit in fields["time_limit"].tolist()
+        ]
+        weapon_columns: dict[str, list[bool]] = {weapon: column.tolist() for weapon, column in weapons.items()}
+        player_stats: list[dict[int, dict[str, int | bool]]] = uya_player_game_stats(metadatas)
+
+        records: list[UyaGameRecord] = list()
+        for index, game in enumerate(games):
+            record: UyaGameRecord = cls.__new__(cls)
+            record._decode(
+                game,
+                game_map=game_maps[index],
+                game_mode=game_modes[index],
+                game_submode=game_submodes[index],
+                time_limit=time_limits[index],
+                weapons={weapon: column[index] for weapon, column in weapon_columns.items()},
+                player_count=len(metadatas[index].get("PreWideStats", {}).get("Players", {})),
+                player_stats=player_stats[index]
+            )
+            records.append(record)
+        return records
+
+    def _decode(
+        self,
+        game: dict,
+        game_map: str,
+        game_mode: str,
+        game_submode: str,
+        time_limit: int | str,
+        weapons: dict[str, bool],
+        player_count: int,
+        player_stats: dict[int, dict[str, int | bool]]
+    ) -> None:
+        self.id: int = int(game["Id"])
+        self.status: str = game["WorldStatus"]
+        self.game_map: str = game_map
+        self.game_name: str = uya_game_name_parser(game["GameName"])
+        self.game_mode: str = game_mode
+        self.game_submode: str = game_submode
+        self.time_limit: int = time_limit
+
+        for field, weapon in UYA_WEAPON_ENABLED_FIELDS.items():
+            setattr(self, field, weapons[weapon])
+
+        self.game_create_time: datetime = _parse_middleware_datetime(game["GameCreateDt"])
+        self.game_start_time: datetime = _parse_middleware_datetime(game["GameStartDt"])
+        self.game_end_time: datetime = _parse_middleware_datetime(game["GameEndDt"])
+        self.game_duration: float = (self.game_end_time - self.game_start_time).total_seconds() / 60
+
+        # PostWideStats - PreWideStats for each player, keyed by UyaPlayerGameStats field.
+        self.player_count: int = player_count
+        self.player_stats: dict[int, dict[str, int | bool]] = player_stats
+
+    def game_history_fields(self) -> dict[str, any]:
+        """
+        :return: The decoded game keyed by UyaGameHistory column name.
+        """
+        return {field: getattr(self, field) for field in self.__slots__ if field != "player_stats"}
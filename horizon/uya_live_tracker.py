@@ -2,15 +2,37 @@ import os
 import logging
 import asyncio
 import json
+import time
 from collections import deque
 from datetime import datetime, timedelta
 from copy import deepcopy
 import websockets
 
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
 
 from livetrackerserver import UyaLiveTracker as UyaLiveTrackerServer
 
+from horizon.live import (
+    FULL_MODE,
+    DELTA_MODE,
+    BINARY_MODE,
+    ALL_WORLDS,
+    DelayedFrameBuffer,
+    LiveFrameSet,
+    LiveRecorder,
+    LiveSubscription,
+    OwnerLock,
+    SharedFrameRing,
+    publish_frame_set,
+    read_frame_set,
+    SimulatedLiveTrackerServer,
+    encode_binary_frame,
+    get_recording_metadata,
+    list_recordings,
+    parse_subscription,
+    read_recording_async
+)
+
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -25,46 +47,616 @@ from app.utils.general import read_environment_variables
 CREDENTIALS: dict[str, any] = read_environment_variables()
 
 
+class LiveTrackerClient:
+    """
+    A spectator connected to the live tracker websocket. The broadcaster hands each client the latest broadcast and the
+    client's own task encodes and sends it, so a slow connection only ever delays itself. A client that is still
+    sending when a newer broadcast arrives skips straight to the newer one.
+    """
+
+    __slots__ = (
+        "websocket",
+        "mode",
+        "delayed",
+        "subscription",
+        "base",
+        "latest",
+        "latest_timestamp",
+        "ready",
+        "throttled",
+        "dropped_frames",
+        "consecutive_dropped_frames"
+    )
+
+    def __init__(self, websocket: WebSocket, mode: str = FULL_MODE, delayed: bool = False):
+        self.websocket: WebSocket = websocket
+        self.mode: str = mode
+        self.delayed: bool = delayed
+        self.subscription: LiveSubscription = ALL_WORLDS
+
+        # The last broadcast sent, which the next delta is relative to. None until the client has been sent a keyframe.
+        self.base: LiveFrameSet | None = None
+
+        self.latest: LiveFrameSet | None = None
+        self.latest_timestamp: float = 0
+        self.ready: asyncio.Event = asyncio.Event()
+
+        # Whether the client is waiting out its subscribed rate, during which skipped broadcasts are not dropped frames.
+        self.throttled: bool = False
+
+        self.dropped_frames: int = 0
+        self.consecutive_dropped_frames: int = 0
+
+    def offer(self, frame_set: LiveFrameSet, timestamp: float) -> int:
+        """
+        Makes a broadcast the next one to send, replacing any broadcast the client has not started sending yet.
+
+        :return: The number of frames dropped.
+        """
+        dropped: int = 0
+
+        if self.throttled:
+            pass
+        elif self.latest is not None:
+            dropped = 1
+            self.dropped_frames += 1
+            self.consecutive_dropped_frames += 1
+        else:
+            self.consecutive_dropped_frames = 0
+
+        self.latest = frame_set
+        self.latest_timestamp = timestamp
+        self.ready.set()
+        return dropped
+
+    def subscribe(self, subscription: LiveSubscription, frame_set: LiveFrameSet | None, timestamp: float) -> None:
+        """
+        Replaces the client's subscription and queues a keyframe of the latest broadcast, if any, in the new view.
+        """
+        self.subscription = subscription
+        self.base = None
+
+        if frame_set is not None:
+            self.latest = frame_set
+            self.latest_timestamp = timestamp
+            self.ready.set()
+
+    async def next_frame(self) -> tuple[str | bytes, float]:
+        """
+        Waits for a broadcast and encodes it for the client.
+
+        :return: The frame and the loop time it was broadcast at.
+        """
+        await self.ready.wait()
+        self.ready.clear()
+
+        frame_set: LiveFrameSet = self.latest
+        self.latest = None
+
+        frame: str | bytes = frame_set.encode(self.mode, self.subscription, self.base)
+        self.base = frame_set
+        return frame, self.latest_timestamp
+
+
 class UyaLiveTracker:
-    def __init__(self, port: int = 8888, read_tick_rate: int = 10, write_tick_rate: int = 10, read_games_api_rate: int = 10, write_delay: int = 30):
+    def __init__(
+        self,
+        port: int = 8888,
+        read_tick_rate: int = 10,
+        write_tick_rate: int = 10,
+        read_games_api_rate: int = 10,
+        write_delay: int = 30,
+        max_consecutive_dropped_frames: int = 50,
+        send_timeout: float = 5,
+        idle_read_interval: float = 1,
+        keyframe_interval: float = 5,
+        max_delay_buffer_bytes: int = 64 * 1024 * 1024,
+        shared_memory_name: str | None = None,
+        recordings_directory: str | None = None,
+        record_matches: bool | None = None,
+        max_recordings_bytes: int | None = None,
+        max_recording_age: float | None = None
+    ):
         self._simulated = CREDENTIALS["uya"]["live_tracker_simulated"]
         self._ip = '0.0.0.0'
         self._port = port
 
         self._tracker = None
         self._worlds = '[]'
-        self._active_connections: list[WebSocket] = []
+        self._active_connections: set[LiveTrackerClient] = set()
 
         self._read_tick_rate = 1 / read_tick_rate
         self._write_tick_rate = 1 / write_tick_rate
+        self._idle_read_interval: float = idle_read_interval
+
+        # World change tracking. The version is bumped whenever any world was added, removed or changed, and each world
+        # keeps the version it last changed in. An unchanged world keeps the same state object across versions, so
+        # frames, deltas and recordings can skip it with an identity check.
+        self._last_dump: str = self._worlds
+        self._world_states: dict[int, dict] = dict()
+        self._world_versions: dict[int, int] = dict()
+        self._version: int = 0
+        self._changed: asyncio.Event = asyncio.Event()
+
+        # Read metrics
+        self._reads: int = 0
+        self._read_changes: int = 0
+        self._read_cpu_times: deque[float] = deque(maxlen=1000)
+
+        self._max_consecutive_dropped_frames: int = max_consecutive_dropped_frames
+        self._send_timeout: float = send_timeout
+
+        # The latest broadcast, which new clients start from and the next broadcast's deltas are relative to.
+        self._keyframe_interval: float = keyframe_interval
+        self._frame_set: LiveFrameSet = LiveFrameSet(0, time.time(), self._worlds, dict(), is_keyframe=True)
+        self._last_keyframe_time: float = self._frame_set.timestamp
+
+        # Broadcasts of the last write_delay seconds, served to delayed spectators.
+        self._write_delay: float = write_delay
+        self._delay_buffer: DelayedFrameBuffer = DelayedFrameBuffer(write_delay, self._write_tick_rate, max_delay_buffer_bytes)
+        self._delayed_frame_set: LiveFrameSet | None = None
+
+        # When enabled, every world is recorded from the moment it appears until it ends, for replays. The oldest
+        # recordings are deleted past the size and age limits.
+        self._recordings_directory: str = recordings_directory or \
+            CREDENTIALS["uya"].get("live_tracker_recordings_path", "data/recordings")
+        self._record_matches: bool = record_matches if record_matches is not None else \
+            CREDENTIALS["uya"].get("live_tracker_recordings_enabled", False)
+        self._max_recordings_bytes: int = max_recordings_bytes or \
+            CREDENTIALS["uya"].get("live_tracker_recordings_max_bytes", 1024 * 1024 * 1024)
+        self._max_recording_age: float = max_recording_age or \
+            CREDENTIALS["uya"].get("live_tracker_recordings_max_age_days", 7) * 24 * 60 * 60
+        self._recorder: LiveRecorder | None = None
+
+        # With several workers, the owner runs the tracker server and publishes its encoded broadcasts to shared memory,
+        # and the others send those broadcasts to their clients.
+        self._shared_memory_name: str = shared_memory_name or \
+            CREDENTIALS["uya"].get("live_tracker_shared_memory_name", "uya_live_frames")
+        self._shared_frames: SharedFrameRing | None = None
+        self._shared_frame_set: LiveFrameSet | None = None
+        self._owner_lock: OwnerLock = OwnerLock(self._shared_memory_name)
+        self._owner: bool = False
+
+        # Broadcast metrics
+        self._frames_broadcast: int = 0
+        self._frames_dropped: int = 0
+        self._slow_clients_disconnected: int = 0
+        self._send_latencies: deque[float] = deque(maxlen=1000)
 
     ####### READ FROM PROD METHODS
+    def read_worlds(self) -> bool:
+        """
+        Dumps the tracker's worlds and publishes them if any world was added, removed or changed since the last dump.
+
+        :return: True if a new version was published.
+        """
+        self._reads += 1
+        return self.apply_dump(self._tracker.dump())
+
+    def apply_dump(self, dump: str) -> bool:
+        """
+        Makes a dump of every world the current state if any world was added, removed or changed. The tracker server
+        only dumps every world at once, so an identical dump is skipped as a string and any other dump is parsed and
+        compared world by world.
+
+        :return: True if a new version was published.
+        """
+        if dump == self._last_dump:
+            return False
+
+        self._last_dump = dump
+
+        version: int = self._version + 1
+        world_states: dict[int, dict] = dict()
+        world_versions: dict[int, int] = dict()
+        changed: bool = False
+
+        for world in json.loads(dump):
+            world_id: int = world["world_id"]
+            previous_world: dict | None = self._world_states.get(world_id)
+
+            if previous_world == world:
+                world_states[world_id] = previous_world
+                world_versions[world_id] = self._world_versions[world_id]
+            else:
+                world_states[world_id] = world
+                world_versions[world_id] = version
+                changed = True
+
+        if not changed and world_states.keys() == self._world_states.keys():
+            return False
+
+        self._version = version
+        self._world_states = world_states
+        self._world_versions = world_versions
+        self._worlds = dump
+        self._read_changes += 1
+        self._changed.set()
+        return True
+
+    async def read_shared_frames(self, loop):
+        """
+        Hands the owner's broadcasts from shared memory to the broadcaster, and takes over as the owner if the owner
+        process exits.
+        """
+        seq: int = 0
+        last_ownership_check: float = loop.time()
+
+        while True:
+            latest_seq: int = self._shared_frames.latest_seq()
+
+            if latest_seq != seq:
+                started: float = time.process_time()
+                frame_set: LiveFrameSet | None = read_frame_set(self._shared_frames, latest_seq)
+                self._reads += 1
+
+                if frame_set is not None:
+                    seq = latest_seq
+                    self._version = frame_set.seq
+                    self._shared_frame_set = frame_set
+                    self._read_changes += 1
+                    self._changed.set()
+                self._read_cpu_times.append(time.process_time() - started)
+
+            if loop.time() - last_ownership_check >= 1:
+                last_ownership_check = loop.time()
+
+                if self._owner_lock.acquire():
+                    logger.info("read_shared_frames: The live tracker owner exited, taking over.")
+                    await self._start_owner(loop)
+                    return
+
+            await asyncio.sleep(self._read_tick_rate)
+
     async def read_prod_websocket(self):
         while True:
             try:
+                read_interval: float = self._read_tick_rate
+
                 while True:
-                    self._worlds = self._tracker.dump()
-                    #print(datetime.now(), "got world:", self._worlds)
-                    await asyncio.sleep(.01)
+                    started: float = time.process_time()
+                    self.read_worlds()
+                    self._read_cpu_times.append(time.process_time() - started)
+
+                    # Back off while no games are being played, and return to the tick rate as soon as one starts.
+                    if self._world_states:
+                        read_interval = self._read_tick_rate
+                    else:
+                        read_interval = min(read_interval * 2, self._idle_read_interval)
+
+                    await asyncio.sleep(read_interval)
             except Exception as e:
                 logger.warning(f"read_prod_websocket: Unable to connect", exc_info=True)
                 await asyncio.sleep(5)
 
     ####### PUSHING TO CLIENTS METHODS
-    def add_connection(self, websocket: WebSocket):
-        self._active_connections.append(websocket)
+    async def broadcast(self):
+        """
+        Queues every new version of the world state for every connected client, at most once per write tick. Delta
+        mode clients are sent a keyframe at least every keyframe interval.
+        """
+        loop = asyncio.get_running_loop()
+        self._delay_buffer.append(self._frame_set, loop.time())
+
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
 
-    def remove_connection(self, websocket: WebSocket):
-        self._active_connections.remove(websocket)
+            timestamp: float = loop.time()
 
-    async def write(self, websocket: WebSocket):
-        """Return the world state from _delay_ seconds ago, if available."""
-        await websocket.send_text(self._worlds)
-        await asyncio.sleep(self._write_tick_rate)
+            if self._shared_frame_set is None or self._owner:
+                now: float = time.time()
+                is_keyframe: bool = now - self._last_keyframe_time >= self._keyframe_interval
+                if is_keyframe:
+                    self._last_keyframe_time = now
 
-    async def start(self, loop):
-        self._tracker = UyaLiveTrackerServer(loop, CREDENTIALS["uya"]["live_tracker_socket_ip"], CREDENTIALS["uya"]["horizon_middleware_protocol"], CREDENTIALS["uya"]["horizon_middleware_host"], CREDENTIALS["uya"]["horizon_middleware_username"], CREDENTIALS["uya"]["horizon_middleware_password"])
+                previous: LiveFrameSet = self._frame_set
+                self._frame_set = LiveFrameSet(
+                    seq=self._version,
+                    timestamp=now,
+                    dump=self._worlds,
+                    worlds=self._world_states,
+                    is_keyframe=is_keyframe,
+                    world_versions=self._world_versions,
+                    previous=previous
+                )
+
+                # Other workers send these frames as they are instead of encoding their own.
+                if self._shared_frames is not None:
+                    publish_frame_set(self._shared_frames, self._frame_set, previous if previous.seq else None)
+
+                if self._recorder is not None:
+                    self._recorder.record(self._world_states, now)
+            else:
+                # Readers send the owner's broadcasts.
+                self._frame_set = self._shared_frame_set
+
+            self._delay_buffer.append(self._frame_set, timestamp)
+
+            for client in self._active_connections:
+                if not client.delayed:
+                    self._frames_dropped += client.offer(self._frame_set, timestamp)
+
+            self._frames_broadcast += 1
+            await asyncio.sleep(self._write_tick_rate)
+
+    async def broadcast_delayed(self):
+        """
+        Once per write tick, hands delayed clients the broadcast from write_delay seconds ago if it is a new one.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            timestamp: float = loop.time()
+            frame_set: LiveFrameSet | None = self._delay_buffer.at(timestamp - self._write_delay)
+
+            if frame_set is not None and frame_set is not self._delayed_frame_set:
+                self._delayed_frame_set = frame_set
+
+                for client in self._active_connections:
+                    if client.delayed:
+                        self._frames_dropped += client.offer(frame_set, timestamp)
+
+            await asyncio.sleep(self._write_tick_rate)
+
+    async def serve(self, websocket: WebSocket, mode: str = FULL_MODE, delayed: bool = False):
+        """
+        Sends broadcast frames to an accepted websocket, applying any subscriptions it sends, until it disconnects or
+        falls too far behind.
+
+        :param websocket: The spectator's websocket.
+        :param mode: FULL_MODE to send the full world state every frame, DELTA_MODE to send keyframes and deltas or
+            BINARY_MODE to send binary snapshots.
+        :param delayed: Whether to send the world state from write_delay seconds ago instead of the live state.
+        """
+        loop = asyncio.get_running_loop()
+        client: LiveTrackerClient = LiveTrackerClient(websocket, mode, delayed)
+        self._active_connections.add(client)
+
+        # Until the worlds next change, the broadcaster has nothing to send, so start the client on the latest broadcast.
+        frame_set: LiveFrameSet | None = self._delayed_frame_set if delayed else self._frame_set
+        if frame_set is not None:
+            client.offer(frame_set, loop.time())
+
+        sender: asyncio.Task = asyncio.create_task(self._send_frames(client))
+        receiver: asyncio.Task = asyncio.create_task(self._receive_subscriptions(client))
+
+        try:
+            done, _ = await asyncio.wait((sender, receiver), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            sender.cancel()
+            receiver.cancel()
+            self._active_connections.discard(client)
+
+    async def _send_frames(self, client: LiveTrackerClient):
+        loop = asyncio.get_running_loop()
+
+        try:
+            while True:
+                frame, timestamp = await client.next_frame()
+
+                send = client.websocket.send_bytes(frame) if isinstance(frame, bytes) else client.websocket.send_text(frame)
+                await asyncio.wait_for(send, timeout=self._send_timeout)
+                sent_time: float = loop.time()
+                self._send_latencies.append(sent_time - timestamp)
+
+                if client.consecutive_dropped_frames >= self._max_consecutive_dropped_frames:
+                    logger.info(f"_send_frames: Disconnecting slow client after {client.consecutive_dropped_frames} dropped frames.")
+                    self._slow_clients_disconnected += 1
+                    await client.websocket.close()
+                    return
+
+                if client.subscription.rate is not None:
+                    client.throttled = True
+                    await asyncio.sleep(1 / client.subscription.rate - (loop.time() - sent_time))
+                    client.throttled = False
+        except asyncio.TimeoutError:
+            logger.info(f"_send_frames: Disconnecting client that did not accept a frame within {self._send_timeout}s.")
+            self._slow_clients_disconnected += 1
+        except WebSocketDisconnect:
+            # The client went away mid-send, the receiver will see the disconnect too.
+            return
+
+    async def _receive_subscriptions(self, client: LiveTrackerClient):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                message: str = await client.websocket.receive_text()
+            except WebSocketDisconnect:
+                return
+
+            try:
+                subscription: LiveSubscription = parse_subscription(json.loads(message), max_rate=1 / self._write_tick_rate)
+            except ValueError as e:
+                logger.info(f"_receive_subscriptions: Ignoring invalid subscription: {e}")
+                continue
+
+            client.subscribe(subscription, self._delayed_frame_set if client.delayed else self._frame_set, loop.time())
+
+    def recordings(self) -> list[dict[str, any]]:
+        """
+        :return: The metadata of every recorded match, most recent first.
+        """
+        return list_recordings(self._recordings_directory)
+
+    async def serve_replay(self, websocket: WebSocket, recording_id: str, mode: str = FULL_MODE, speed: float = 1):
+        """
+        Streams a recorded match to an accepted websocket in the same format as live frames, until the recording ends
+        or the websocket disconnects. The client seeks by sending {"type": "seek", "offset": <seconds from the start>}.
+
+        :param websocket: The spectator's websocket.
+        :param recording_id: ID of the recording.
+        :param mode: FULL_MODE, DELTA_MODE or BINARY_MODE.
+        :param speed: Playback speed, 1 for real time.
+        """
+        metadata: dict[str, any] | None = get_recording_metadata(self._recordings_directory, recording_id)
+        if metadata is None:
+            await websocket.close(code=1008, reason="Recording not found.")
+            return
+
+        seeks: asyncio.Queue[float] = asyncio.Queue()
+        receiver: asyncio.Task = asyncio.create_task(self._receive_seeks(websocket, seeks))
+        player: asyncio.Task = asyncio.create_task(self._play_recording(websocket, recording_id, mode, speed, metadata["started"]))
+
+        try:
+            while True:
+                seek: asyncio.Task = asyncio.create_task(seeks.get())
+                done, _ = await asyncio.wait((receiver, player, seek), return_when=asyncio.FIRST_COMPLETED)
+
+                if seek not in done:
+                    seek.cancel()
+                    for task in done:
+                        task.result()
+
+                    # A client dropped by a send timeout is not sent a close frame it would not accept either.
+                    if player in done and player.result():
+                        await websocket.close()
+                    return
+
+                player.cancel()
+                player = asyncio.create_task(
+                    self._play_recording(websocket, recording_id, mode, speed, metadata["started"] + seek.result())
+                )
+        finally:
+            receiver.cancel()
+            player.cancel()
+
+    async def _receive_seeks(self, websocket: WebSocket, seeks: asyncio.Queue[float]):
+        while True:
+            try:
+                message: str = await websocket.receive_text()
+            except WebSocketDisconnect:
+                return
+
+            try:
+                seek: dict = json.loads(message)
+                if not isinstance(seek, dict) or seek.get("type") != "seek" or not isinstance(seek.get("offset"), (int, float)):
+                    raise ValueError("Expected a 'seek' message with a numeric offset.")
+            except ValueError as e:
+                logger.info(f"_receive_seeks: Ignoring invalid message: {e}")
+                continue
+
+            seeks.put_nowait(max(float(seek["offset"]), 0))
+
+    async def _play_recording(self, websocket: WebSocket, recording_id: str, mode: str, speed: float, start: float) -> bool:
+        """
+        :return: True if the recording was played to the end, False if the client disconnected or was too slow.
+        """
+        previous_timestamp: float | None = None
+        seq: int = 0
+
+        async for timestamp, world, delta in read_recording_async(self._recordings_directory, recording_id, start):
+            if previous_timestamp is not None:
+                await asyncio.sleep((timestamp - previous_timestamp) / speed)
+            previous_timestamp = timestamp
+            seq += 1
+
+            if mode == BINARY_MODE:
+                frame: str | bytes = encode_binary_frame(seq, timestamp, [world])
+            elif mode == FULL_MODE:
+                frame = json.dumps([world], separators=(",", ":"))
+            elif delta is None or seq == 1:
+                frame = json.dumps({"type": "keyframe", "seq": seq, "ts": timestamp, "worlds": [world]}, separators=(",", ":"))
+            else:
+                frame = json.dumps({
+                    "type": "delta",
+                    "seq": seq,
+                    "base": seq - 1,
+                    "ts": timestamp,
+                    "worlds": {str(world["world_id"]): delta},
+                    "removed_worlds": [],
+                }, separators=(",", ":"))
+
+            send = websocket.send_bytes(frame) if isinstance(frame, bytes) else websocket.send_text(frame)
+            try:
+                await asyncio.wait_for(send, timeout=self._send_timeout)
+            except asyncio.TimeoutError:
+                logger.info(f"_play_recording: Disconnecting replay client that did not accept a frame within {self._send_timeout}s.")
+                self._slow_clients_disconnected += 1
+                return False
+            except WebSocketDisconnect:
+                return False
+
+        return True
+
+    def metrics(self) -> dict[str, int | float]:
+        """
+        :return: Connection counts, world version and read CPU time, broadcast and drop counters and send latency
+            percentiles in milliseconds. Send latency is measured from a frame being broadcast to it being written to
+            the client.
+        """
+        latencies: list[float] = sorted(self._send_latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 3)
+
+        return {
+            "owner": int(self._owner),
+            "connections": len(self._active_connections),
+            "delta_connections": sum(client.mode == DELTA_MODE for client in self._active_connections),
+            "binary_connections": sum(client.mode == BINARY_MODE for client in self._active_connections),
+            "subscribed_connections": sum(client.subscription != ALL_WORLDS for client in self._active_connections),
+            "delayed_connections": sum(client.delayed for client in self._active_connections),
+            "delay_buffer_frames": len(self._delay_buffer),
+            "delay_buffer_bytes": self._delay_buffer.nbytes,
+            "version": self._version,
+            "worlds": len(self._frame_set.worlds),
+            "reads": self._reads,
+            "read_changes": self._read_changes,
+            "read_cpu_avg_ms": round(sum(self._read_cpu_times) / len(self._read_cpu_times) * 1000, 3) if self._read_cpu_times else 0,
+            "read_cpu_max_ms": round(max(self._read_cpu_times, default=0) * 1000, 3),
+            "frames_broadcast": self._frames_broadcast,
+            "frames_dropped": self._frames_dropped,
+            "slow_clients_disconnected": self._slow_clients_disconnected,
+            "send_latency_p50_ms": percentile(0.5),
+            "send_latency_p95_ms": percentile(0.95),
+            "send_latency_p99_ms": percentile(0.99),
+            "send_latency_max_ms": percentile(1),
+        }
+
+    def _create_server(self, loop) -> UyaLiveTrackerServer | SimulatedLiveTrackerServer:
+        if self._simulated:
+            logger.info("_create_server: Simulating live matches.")
+            return SimulatedLiveTrackerServer()
+
+        return UyaLiveTrackerServer(loop, CREDENTIALS["uya"]["live_tracker_socket_ip"], CREDENTIALS["uya"]["horizon_middleware_protocol"], CREDENTIALS["uya"]["horizon_middleware_host"], CREDENTIALS["uya"]["horizon_middleware_username"], CREDENTIALS["uya"]["horizon_middleware_password"])
+
+    async def _start_owner(self, loop):
+        self._owner = True
+
+        try:
+            if self._record_matches:
+                self._recorder = LiveRecorder(
+                    self._recordings_directory,
+                    loop,
+                    max_bytes=self._max_recordings_bytes,
+                    max_age=self._max_recording_age
+                )
+        except OSError:
+            logger.warning(f"_start_owner: Unable to create {self._recordings_directory}, live matches will not be recorded.", exc_info=True)
+
+        self._tracker = self._create_server(loop)
         await self._tracker.start()
         loop.create_task(self.read_prod_websocket())
 
+    async def start(self, loop):
+        try:
+            self._shared_frames = SharedFrameRing(self._shared_memory_name)
+        except OSError:
+            logger.warning("start: Unable to open live tracker shared memory, running without other workers.", exc_info=True)
+
+        if self._shared_frames is None or self._owner_lock.acquire():
+            await self._start_owner(loop)
+        else:
+            logger.info("start: Another worker owns the live tracker, reading its frames from shared memory.")
+            loop.create_task(self.read_shared_frames(loop))
+
+        loop.create_task(self.broadcast())
+        loop.create_task(self.broadcast_delayed())
+
 uya_live_tracker: UyaLiveTracker = UyaLiveTracker()
@@ -0,0 +1,49 @@
+"""
+This script compares the size and CPU cost of the live tracker's JSON and binary frame encodings on simulated matches.
+"""
+import json
+import time
+import zlib
+from typing import Callable
+
+from horizon.live import SimulatedLiveTrackerServer, encode_binary_frame, decode_binary_frame
+
+WORLDS: int = 8
+PLAYERS_PER_WORLD: int = 8
+ITERATIONS: int = 500
+
+
+def generate_worlds() -> list[dict]:
+    server: SimulatedLiveTrackerServer = SimulatedLiveTrackerServer(worlds=WORLDS, players_per_world=PLAYERS_PER_WORLD, seed=0)
+    for _ in range(100):
+        server.step()
+    return json.loads(server.dump())
+
+
+def time_per_call(function: Callable[[], any]) -> float:
+    """
+    :return: Average milliseconds per call.
+    """
+    start: float = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function()
+    return (time.perf_counter() - start) / ITERATIONS * 1000
+
+
+if __name__ == "__main__":
+    worlds: list[dict] = generate_worlds()
+
+    json_frame: bytes = json.dumps(worlds).encode()
+    binary_frame: bytes = encode_binary_frame(1, time.time(), worlds)
+
+    print(f"{WORLDS} worlds x {PLAYERS_PER_WORLD} players, {ITERATIONS} iterations")
+    print(f"{'encoding':<10}{'bytes':>10}{'deflated':>10}{'encode ms':>12}{'decode ms':>12}")
+    print(
+        f"{'json':<10}{len(json_frame):>10}{len(zlib.compress(json_frame)):>10}"
+        f"{time_per_call(lambda: json.dumps(worlds)):>12.3f}{time_per_call(lambda: json.loads(json_frame)):>12.3f}"
+    )
+    print(
+        f"{'binary':<10}{len(binary_frame):>10}{len(zlib.compress(binary_frame)):>10}"
+        f"{time_per_call(lambda: encode_binary_frame(1, 0.0, worlds)):>12.3f}"
+        f"{time_per_call(lambda: decode_binary_frame(binary_frame)):>12.3f}"
+    )
@@ -0,0 +1,175 @@
+"""
+This script checks that the lookup table UYA game parsers match the original bitmask string parsers and compares their
+speed, along with the NumPy batch parsers used for backfills.
+"""
+import random
+import struct
+import time
+from typing import Callable
+
+import numpy as np
+
+from horizon.parsing.uya_game import (
+    MAP_BITMAP,
+    MODE_BITMAP,
+    SUBMODE_BITMAP,
+    TIME_BITMAP,
+    WEAPONS,
+    uya_gamemode_parser,
+    uya_generic_field_3_batch_parser,
+    uya_map_parser,
+    uya_time_parser,
+    uya_weapon_batch_parser,
+    uya_weapon_parser
+)
+
+SAMPLES: int = 100_000
+
+
+# The original string based parsers, kept here as the reference implementation.
+def try_parse_value(func, num):
+    try:
+        return func(num)
+    except:
+        return func(num+2**32)
+
+
+def string_map_parser(generic_field_3: int, metadata: dict) -> str:
+    if 'CustomMap' in metadata.keys() and metadata['CustomMap']:
+        return metadata['CustomMap']
+
+    def internal_parser(raw_input) -> str:
+        raw_int:int = int(raw_input) if type(raw_input) is not int else raw_input
+        raw_hex:str = struct.pack("<I", raw_int).hex()
+        int_base_16:int = int(raw_hex[0:2],16)
+        bitmask:str = format(int_base_16, "#010b")[2:]
+        return MAP_BITMAP[bitmask[:5]]
+
+    try:
+        return try_parse_value(internal_parser, generic_field_3)
+    except:
+        return "Unknown map!"
+
+
+def string_time_parser(generic_field_3: int) -> int:
+    def internal_parser(raw_input) -> str:
+        raw_int:int = int(raw_input) if type(raw_input) is not int else raw_input
+        raw_hex:str = struct.pack("<I", raw_int).hex()
+        int_base_16:int = int(raw_hex[0:2],16)
+        bitmask:str = format(int_base_16, "#010b")[2:]
+        return TIME_BITMAP[bitmask[5:]]
+
+    try:
+        return try_parse_value(internal_parser, generic_field_3)
+    except:
+        return "Unknown Time!"
+
+
+def string_gamemode_parser(generic_field_3: int) -> tuple[str, str]:
+    def internal_parser(raw_input:int):
+        int_casted:int = int(raw_input)
+        num_hex:str = struct.pack('<I', int_casted).hex()
+        int_cleaned:int = int(num_hex[2:],16)
+        num_bitmask:str = format(int_cleaned, "#026b")[2:]
+        _game_mode:str = MODE_BITMAP[num_bitmask[3:5]] if num_bitmask[3:5] in MODE_BITMAP else "Unknown Game Mode"
+        is_teams:bool = num_bitmask[SUBMODE_BITMAP['isTeams']] == '1'
+        is_attrition:bool = num_bitmask[SUBMODE_BITMAP['isAttrition']] == '1'
+
+        if _game_mode == MODE_BITMAP['00']:
+            _game_type = "Attrition" if is_attrition else "Normal"
+        elif _game_mode == MODE_BITMAP['01']:
+            _game_type = "Chaos" if is_attrition else "Normal"
+        elif _game_mode == MODE_BITMAP['10']:
+            _game_type = "Teams" if is_teams else "FFA"
+        else:
+            _game_type = "Game Type Not Found"
+        return _game_mode, _game_type
+    try:
+        return try_parse_value(internal_parser, generic_field_3)
+    except:
+        return 'Unkown Game Mode', 'Unknown Game Type'
+
+
+def string_weapon_parser(player_skill_level:int) -> dict[str, bool]:
+    result = {weapon: False for weapon in WEAPONS.values()}
+    bitmask:str = format(player_skill_level, "#010b")[-8:]
+    for i in range(len(bitmask)-1, -1, -1):
+        if bitmask[i] == "0":
+            result[WEAPONS[i]] = True
+    return result
+
+
+def generate_samples() -> tuple[list[int], list[int]]:
+    """
+    :return: Generic Field 3 and Player Skill Level values, including signed and out of range ones.
+    """
+    rng: random.Random = random.Random(0)
+    generic_field_3: list[int] = [rng.randrange(-2**32 - 10, 2**32 + 10) for _ in range(SAMPLES)]
+    generic_field_3 += [0, 2**32 - 1, -1, -2**31, 2**32, -2**32 - 1]
+    player_skill_levels: list[int] = [rng.randrange(-8, 256) for _ in range(SAMPLES)]
+    return generic_field_3, player_skill_levels
+
+
+def check_equal(generic_field_3: list[int], player_skill_levels: list[int]) -> None:
+    for value in generic_field_3:
+        assert uya_map_parser(value, {}) == string_map_parser(value, {}), value
+        assert uya_time_parser(value) == string_time_parser(value), value
+        assert uya_gamemode_parser(value) == string_gamemode_parser(value), value
+
+    for value in player_skill_levels:
+        assert uya_weapon_parser(value) == string_weapon_parser(value), value
+
+    columns: dict[str, np.ndarray] = uya_generic_field_3_batch_parser(generic_field_3)
+    for index, value in enumerate(generic_field_3):
+        time_limit: int | str = string_time_parser(value)
+        assert columns["game_map"][index] == string_map_parser(value, {}), value
+        assert columns["time_limit"][index] == (-1 if isinstance(time_limit, str) else time_limit), value
+        assert (columns["game_mode"][index], columns["game_submode"][index]) == string_gamemode_parser(value), value
+
+    weapons: dict[str, np.ndarray] = uya_weapon_batch_parser(player_skill_levels)
+    for index, value in enumerate(player_skill_levels):
+        assert {weapon: bool(column[index]) for weapon, column in weapons.items()} == string_weapon_parser(value), value
+
+
+def time_per_value(function: Callable[[], any], count: int) -> float:
+    """
+    :return: Average nanoseconds per value.
+    """
+    start: float = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) / count * 1e9
+
+
+if __name__ == "__main__":
+    generic_field_3, player_skill_levels = generate_samples()
+    check_equal(generic_field_3, player_skill_levels)
+    print(f"Outputs match on {len(generic_field_3)} Generic Field 3 and {len(player_skill_levels)} Player Skill Level values")
+
+    field_count: int = len(generic_field_3)
+    skill_count: int = len(player_skill_levels)
+    field_array: np.ndarray = np.asarray(generic_field_3, dtype=np.int64)
+    skill_array: np.ndarray = np.asarray(player_skill_levels, dtype=np.int64)
+
+    print(f"{'parser':<10}{'string ns':>12}{'table ns':>12}{'batch ns':>12}")
+    print(
+        f"{'map':<10}"
+        f"{time_per_value(lambda: [string_map_parser(value, {}) for value in generic_field_3], field_count):>12.0f}"
+        f"{time_per_value(lambda: [uya_map_parser(value, {}) for value in generic_field_3], field_count):>12.0f}"
+    )
+    print(
+        f"{'time':<10}"
+        f"{time_per_value(lambda: [string_time_parser(value) for value in generic_field_3], field_count):>12.0f}"
+        f"{time_per_value(lambda: [uya_time_parser(value) for value in generic_field_3], field_count):>12.0f}"
+    )
+    print(
+        f"{'gamemode':<10}"
+        f"{time_per_value(lambda: [string_gamemode_parser(value) for value in generic_field_3], field_count):>12.0f}"
+        f"{time_per_value(lambda: [uya_gamemode_parser(value) for value in generic_field_3], field_count):>12.0f}"
+    )
+    print(f"{'field 3':<10}{'':>24}{time_per_value(lambda: uya_generic_field_3_batch_parser(field_array), field_count):>12.0f}")
+    print(
+        f"{'weapons':<10}"
+        f"{time_per_value(lambda: [string_weapon_parser(value) for value in player_skill_levels], skill_count):>12.0f}"
+        f"{time_per_value(lambda: [uya_weapon_parser(value) for value in player_skill_levels], skill_count):>12.0f}"
+        f"{time_per_value(lambda: uya_weapon_batch_parser(skill_array), skill_count):>12.0f}"
+    )
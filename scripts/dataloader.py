@@ -7,11 +7,13 @@ from datetime import datetime, timedelta
 from tqdm import tqdm
 
 from app.database import SessionLocal
+from app.utils.gamehistory_rollups import rebuild_uya_gamehistory_rollups
 from app.utils.query_helpers import (
     update_player_vanilla_stats, 
     update_deadlocked_player_custom_stats,
     update_uya_gamehistory
 )
+from horizon.parsing.uya_game_record import UyaGameRecord
 
 
 
@@ -43,9 +45,11 @@ if __name__ == "__main__":
     with open("data/uya_gamehistory.json") as stream:
         all_games: list[dict[str, any]] = json.load(stream)
 
-    for game in tqdm(all_games, desc="Ingesting UYA Game History into Postgres..."):
+    for game in tqdm(UyaGameRecord.decode_batch(all_games), desc="Ingesting UYA Game History into Postgres..."):
         update_uya_gamehistory(game, SessionLocal())
 
+    rebuild_uya_gamehistory_rollups(SessionLocal())
+
     time_taken = datetime.now() - start_time
     minutes, seconds = divmod(time_taken.total_seconds(), 60)
     print(f"Time taken: {int(minutes)} minutes and {seconds:.2f} seconds")
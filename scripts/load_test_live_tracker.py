@@ -0,0 +1,205 @@
+"""
+This script load tests the /ws/uya-live websocket fully offline. It serves the websocket from a live tracker that
+simulates matches in a separate process, connects many concurrent spectators to it and reports end to end frame
+latency, throughput, dropped frames and the server's CPU usage.
+
+Example:
+    python -m scripts.load_test_live_tracker --clients 500 --duration 30 --mode delta
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import tempfile
+import time
+from datetime import datetime
+from typing import Literal
+
+import aiohttp
+import uvicorn
+import websockets
+from fastapi import FastAPI, WebSocket
+
+from horizon.live import (
+    BINARY_MODE,
+    BINARY_SUBPROTOCOL,
+    FULL_MODE,
+    SimulatedLiveTrackerServer,
+    decode_binary_frame
+)
+from horizon.uya_live_tracker import UyaLiveTracker
+
+
+class SimulatedLoadTestTracker(UyaLiveTracker):
+    def __init__(self, worlds: int, players_per_world: int, **kwargs):
+        super().__init__(**kwargs)
+        self._simulated_worlds: int = worlds
+        self._simulated_players_per_world: int = players_per_world
+
+    def _create_server(self, loop) -> SimulatedLiveTrackerServer:
+        return SimulatedLiveTrackerServer(
+            worlds=self._simulated_worlds,
+            players_per_world=self._simulated_players_per_world,
+            seed=0
+        )
+
+
+def run_server(port: int, worlds: int, players_per_world: int, write_tick_rate: int) -> None:
+    """
+    Serves the live websocket and a status route reporting the tracker's metrics and the process' CPU time.
+    """
+    tracker: SimulatedLoadTestTracker = SimulatedLoadTestTracker(
+        worlds=worlds,
+        players_per_world=players_per_world,
+        read_tick_rate=write_tick_rate,
+        write_tick_rate=write_tick_rate,
+        shared_memory_name=f"uya_live_load_test_{port}",
+        recordings_directory=tempfile.mkdtemp(prefix="uya_live_load_test_"),
+        record_matches=True
+    )
+    app: FastAPI = FastAPI()
+
+    @app.on_event("startup")
+    async def startup():
+        await tracker.start(asyncio.get_event_loop())
+
+    @app.get("/status")
+    async def status() -> dict[str, int | float]:
+        return {**tracker.metrics(), "cpu_time": time.process_time()}
+
+    @app.websocket("/ws/uya-live")
+    async def websocket_endpoint(websocket: WebSocket, mode: Literal["full", "delta"] = FULL_MODE):
+        binary: bool = BINARY_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+        await websocket.accept(subprotocol=BINARY_SUBPROTOCOL if binary else None)
+        await tracker.serve(websocket, BINARY_MODE if binary else mode)
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def latest_update(frame: str | bytes, mode: str) -> datetime | None:
+    """
+    :return: The most recent world update time in a frame.
+    """
+    if mode == BINARY_MODE:
+        worlds: list[dict] = decode_binary_frame(frame)["worlds"]
+    elif mode == FULL_MODE:
+        worlds = json.loads(frame)
+    else:
+        envelope: dict = json.loads(frame)
+        worlds = envelope["worlds"] if envelope["type"] == "keyframe" else list(envelope["worlds"].values())
+
+    updates: list[str] = [world["world_latest_update"] for world in worlds if "world_latest_update" in world]
+    return datetime.fromisoformat(max(updates)) if updates else None
+
+
+class LoadTestResults:
+    def __init__(self):
+        self.latencies: list[float] = list()
+        self.frames: int = 0
+        self.bytes: int = 0
+        self.disconnects: int = 0
+
+
+async def run_client(url: str, mode: str, results: LoadTestResults, stop: asyncio.Event) -> None:
+    subprotocols: list[str] | None = [BINARY_SUBPROTOCOL] if mode == BINARY_MODE else None
+
+    try:
+        async with websockets.connect(url, subprotocols=subprotocols, max_size=None, ping_interval=None) as websocket:
+            while not stop.is_set():
+                try:
+                    frame: str | bytes = await asyncio.wait_for(websocket.recv(), timeout=1)
+                except asyncio.TimeoutError:
+                    continue
+
+                received: datetime = datetime.now()
+                results.frames += 1
+                results.bytes += len(frame)
+
+                update: datetime | None = latest_update(frame, mode)
+                if update is not None:
+                    results.latencies.append((received - update).total_seconds())
+    except (websockets.ConnectionClosed, OSError):
+        results.disconnects += 1
+
+
+async def get_status(session: aiohttp.ClientSession, port: int) -> dict[str, int | float]:
+    async with session.get(f"http://127.0.0.1:{port}/status") as response:
+        return await response.json()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def load_test(arguments: argparse.Namespace) -> None:
+    mode: str = arguments.mode
+    query: str = "" if mode == BINARY_MODE else f"?mode={mode}"
+    url: str = f"ws://127.0.0.1:{arguments.port}/ws/uya-live{query}"
+
+    async with aiohttp.ClientSession() as session:
+        for _ in range(100):
+            try:
+                await get_status(session, arguments.port)
+                break
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.1)
+
+        results: LoadTestResults = LoadTestResults()
+        stop: asyncio.Event = asyncio.Event()
+        clients: list[asyncio.Task] = [
+            asyncio.create_task(run_client(url, mode, results, stop)) for _ in range(arguments.clients)
+        ]
+
+        # Let the clients connect and receive their first frames before measuring.
+        await asyncio.sleep(2)
+        results.latencies.clear()
+        results.frames = results.bytes = 0
+
+        start_status: dict[str, int | float] = await get_status(session, arguments.port)
+        start: float = time.perf_counter()
+        await asyncio.sleep(arguments.duration)
+        elapsed: float = time.perf_counter() - start
+        end_status: dict[str, int | float] = await get_status(session, arguments.port)
+
+        stop.set()
+        await asyncio.gather(*clients)
+
+    latencies: list[float] = results.latencies
+    print(f"{arguments.clients} {mode} clients, {arguments.worlds} worlds x {arguments.players} players, {elapsed:.1f}s")
+    print(f"Connected:           {end_status['connections']} ({results.disconnects} disconnected)")
+    print(f"Frames received:     {results.frames} ({results.frames / elapsed:.0f}/s, {results.bytes / elapsed / 1e6:.2f} MB/s)")
+    print(f"Frames broadcast:    {end_status['frames_broadcast'] - start_status['frames_broadcast']}")
+    print(f"Frames dropped:      {end_status['frames_dropped'] - start_status['frames_dropped']}")
+    print(f"Slow disconnects:    {end_status['slow_clients_disconnected'] - start_status['slow_clients_disconnected']}")
+    print(
+        f"Latency ms:          p50 {percentile(latencies, 0.5) * 1000:.1f}  p95 {percentile(latencies, 0.95) * 1000:.1f}  "
+        f"p99 {percentile(latencies, 0.99) * 1000:.1f}  max {percentile(latencies, 1) * 1000:.1f}"
+    )
+    print(f"Server CPU:          {(end_status['cpu_time'] - start_status['cpu_time']) / elapsed * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Load test the live tracker websocket.")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent websocket clients.")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to measure for.")
+    parser.add_argument("--mode", choices=("full", "delta", "binary"), default="full", help="Live frame mode.")
+    parser.add_argument("--worlds", type=int, default=4, help="Simulated concurrent matches.")
+    parser.add_argument("--players", type=int, default=8, help="Players per simulated match.")
+    parser.add_argument("--write-tick-rate", type=int, default=10, help="Broadcasts per second.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to serve the websocket on.")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    server: multiprocessing.Process = multiprocessing.Process(
+        target=run_server,
+        args=(arguments.port, arguments.worlds, arguments.players, arguments.write_tick_rate),
+        daemon=True
+    )
+    server.start()
+
+    try:
+        asyncio.run(load_test(arguments))
+    finally:
+        server.terminate()